@@ -0,0 +1 @@
+"""Bausteine des KI-Initiativen Bewertungsprogramms (Persistenz, Berechnungen)."""
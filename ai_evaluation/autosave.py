@@ -0,0 +1,107 @@
+"""Hintergrund-Schreiber für das Autosave der Initiativen-Entwürfe.
+
+Speichervorgänge werden in eine Queue gestellt und von einem eigenen Thread
+geschrieben. Mehrere Speichervorgänge derselben Initiative innerhalb des
+Debounce-Fensters werden zu einem einzigen Schreibvorgang zusammengefasst.
+"""
+
+import atexit
+import logging
+import queue
+import threading
+import time
+
+from .storage import serialize_initiative, write_initiatives
+
+logger = logging.getLogger(__name__)
+
+# Steuerbefehle für den Schreib-Thread
+_FLUSH = 'flush'
+_STOP = 'stop'
+
+
+class AutosaveWriter:
+    def __init__(self, pool, debounce_seconds=1.0):
+        self.pool = pool  # ConnectionPool, aus dem sich der Schreib-Thread seine Verbindung leiht
+        self.debounce_seconds = debounce_seconds
+        self.writes = 0  # Anzahl der Schreibvorgänge (Transaktionen)
+        self.coalesced = 0  # Anzahl der durch neuere Stände ersetzten Speichervorgänge
+        self.failures = 0  # Anzahl der fehlgeschlagenen Schreibvorgänge
+        self._queue = queue.Queue()
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name='autosave-writer', daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def submit(self, initiative_id, data):
+        # Stellt den aktuellen Stand einer Initiative zum Speichern ein. Die Daten werden
+        # sofort serialisiert, damit spätere Änderungen am Dict den Stand nicht verändern.
+        if self._closed:
+            raise RuntimeError('AutosaveWriter wurde bereits beendet.')
+        self._queue.put((initiative_id, serialize_initiative(data)))
+
+    def flush(self, timeout=None):
+        # Schreibt alle ausstehenden Stände sofort und wartet auf das Ergebnis; False, wenn
+        # der Schreib-Thread nicht innerhalb von timeout Sekunden fertig wurde
+        if self._closed:
+            return True
+        if not self._thread.is_alive():
+            return False
+        done = threading.Event()
+        self._queue.put((_FLUSH, done))
+        return done.wait(timeout)
+
+    def close(self, timeout=None):
+        # Schreibt ausstehende Stände und beendet den Schreib-Thread
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put((_STOP, None))
+        self._thread.join(timeout)
+
+    def _run(self):
+        # Der Schreib-Thread behält seine Verbindung für die gesamte Laufzeit
+        with self.pool.connection() as conn:
+            self._loop(conn)
+
+    def _loop(self, conn):
+        pending = {}  # initiative_id -> serialisierter Stand
+        deadline = None  # Zeitpunkt, zu dem die ausstehenden Stände spätestens geschrieben werden
+        while True:
+            timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+            try:
+                key, value = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                key, value = None, None
+
+            if key == _FLUSH or key == _STOP:
+                self._write(conn, pending)
+                deadline = None
+                if key == _STOP:
+                    return
+                value.set()
+                continue
+
+            if key is not None:
+                if key in pending:
+                    self.coalesced += 1
+                pending[key] = value
+                if deadline is None:
+                    deadline = time.monotonic() + self.debounce_seconds
+
+            if deadline is not None and time.monotonic() >= deadline:
+                self._write(conn, pending)
+                deadline = None
+
+    def _write(self, conn, pending):
+        if not pending:
+            return
+        try:
+            write_initiatives(conn, pending)
+            self.writes += 1
+        except Exception:
+            # Jeder Fehler (Datenbank, Serialisierung, ...) verwirft nur diese Stände; der
+            # Schreib-Thread muss weiterlaufen, sonst warten flush() und close() vergeblich
+            self.failures += 1
+            logger.exception('Autosave von %d Initiative(n) fehlgeschlagen', len(pending))
+        pending.clear()
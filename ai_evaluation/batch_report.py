@@ -0,0 +1,156 @@
+"""Stapelexport der PDF-Berichte aller Initiativen.
+
+Die Initiativen werden aus der Datenbank gelesen und die Berichte parallel in
+einem Prozess-Pool erzeugt; jeder Worker baut Absatz- und Tabellenformate nur
+einmal auf. Ziel ist ein Verzeichnis (eine PDF-Datei je Initiative) oder eine
+ZIP-Datei, wenn der Zielpfad auf .zip endet.
+
+Aufruf von der Kommandozeile:
+
+    python -m ai_evaluation.batch_report berichte/ [--db ki_initiativen.db] [--workers 4] [--ids 1 2 3]
+    python -m ai_evaluation.batch_report berichte.zip
+"""
+
+import argparse
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+import zipfile
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass
+
+from .storage import load_initiative
+
+
+@dataclass(frozen=True)
+class ReportTiming:
+    initiative_id: int
+    filename: str
+    seconds: float  # Renderzeit im Worker
+    size: int  # Dateigröße in Bytes
+
+
+def business_plan_rows(conn, initiative_id):
+    # Businessplan-Tabelle wie in Schritt 5 aus den gespeicherten Cashflow-Jahren
+    rows = []
+    cumulative = [0.0, 0.0, 0.0]
+    for year, revenue, savings, costs, profit in conn.execute(
+        'SELECT jahr, umsatz, kosteneinsparungen, kosten, gewinn FROM cashflow_jahre '
+        'WHERE initiative_id = ? ORDER BY jahr',
+        (initiative_id,),
+    ):
+        revenue, savings, costs, profit = (value or 0.0 for value in (revenue, savings, costs, profit))
+        cumulative = [cumulative[0] + revenue, cumulative[1] + costs, cumulative[2] + profit]
+        rows.append({
+            'Jahr': year,
+            'Umsatz (€)': revenue,
+            'Kosteneinsparungen (€)': savings,
+            'Kosten (€)': costs,
+            'Gewinn (€)': profit,
+            'Kumulativer Umsatz (€)': cumulative[0],
+            'Kumulative Kosten (€)': cumulative[1],
+            'Kumulativer Gewinn (€)': cumulative[2],
+        })
+    return rows
+
+
+def load_report_data(conn, ids=None):
+    # Liste (ID, Eingabe-Dict) aller bzw. der angegebenen Initiativen
+    if ids is None:
+        ids = [row[0] for row in conn.execute('SELECT id FROM initiativen ORDER BY id')]
+    result = []
+    for initiative_id in ids:
+        data = load_initiative(conn, initiative_id)
+        if data is None:
+            continue
+        plan = business_plan_rows(conn, initiative_id)
+        if plan:
+            data['Businessplan'] = plan
+        result.append((initiative_id, data))
+    return result
+
+
+def _render(task):
+    # Läuft im Worker-Prozess: schreibt einen Bericht nach directory/filename
+    from .report import build_pdf
+
+    initiative_id, data, directory, filename = task
+    path = os.path.join(directory, filename)
+    start = time.perf_counter()
+    build_pdf(data, path)
+    return ReportTiming(initiative_id, filename, time.perf_counter() - start, os.path.getsize(path))
+
+
+def export_reports(reports, target, workers=None, progress=None):
+    # Erzeugt die Berichte aus reports (Liste (ID, Eingabe-Dict)) nach target (Verzeichnis oder .zip).
+    # progress(erledigt, gesamt, ReportTiming) wird nach jedem fertigen Bericht aufgerufen.
+    from .report import report_filename
+
+    to_zip = str(target).lower().endswith('.zip')
+    directory = tempfile.mkdtemp(prefix='ki_berichte_') if to_zip else str(target)
+    os.makedirs(directory, exist_ok=True)
+    tasks = [
+        (initiative_id, data, directory, f'{initiative_id:04d}_{report_filename(data)}')
+        for initiative_id, data in reports
+    ]
+
+    timings = []
+    # spawn statt fork: der Export wird auch aus dem mehrfädigen Streamlit-Server gestartet
+    context = multiprocessing.get_context('spawn')
+    try:
+        with ProcessPoolExecutor(max_workers=workers, mp_context=context) as executor:
+            for future in as_completed([executor.submit(_render, task) for task in tasks]):
+                timing = future.result()
+                timings.append(timing)
+                if progress is not None:
+                    progress(len(timings), len(tasks), timing)
+        if to_zip:
+            with zipfile.ZipFile(target, 'w', compression=zipfile.ZIP_DEFLATED) as archive:
+                for timing in sorted(timings, key=lambda t: t.initiative_id):
+                    archive.write(os.path.join(directory, timing.filename), timing.filename)
+    finally:
+        if to_zip:
+            for task in tasks:
+                path = os.path.join(directory, task[3])
+                if os.path.exists(path):
+                    os.remove(path)
+            os.rmdir(directory)
+    return sorted(timings, key=lambda t: t.initiative_id)
+
+
+def main(argv=None):
+    from . import migrations
+    from .db import DB_PATH, connect
+
+    parser = argparse.ArgumentParser(description='Erzeugt PDF-Berichte für alle Initiativen.')
+    parser.add_argument('ziel', help='Zielverzeichnis oder ZIP-Datei (Endung .zip)')
+    parser.add_argument('--db', default=DB_PATH, help='Pfad zur SQLite-Datenbank')
+    parser.add_argument('--workers', type=int, default=None, help='Anzahl der Prozesse (Standard: alle Kerne)')
+    parser.add_argument('--ids', type=int, nargs='+', help='Nur diese Initiativen exportieren')
+    args = parser.parse_args(argv)
+
+    conn = connect(args.db)
+    try:
+        migrations.migrate(conn)
+        reports = load_report_data(conn, args.ids)
+    finally:
+        conn.close()
+    if not reports:
+        print('Keine Initiativen gefunden.')
+        return 0
+
+    def progress(done, total, timing):
+        print(f'[{done}/{total}] {timing.filename}: {timing.seconds:.2f} s, {timing.size / 1024:.0f} KiB')
+
+    start = time.perf_counter()
+    timings = export_reports(reports, args.ziel, workers=args.workers, progress=progress)
+    seconds = time.perf_counter() - start
+    print(f'{len(timings)} Bericht(e) in {seconds:.2f} s nach {args.ziel} geschrieben '
+          f'(Ø {sum(t.seconds for t in timings) / len(timings):.2f} s je Bericht).')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,303 @@
+"""Benchmarks für Finanzmodell, Persistenz, PDF-Bericht und Diagramme.
+
+Gemessen werden die Pfade, die bei jedem Rerun bzw. Speichern anfallen:
+das Cashflow-Modell aus Schritt 5 über verschiedene Laufzeiten und Anzahlen
+von Wachstumsperioden, die Zielwertsuche, save_initiative() mit mehreren
+gleichzeitig schreibenden Threads, der PDF-Bericht für wachsende Businesspläne
+und das Rendern der Diagramme (jeweils ohne Cache). Die Eingaben stammen aus
+ai_evaluation.synthetic. Die Ergebnisse werden als JSON gespeichert und
+lassen sich mit einem früheren Lauf vergleichen.
+
+Aufruf von der Kommandozeile:
+
+    python -m ai_evaluation.benchmark [--ausgabe benchmark.json] [--nur cashflow zielwertsuche speichern pdf diagramme]
+    python -m ai_evaluation.benchmark --schnell --vergleich benchmark_alt.json [--schwelle 1.2]
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import timeit
+from dataclasses import asdict, dataclass, field
+
+from . import synthetic
+from .engine import CASHFLOW_FIELDS
+
+# Wiederholungen je Messung; jede Wiederholung ruft die Funktion number-mal auf
+REPEAT = 5
+
+
+@dataclass(frozen=True)
+class BenchmarkResult:
+    name: str
+    params: dict
+    number: int  # Aufrufe je Wiederholung
+    times: tuple  # Sekunden je Aufruf, eine Angabe je Wiederholung
+    extra: dict = field(default_factory=dict)  # weitere Kennzahlen, z.B. Durchsatz
+
+    @property
+    def key(self):
+        # Eindeutiger Name für den Vergleich zweier Läufe
+        return self.name + ''.join(f' {k}={v}' for k, v in sorted(self.params.items()))
+
+    @property
+    def best(self):
+        return min(self.times)
+
+    @property
+    def median(self):
+        return statistics.median(self.times)
+
+    def to_dict(self):
+        return {**asdict(self), 'times': list(self.times), 'best': self.best, 'median': self.median}
+
+
+def measure(name, params, function, repeat=REPEAT, extra=None):
+    # Zeit je Aufruf von function; die Anzahl der Aufrufe je Wiederholung wird wie bei timeit
+    # so gewählt, dass eine Wiederholung mindestens 0,2 s dauert
+    timer = timeit.Timer(function)
+    number, _ = timer.autorange()
+    times = tuple(total / number for total in timer.repeat(repeat, number))
+    return BenchmarkResult(name, params, number, times, extra or {})
+
+
+# --- Benchmarks ---
+
+def bench_cashflow(quick=False):
+    # Cashflow-Modell aus Schritt 5 ohne Ergebnis-Cache
+    from .cashflow import compute_cashflow
+
+    rng = random.Random(0)
+    results = []
+    for duration in (5, 10, 30) if quick else (5, 10, 30, 50):
+        for n_periods in (0, 3, 10):
+            data = synthetic.initiative(rng, project_duration=duration, n_periods=n_periods)
+            kwargs = {param: data[field] for field, param in CASHFLOW_FIELDS.items()}
+            results.append(measure('cashflow', {'laufzeit': duration, 'perioden': n_periods},
+                                   lambda: compute_cashflow(**kwargs)))
+    # Unterjährige Auflösung: 30 Jahre in Quartalen bzw. Monaten (120 bzw. 360 Perioden)
+    for periods_per_year in (4, 12):
+        data = synthetic.initiative(rng, project_duration=30, periods_per_year=periods_per_year)
+        kwargs = {param: data[field] for field, param in CASHFLOW_FIELDS.items()}
+        results.append(measure('cashflow', {'laufzeit': 30, 'perioden': 3, 'perioden_pro_jahr': periods_per_year},
+                               lambda: compute_cashflow(**kwargs)))
+    # Lange Laufzeit mit einem Wachstumszeitraum je Jahr, monatlich gerechnet (Index der Zeiträume)
+    data = synthetic.initiative(rng, project_duration=50, n_periods=50, periods_per_year=12)
+    kwargs = {param: data[field] for field, param in CASHFLOW_FIELDS.items()}
+    results.append(measure('cashflow', {'laufzeit': 50, 'perioden': 50, 'perioden_pro_jahr': 12},
+                           lambda: compute_cashflow(**kwargs)))
+    return results
+
+
+def bench_save(quick=False):
+    # save_initiative() mit mehreren Threads, die gleichzeitig über den Verbindungspool schreiben
+    from . import migrations
+    from .db import ConnectionPool
+    from .storage import save_initiative
+
+    per_writer = 20 if quick else 100
+    results = []
+    directory = tempfile.mkdtemp(prefix='ki_benchmark_')
+    try:
+        for writers in (1, 2, 4) if quick else (1, 2, 4, 8):
+            pool = ConnectionPool(os.path.join(directory, f'schreiber_{writers}.db'))
+            with pool.connection() as conn:
+                migrations.migrate(conn)
+            data = synthetic.initiatives(writers * per_writer, seed=writers)
+
+            def write(chunk):
+                # Wie die Autosave-Funktion: erste Speicherung legt an, danach Update derselben Zeile
+                with pool.connection() as conn:
+                    for item in chunk:
+                        initiative_id = save_initiative(conn, item)
+                        save_initiative(conn, item, initiative_id)
+
+            def run():
+                threads = [threading.Thread(target=write, args=(data[i::writers],)) for i in range(writers)]
+                for thread in threads:
+                    thread.start()
+                for thread in threads:
+                    thread.join()
+
+            times = []
+            for _ in range(3 if quick else REPEAT):
+                start = time.perf_counter()
+                run()
+                times.append(time.perf_counter() - start)
+            pool.close()
+            saves = 2 * len(data)
+            results.append(BenchmarkResult(
+                'speichern', {'schreiber': writers, 'initiativen': len(data)}, 1, tuple(times),
+                {'speichervorgaenge_pro_sekunde': saves / min(times)},
+            ))
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+    return results
+
+
+def bench_pdf(quick=False):
+    # PDF-Bericht wie generate_pdf() in der App (temporäre Datei), wachsender Businessplan
+    from .report import write_temp_pdf
+
+    rng = random.Random(0)
+    results = []
+    for duration in (5, 20) if quick else (5, 20, 50):
+        data = synthetic.initiative(rng, project_duration=duration)
+
+        def run():
+            path = write_temp_pdf(data)
+            size = os.path.getsize(path)
+            os.remove(path)
+            return size
+
+        size = run()
+        results.append(measure('pdf', {'businessplan_jahre': duration + 1}, run,
+                               repeat=3 if quick else REPEAT, extra={'bytes': size}))
+    return results
+
+
+def bench_charts(quick=False):
+    # Rendern der Diagramme ohne Cache (__wrapped__ ist die nicht zwischengespeicherte Funktion)
+    from . import charts
+    from .engine import financial_model
+
+    rng = random.Random(0)
+    repeat = 3 if quick else REPEAT
+    results = []
+    for duration in (10, 50):
+        cashflow = financial_model(synthetic.initiative(rng, project_duration=duration))
+        results.append(measure('diagramm_amortisation', {'laufzeit': duration}, lambda: (
+            charts.amortisation_chart.__wrapped__(cashflow.years, cashflow.cumulative_revenue,
+                                                  cashflow.cumulative_costs, 1.0, cashflow.payback_period, duration)
+        ), repeat=repeat))
+    for n_risks in (5, 50):
+        risks = synthetic.initiative(rng, n_risks=n_risks)['Risiken']
+        results.append(measure('diagramm_risikomatrix', {'risiken': n_risks},
+                               lambda: charts.risk_matrix_chart.__wrapped__(risks), repeat=repeat))
+    weighted = synthetic.initiative(rng)['Gewichtete Bewertungen']
+    results.append(measure('diagramm_nutzwert', {}, lambda: charts.score_chart.__wrapped__(weighted), repeat=repeat))
+    return results
+
+
+def bench_goalseek(quick=False):
+    # Zielwertsuche aus Schritt 5 für eine Initiative, je Zielkennzahl für Umsatz und Kosten
+    from .goalseek import DEFAULT_TARGETS, goal_seek
+
+    rng = random.Random(0)
+    data = synthetic.initiative(rng, project_duration=10)
+    results = []
+    for variable in ('basisumsatz',) if quick else ('basisumsatz', 'entwicklungskosten'):
+        for metric, target in DEFAULT_TARGETS.items():
+            results.append(measure('zielwertsuche', {'eingabe': variable, 'kennzahl': metric},
+                                   lambda: goal_seek(data, variable, metric, target),
+                                   repeat=3 if quick else REPEAT))
+    return results
+
+
+BENCHMARKS = {
+    'cashflow': bench_cashflow,
+    'zielwertsuche': bench_goalseek,
+    'speichern': bench_save,
+    'pdf': bench_pdf,
+    'diagramme': bench_charts,
+}
+
+
+# --- Ergebnisse ---
+
+def environment():
+    # Angaben zum Lauf, damit Ergebnisse verschiedener Stände einander zugeordnet werden können
+    import numpy
+
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                                cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip() or None
+    except OSError:
+        commit = None
+    return {
+        'zeitpunkt': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'commit': commit,
+        'python': platform.python_version(),
+        'numpy': numpy.__version__,
+        'plattform': platform.platform(),
+        'prozessoren': os.cpu_count(),
+    }
+
+
+def run(names=None, quick=False, progress=None):
+    # Führt die ausgewählten Benchmarks aus; progress(BenchmarkResult) nach jeder Messung
+    results = []
+    for name in names or BENCHMARKS:
+        for result in BENCHMARKS[name](quick):
+            results.append(result)
+            if progress is not None:
+                progress(result)
+    return results
+
+
+def to_json(results):
+    return {'umgebung': environment(), 'ergebnisse': [result.to_dict() for result in results]}
+
+
+def compare(baseline, results):
+    # Liste (Schlüssel, alte Zeit, neue Zeit, Faktor neu/alt) für alle in beiden Läufen gemessenen
+    # Benchmarks; baseline ist der Inhalt einer früheren JSON-Ausgabe
+    old = {BenchmarkResult(r['name'], r['params'], r['number'], tuple(r['times'])).key: r['best']
+           for r in baseline['ergebnisse']}
+    return [
+        (result.key, old[result.key], result.best, result.best / old[result.key])
+        for result in results if result.key in old
+    ]
+
+
+def _format_time(seconds):
+    if seconds < 1e-3:
+        return f'{seconds * 1e6:8.1f} µs'
+    if seconds < 1:
+        return f'{seconds * 1e3:8.1f} ms'
+    return f'{seconds:8.2f} s '
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmarks für Finanzmodell, Speichern, PDF und Diagramme.')
+    parser.add_argument('--ausgabe', default='benchmark.json', help='JSON-Datei für die Ergebnisse')
+    parser.add_argument('--nur', nargs='+', choices=list(BENCHMARKS), help='Nur diese Benchmarks ausführen')
+    parser.add_argument('--schnell', action='store_true', help='Weniger Größen und Wiederholungen')
+    parser.add_argument('--vergleich', help='Frühere JSON-Ausgabe, mit der verglichen wird')
+    parser.add_argument('--schwelle', type=float, default=1.2,
+                        help='Ab diesem Faktor neu/alt gilt ein Benchmark als langsamer (Standard: 1.2)')
+    args = parser.parse_args(argv)
+
+    def progress(result):
+        extra = ''.join(f', {k}: {v:,.0f}' for k, v in result.extra.items())
+        print(f'{result.key:<50} {_format_time(result.best)} (Median {_format_time(result.median).strip()}{extra})')
+
+    results = run(args.nur, quick=args.schnell, progress=progress)
+    with open(args.ausgabe, 'w', encoding='utf-8') as file:
+        json.dump(to_json(results), file, indent=2, ensure_ascii=False)
+    print(f'{len(results)} Ergebnis(se) nach {args.ausgabe} geschrieben.')
+
+    if args.vergleich:
+        with open(args.vergleich, encoding='utf-8') as file:
+            baseline = json.load(file)
+        slower = 0
+        print(f"\nVergleich mit {args.vergleich} (Commit {baseline['umgebung'].get('commit')}):")
+        for key, old, new, ratio in compare(baseline, results):
+            flag = '  langsamer' if ratio > args.schwelle else ''
+            slower += bool(flag)
+            print(f'{key:<50} {_format_time(old)} -> {_format_time(new)}  x{ratio:5.2f}{flag}')
+        return 1 if slower else 0
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
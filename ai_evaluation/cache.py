@@ -0,0 +1,92 @@
+"""Begrenzte LRU-Caches für Berechnungen, die bei jedem Streamlit-Rerun anfallen.
+
+Der Schlüssel ist ein Hash der normalisierten Eingaben: Zahlen werden zu float,
+Listen/Tupel und Dicts zu Tupeln (in Einfügereihenfolge), sodass z.B. 5 und 5.0
+oder zwei gleich befüllte Wachstumsperioden-Listen denselben Eintrag treffen.
+"""
+
+import functools
+import hashlib
+import threading
+from collections import OrderedDict
+from numbers import Integral, Real
+
+
+def normalise(value):
+    # Wandelt Eingaben in eine hashbare, typstabile Form um
+    if isinstance(value, bool) or value is None or isinstance(value, str):
+        return value
+    if isinstance(value, (Integral, Real)):
+        return float(value)
+    if isinstance(value, dict):
+        return tuple((str(k), normalise(v)) for k, v in value.items())
+    if isinstance(value, (list, tuple)):
+        return tuple(normalise(v) for v in value)
+    if hasattr(value, 'tolist'):  # NumPy-Arrays
+        return normalise(value.tolist())
+    return repr(value)
+
+
+def input_hash(*args, **kwargs):
+    # Stabiler Hash über normalisierte Eingaben (auch über Prozessgrenzen hinweg gleich)
+    key = repr((normalise(args), normalise(kwargs))).encode()
+    return hashlib.blake2b(key, digest_size=16).hexdigest()
+
+
+class LRUCache:
+    def __init__(self, maxsize=128):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_or_compute(self, key, compute):
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key]
+            self.misses += 1
+        # Berechnung außerhalb der Sperre; bei gleichzeitigen Aufrufen gewinnt der letzte Eintrag
+        value = compute()
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        return value
+
+    def stats(self):
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / total if total else 0.0,
+                'size': len(self._entries),
+                'maxsize': self.maxsize,
+            }
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+
+def memoize(maxsize=128):
+    # Dekorator: Ergebnis je normalisierter Eingabe im LRU-Cache halten (Cache unter .cache)
+    def decorator(function):
+        cache = LRUCache(maxsize)
+
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            return cache.get_or_compute(input_hash(*args, **kwargs), lambda: function(*args, **kwargs))
+
+        wrapper.cache = cache
+        return wrapper
+
+    return decorator
@@ -0,0 +1,443 @@
+"""Cashflow-Modell aus Schritt 5 (Umsatz, Kosten und ROI), unabhängig von Streamlit.
+
+Alle Werte werden vektorisiert mit NumPy berechnet. Jahr 0 enthält die
+Anfangsinvestition, die Jahre 1 bis Projektlaufzeit die laufenden Werte.
+Kapitalwert, interner Zinsfuß und diskontierte Amortisationsdauer diskontieren
+den Gewinn mit den Kapitalkosten (WACC) auf Jahr 0.
+
+Gerechnet wird wahlweise in Jahren, Quartalen oder Monaten (periods_per_year).
+Anlaufzeit und Wachstumszeiträume gelten dann auf die Periode genau, jährliche
+Beträge werden auf die Perioden verteilt und Wachstumsraten je Periode
+anteilig verzinst. Amortisationsdauer und diskontierte Kennzahlen stammen aus
+den Periodenwerten, die ausgegebenen Reihen (Businessplan) sind Jahreswerte.
+"""
+
+from dataclasses import dataclass
+from typing import Optional
+
+import numpy as np
+
+from .cache import memoize
+
+# Anzahl der zwischengespeicherten Ergebnisse von cached_compute_cashflow
+CASHFLOW_CACHE_SIZE = 256
+
+# Zeitauflösung des Finanzmodells: Bezeichnung -> Perioden je Jahr
+RESOLUTIONS = {'Jährlich': 1, 'Quartalsweise': 4, 'Monatlich': 12}
+
+# Kapitalkosten (WACC) in %, wenn für eine Initiative keine angegeben sind
+DEFAULT_WACC = 8.0
+
+# Suchintervall (in %) und höchste Anzahl an Iterationen für den internen Zinsfuß
+IRR_BOUNDS = (-99.0, 1000.0)
+IRR_ITERATIONS = 100
+
+
+@dataclass(frozen=True)
+class CashflowResult:
+    years: np.ndarray
+    revenue: np.ndarray
+    cost_savings: np.ndarray
+    costs: np.ndarray
+    profit: np.ndarray
+    cumulative_revenue: np.ndarray
+    cumulative_costs: np.ndarray
+    cumulative_profit: np.ndarray
+    total_revenue: float
+    total_costs: float
+    total_profit: float
+    roi: Optional[float]  # in %, None ohne Kosten
+    payback_period: Optional[float]  # in Jahren, None ohne Break-Even innerhalb der Laufzeit
+    npv: float  # Kapitalwert in €
+    irr: Optional[float]  # interner Zinsfuß in %, None ohne Vorzeichenwechsel im Suchintervall
+    discounted_payback: Optional[float]  # in Jahren, None ohne Break-Even der diskontierten Werte
+
+    def business_plan(self):
+        # Businessplan-Tabelle wie in Schritt 5 angezeigt und im Bericht ausgegeben.
+        # Wird je Ergebnis nur einmal aufgebaut und darf vom Aufrufer nicht verändert werden.
+        if '_business_plan' not in self.__dict__:
+            object.__setattr__(self, '_business_plan', self._build_business_plan())
+        return self.__dict__['_business_plan']
+
+    def _build_business_plan(self):
+        import pandas as pd
+
+        return pd.DataFrame({
+            'Jahr': self.years,
+            'Umsatz (€)': self.revenue,
+            'Kosteneinsparungen (€)': self.cost_savings,
+            'Kosten (€)': self.costs,
+            'Gewinn (€)': self.profit,
+            'Kumulativer Umsatz (€)': self.cumulative_revenue,
+            'Kumulative Kosten (€)': self.cumulative_costs,
+            'Kumulativer Gewinn (€)': self.cumulative_profit,
+        })
+
+
+def period_times(project_duration, periods_per_year=1):
+    # Ende jeder Periode in Jahren: 0, 1/m, 2/m, ..., Projektlaufzeit (m = periods_per_year)
+    return np.arange(int(project_duration) * periods_per_year + 1) / periods_per_year
+
+
+def yearly(values, periods_per_year):
+    # Summiert Periodenwerte (Zeilen x Perioden) zu Jahreswerten; Periode 0 ist Jahr 0
+    if periods_per_year == 1:
+        return values
+    # Form explizit angeben: reshape(..., -1, ...) schlägt bei null Zeilen fehl
+    n_rows, n_columns = values.shape
+    n_years = (n_columns - 1) // periods_per_year
+    return np.concatenate(
+        [values[:, :1], values[:, 1:].reshape(n_rows, n_years, periods_per_year).sum(axis=2)], axis=1,
+    )
+
+
+@dataclass(frozen=True)
+class GrowthIndex:
+    # Wachstumszeiträume als sortierter Index: breakpoints sind alle Start- und Endjahre
+    # (aufsteigend, eindeutig). Stück 2k ist der Zeitpunkt breakpoints[k], Stück 2k + 1 das
+    # offene Intervall bis breakpoints[k + 1]; pieces enthält je Stück den Index des ersten
+    # passenden Zeitraums (ursprüngliche Reihenfolge) oder -1. Der Index kennt nur Start- und
+    # Endjahre; die Raten (auch Verteilungen der Simulation) löst der Aufrufer selbst auf.
+    breakpoints: np.ndarray
+    pieces: np.ndarray
+    # Paare (i, j) sich überschneidender Zeiträume; j beginnt nicht vor i
+    overlaps: tuple
+
+    def lookup(self, years):
+        # Index des ersten passenden Zeitraums je Jahr bzw. Periodenende, -1 ohne Zeitraum
+        years = np.asarray(years, dtype=float)
+        if not len(self.breakpoints):
+            return np.full(years.shape, -1)
+        k = np.searchsorted(self.breakpoints, years, side='right') - 1
+        piece = 2 * k + (years != self.breakpoints[np.maximum(k, 0)])
+        return np.where(k >= 0, self.pieces[piece], -1)
+
+    def rates_at(self, years, rates):
+        # Wachstumsrate (%) je Jahr bzw. Periodenende aus den Raten je Zeitraum, 0 ohne Zeitraum
+        index = self.lookup(years)
+        rates = np.append(np.asarray(rates, dtype=float), 0.0)  # Position -1: kein Zeitraum
+        return rates[index]
+
+
+def _overlap_pairs(order, starts, ends):
+    # Paare sich überschneidender Zeiträume (ursprüngliche Indizes) aus den nach Startjahr
+    # sortierten Zeiträumen: Zeitraum k überschneidet sich, wenn er spätestens am größten
+    # bisherigen Endjahr beginnt; Partner ist der Zeitraum mit diesem Endjahr
+    running = np.maximum.accumulate(ends)
+    holder = np.maximum.accumulate(np.where(ends == running, np.arange(len(ends)), 0))
+    overlapping = np.flatnonzero(starts[1:] <= running[:-1]) + 1
+    pairs = zip(order[holder[overlapping - 1]].tolist(), order[overlapping].tolist())
+    return tuple(sorted(pairs, key=lambda pair: (pair[1], pair[0])))
+
+
+def growth_index(growth_periods):
+    # Kompiliert die Wachstumszeiträume einmalig zu einem GrowthIndex
+    starts = np.array([p['start_year'] for p in growth_periods], dtype=float)
+    ends = np.array([p['end_year'] for p in growth_periods], dtype=float)
+    # Zeiträume mit Startjahr nach dem Endjahr passen auf kein Jahr
+    valid = np.flatnonzero(starts <= ends)
+    order = valid[np.argsort(starts[valid], kind='stable')]
+    sorted_starts, sorted_ends = starts[order], ends[order]
+
+    if not (sorted_starts[1:] <= np.maximum.accumulate(sorted_ends)[:-1]).any():
+        # Ohne Überschneidungen sind Start- und Endjahre abwechselnd bereits die Stützstellen:
+        # Start, Intervall und Ende gehören zum Zeitraum, die Lücke bis zum nächsten Start nicht
+        breakpoints = np.column_stack([sorted_starts, sorted_ends]).ravel()
+        pieces = np.repeat(order, 4)
+        pieces[3::4] = -1
+        return GrowthIndex(breakpoints, pieces, ())
+
+    # Überschneidungen: je Stück der erste passende Zeitraum in ursprünglicher Reihenfolge,
+    # ermittelt an einem Stellvertreter (Zeitpunkt bzw. Mitte des folgenden Intervalls)
+    breakpoints = np.unique(np.concatenate([sorted_starts, sorted_ends]))
+    probes = np.repeat(breakpoints, 2)
+    probes[1::2] = np.append((breakpoints[:-1] + breakpoints[1:]) / 2, breakpoints[-1] + 1)
+    matches = (starts[:, None] <= probes) & (probes <= ends[:, None])
+    pieces = np.where(matches.any(axis=0), matches.argmax(axis=0), -1)
+    return GrowthIndex(breakpoints, pieces, _overlap_pairs(order, sorted_starts, sorted_ends))
+
+
+def growth_rates(years, growth_periods):
+    # Wachstumsrate (%) je Jahr bzw. Periodenende (years darf Bruchteile enthalten):
+    # erster Zeitraum mit start_year <= Jahr <= end_year, sonst 0
+    if not growth_periods:
+        return np.zeros(len(years))
+    return growth_index(growth_periods).rates_at(years, [p['growth_rate'] for p in growth_periods])
+
+
+def growth_rate_matrix(starts, ends, rates, n_years, periods_per_year=1):
+    # Wie growth_rates() für viele Initiativen: starts/ends/rates sind Matrizen
+    # Initiativen x Zeiträume (fehlende Zeiträume als NaN). Ergebnis: Initiativen x Perioden
+    # der Jahre 0..n_years - 1.
+    starts, ends, rates = (np.atleast_2d(np.asarray(a, dtype=float)) for a in (starts, ends, rates))
+    years = period_times(n_years - 1, periods_per_year)
+    n_rows, n_periods = starts.shape
+    if not n_periods:
+        return np.zeros((n_rows, len(years)))
+
+    # Überschneidungen je Initiative (nach Startjahr sortiert, fehlende Zeiträume zuletzt)
+    order = np.argsort(starts, axis=1, kind='stable')
+    sorted_starts, sorted_ends = (np.take_along_axis(a, order, axis=1) for a in (starts, ends))
+    running = np.fmax.accumulate(sorted_ends, axis=1)
+    overlapping = (sorted_starts[:, 1:] <= running[:, :-1]).any(axis=1)
+
+    # Binärsuche der Zeiträume im gemeinsamen Periodenraster: Zeitraum p deckt die Perioden
+    # first..last - 1 ab. Ohne Überschneidungen ergibt die kumulierte Summe der Markierungen
+    # (+ Zeitraum am Anfang, - Zeitraum am Ende) je Periode die Nummer des Zeitraums (0 = keiner).
+    first = np.searchsorted(years, starts, side='left')
+    last = np.searchsorted(years, ends, side='right')
+    covers = (first < last) & ~overlapping[:, None]
+    rows, columns = np.nonzero(covers)
+    markers = np.zeros((n_rows, len(years) + 1), dtype=np.int64)
+    markers[rows, first[covers]] = columns + 1
+    markers[rows, last[covers]] -= columns + 1
+    number = np.cumsum(markers[:, :-1], axis=1)
+    padded = np.concatenate([np.zeros((n_rows, 1)), rates], axis=1)
+    result = np.take_along_axis(padded, number, axis=1)
+
+    # Zeilen mit überschneidenden Zeiträumen: erster Zeitraum in ursprünglicher Reihenfolge
+    if overlapping.any():
+        sub_starts, sub_ends, sub_rates = (a[overlapping] for a in (starts, ends, rates))
+        sub = np.zeros((len(sub_starts), len(years)))
+        # Rückwärts über die Zeiträume, damit der erste Zeitraum gewinnt
+        for p in range(n_periods - 1, -1, -1):
+            matches = (sub_starts[:, p, None] <= years) & (years <= sub_ends[:, p, None])
+            sub = np.where(matches, sub_rates[:, p, None], sub)
+        result[overlapping] = sub
+    return result
+
+
+@dataclass(frozen=True)
+class CashflowMatrix:
+    # Ergebnis für mehrere Initiativen: Zeilen = Initiativen, Spalten = Jahre 0..max. Laufzeit.
+    # Jahre nach der Laufzeit einer Initiative enthalten 0. Kennzahlen je Initiative.
+    years: np.ndarray
+    revenue: np.ndarray
+    cost_savings: np.ndarray
+    costs: np.ndarray
+    profit: np.ndarray
+    cumulative_revenue: np.ndarray
+    cumulative_costs: np.ndarray
+    cumulative_profit: np.ndarray
+    total_revenue: np.ndarray
+    total_costs: np.ndarray
+    total_profit: np.ndarray
+    roi: np.ndarray  # in %, NaN ohne Kosten
+    payback_period: np.ndarray  # in Jahren, NaN ohne Break-Even innerhalb der Laufzeit
+    npv: np.ndarray  # Kapitalwert in €
+    irr: np.ndarray  # interner Zinsfuß in %, NaN ohne Lösung
+    discounted_payback: np.ndarray  # in Jahren, NaN ohne Break-Even der diskontierten Werte
+
+
+def combine_matrices(n_rows, parts):
+    # Setzt Ergebnisse für Teilmengen der Zeilen zu einem CashflowMatrix mit n_rows Zeilen zusammen;
+    # parts sind Paare (Zeilenpositionen, CashflowMatrix) mit denselben Jahren
+    years = parts[0][1].years
+    combined = {'years': years}
+    for name in CashflowMatrix.__dataclass_fields__:
+        if name == 'years':
+            continue
+        array = np.zeros((n_rows,) + getattr(parts[0][1], name).shape[1:])
+        for rows, part in parts:
+            array[rows] = getattr(part, name)
+        combined[name] = array
+    return CashflowMatrix(**combined)
+
+
+def payback_periods(years, cumulative_profit):
+    # Erster Vorzeichenwechsel des kumulierten Gewinns je Zeile, linear interpoliert (NaN ohne Wechsel)
+    if cumulative_profit.shape[1] < 2:
+        return np.full(cumulative_profit.shape[0], np.nan)
+    crossings = (cumulative_profit[:, 1:] >= 0) & (cumulative_profit[:, :-1] < 0)
+    found = crossings.any(axis=1)
+    i = crossings.argmax(axis=1)[:, None] + 1
+    before = np.take_along_axis(cumulative_profit, i - 1, axis=1)[:, 0]
+    after = np.take_along_axis(cumulative_profit, i, axis=1)[:, 0]
+    step = years[i[:, 0]] - years[i[:, 0] - 1]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        payback = years[i[:, 0] - 1] + (0 - before) * step / (after - before)
+    return np.where(found, payback, np.nan)
+
+
+def discount_factors(years, wacc):
+    # Abzinsungsfaktoren (1 + WACC)^-Jahr, Zeilen = Initiativen (wacc in %, Vektor)
+    return (1 + np.asarray(wacc, dtype=float)[:, None] / 100) ** -np.asarray(years, dtype=float)
+
+
+def net_present_values(years, profit, rates):
+    # Kapitalwert je Zeile von profit bei den Zinssätzen rates (in %)
+    return np.sum(profit * discount_factors(years, rates), axis=1)
+
+
+def internal_rates_of_return(years, profit, bounds=IRR_BOUNDS, iterations=IRR_ITERATIONS, tolerance=1e-7):
+    # Interner Zinsfuß (%) je Zeile, für alle Zeilen gleichzeitig: Newton-Verfahren, abgesichert durch
+    # ein Bisektionsintervall (Schritte außerhalb des Intervalls werden durch dessen Mitte ersetzt).
+    # Für übliche Zahlungsreihen (erst Investition, dann Rückflüsse) ist der Kapitalwert konvex und
+    # fallend, Newton konvergiert dann monoton. Startwert ist der Zinssatz, der die Summe der Rückflüsse
+    # über den Abstand der mittleren Zeitpunkte von Rückflüssen und Auszahlungen auf die Summe der
+    # Auszahlungen abzinst (sonst 10 %). Gerechnet wird je Iteration nur mit den noch nicht
+    # konvergierten Zeilen. tolerance in Prozentpunkten.
+    # NaN, wenn der Kapitalwert in bounds das Vorzeichen nicht wechselt.
+    years = np.asarray(years, dtype=float)
+    n = profit.shape[0]
+    npv_low = net_present_values(years, profit, np.full(n, bounds[0]))
+    found = np.sign(npv_low) * np.sign(net_present_values(years, profit, np.full(n, bounds[1]))) < 0
+    result = np.full(n, np.nan)
+
+    rows = np.flatnonzero(found)
+    profit, npv_low = profit[rows], npv_low[rows]
+    low, high = np.full(len(rows), bounds[0]), np.full(len(rows), bounds[1])
+    inflows, outflows = np.maximum(profit, 0.0), np.maximum(-profit, 0.0)
+    inflow, outflow = inflows.sum(axis=1), outflows.sum(axis=1)
+    with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+        spread = (inflows @ years) / inflow - (outflows @ years) / outflow
+        rate = ((inflow / outflow) ** (1 / spread) - 1) * 100
+    rate = np.where(np.isfinite(rate) & (spread > 0), np.clip(rate, bounds[0] + 1, bounds[1] - 1), 10.0)
+    for _ in range(iterations):
+        if not len(rows):  # alle konvergiert (oder von Anfang an keine Zeile mit Vorzeichenwechsel)
+            break
+        weighted = profit * discount_factors(years, rate)
+        npv = weighted.sum(axis=1)
+        slope = -(weighted @ years) / (100 + rate)
+        # Intervall verkleinern: rate ersetzt die Grenze mit gleichem Vorzeichen des Kapitalwerts
+        same_sign = np.sign(npv) == np.sign(npv_low)
+        low, npv_low = np.where(same_sign, rate, low), np.where(same_sign, npv, npv_low)
+        high = np.where(same_sign, high, rate)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            step = rate - npv / slope
+        new_rate = np.where((step >= low) & (step <= high), step, (low + high) / 2)
+        done = (np.abs(new_rate - rate) <= tolerance) | (high - low <= tolerance)
+        rate = new_rate
+        if done.any():
+            result[rows[done]] = rate[done]
+            active = ~done
+            rows, profit, npv_low = rows[active], profit[active], npv_low[active]
+            low, high, rate = low[active], high[active], rate[active]
+    result[rows] = rate  # nach iterations Schritten nicht konvergiert: letzte Näherung
+    return result
+
+
+def cashflow_matrix(project_duration, ramp_up_time, basisumsatz, cost_savings,
+                    development_cost, risk_budget, operating_cost, growth_rates, wacc=DEFAULT_WACC,
+                    solve_irr=True, periods_per_year=1):
+    # Alle Eingaben sind Vektoren (eine Initiative je Element), growth_rates ist eine Matrix
+    # Initiativen x Perioden mit der jährlichen Wachstumsrate (%) je Periode (period_times() bzw.
+    # growth_rate_matrix() mit derselben Auflösung), wacc die Kapitalkosten in %.
+    # Mit solve_irr=False bleibt der (iterativ gesuchte) interne Zinsfuß NaN.
+    growth_rates = np.atleast_2d(np.asarray(growth_rates, dtype=float))
+    n_initiatives, n_periods = growth_rates.shape
+    if (n_periods - 1) % periods_per_year:
+        raise ValueError(f'growth_rates hat {n_periods} Perioden, erwartet Jahre * {periods_per_year} + 1')
+
+    def column(values):
+        return np.broadcast_to(np.asarray(values, dtype=float), (n_initiatives,))[:, None]
+
+    periods = np.arange(n_periods)
+    times = periods / periods_per_year
+    duration = column(project_duration)
+
+    # Nach der Anlaufzeit fallen Umsatz, Einsparungen und Betriebskosten an (Periode 0 nie)
+    active = (periods > column(ramp_up_time) * periods_per_year) & (periods <= duration * periods_per_year)
+    active[:, 0] = False
+
+    # Umsatz: Basisumsatz in der ersten aktiven Periode, danach Zinseszins über die Wachstumsraten
+    # (unterjährig je Periode die m-te Wurzel des Jahresfaktors). Anders als die frühere Jahresschleife
+    # startet ein durch -100 % Wachstum auf 0 gefallener Umsatz nicht wieder beim Basisumsatz.
+    first_active = np.where(active.any(axis=1), active.argmax(axis=1), n_periods)
+    factors = 1 + growth_rates / 100
+    if periods_per_year > 1:
+        factors = np.maximum(factors, 0.0) ** (1 / periods_per_year)
+    factors[periods <= first_active[:, None]] = 1.0
+    revenue = np.where(active, column(basisumsatz) / periods_per_year * np.cumprod(factors, axis=1), 0.0)
+
+    # Kosten: Anfangsinvestition in Periode 0, laufende Betriebskosten nach der Anlaufzeit
+    costs = np.where(active, column(operating_cost) / periods_per_year, 0.0)
+    costs[:, 0] = (column(development_cost) + column(risk_budget))[:, 0]
+    savings = np.where(active, column(cost_savings) / periods_per_year, 0.0)
+
+    # Gewinn = Umsatz + Kosteneinsparungen - Kosten (in der aktuellen Periode)
+    profit = revenue + savings - costs
+
+    # Amortisation und diskontierte Kennzahlen aus den Periodenwerten (Perioden nach der Laufzeit
+    # haben Gewinn 0 und ändern nichts)
+    discounted_profit = profit * discount_factors(times, column(wacc)[:, 0])
+    payback = payback_periods(times, np.cumsum(profit, axis=1))
+    discounted_payback = payback_periods(times, np.cumsum(discounted_profit, axis=1))
+    irr = internal_rates_of_return(times, profit) if solve_irr else np.full(n_initiatives, np.nan)
+
+    # Ausgegebene Reihen als Jahreswerte
+    revenue, savings, costs, profit = (yearly(a, periods_per_year) for a in (revenue, savings, costs, profit))
+    cumulative_revenue = np.cumsum(revenue, axis=1)
+    cumulative_costs = np.cumsum(costs, axis=1)
+    cumulative_profit = np.cumsum(profit, axis=1)
+
+    total_costs = cumulative_costs[:, -1]
+    total_profit = cumulative_profit[:, -1]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        roi = np.where(total_costs > 0, total_profit / total_costs * 100, np.nan)
+
+    return CashflowMatrix(
+        years=np.arange(revenue.shape[1]),
+        revenue=revenue,
+        cost_savings=savings,
+        costs=costs,
+        profit=profit,
+        cumulative_revenue=cumulative_revenue,
+        cumulative_costs=cumulative_costs,
+        cumulative_profit=cumulative_profit,
+        total_revenue=cumulative_revenue[:, -1],
+        total_costs=total_costs,
+        total_profit=total_profit,
+        roi=roi,
+        payback_period=payback,
+        npv=discounted_profit.sum(axis=1),
+        irr=irr,
+        discounted_payback=discounted_payback,
+    )
+
+
+def compute_cashflow(project_duration, ramp_up_time=0.0, growth_periods=(), basisumsatz=0.0,
+                     cost_savings=0.0, development_cost=0.0, risk_budget=0.0, operating_cost=0.0,
+                     wacc=DEFAULT_WACC, periods_per_year=1):
+    # Cashflow-Modell für eine einzelne Initiative (Schritt 5)
+    project_duration = int(project_duration)
+    periods_per_year = int(periods_per_year)
+    matrix = cashflow_matrix(
+        project_duration, ramp_up_time, basisumsatz, cost_savings,
+        development_cost, risk_budget, operating_cost,
+        growth_rates(period_times(project_duration, periods_per_year), growth_periods)[None, :],
+        wacc,
+        periods_per_year=periods_per_year,
+    )
+    years = matrix.years  # Einschließlich Jahr 0 bis Projektlaufzeit
+    roi = float(matrix.roi[0])
+    payback = float(matrix.payback_period[0])
+    irr = float(matrix.irr[0])
+    discounted_payback = float(matrix.discounted_payback[0])
+    for array in (years, matrix.revenue, matrix.cost_savings, matrix.costs, matrix.profit,
+                  matrix.cumulative_revenue, matrix.cumulative_costs, matrix.cumulative_profit):
+        array.flags.writeable = False  # Ergebnisse werden im Cache geteilt
+    return CashflowResult(
+        years=years,
+        revenue=matrix.revenue[0],
+        cost_savings=matrix.cost_savings[0],
+        costs=matrix.costs[0],
+        profit=matrix.profit[0],
+        cumulative_revenue=matrix.cumulative_revenue[0],
+        cumulative_costs=matrix.cumulative_costs[0],
+        cumulative_profit=matrix.cumulative_profit[0],
+        total_revenue=float(matrix.total_revenue[0]),
+        total_costs=float(matrix.total_costs[0]),
+        total_profit=float(matrix.total_profit[0]),
+        roi=None if np.isnan(roi) else roi,
+        payback_period=None if np.isnan(payback) else payback,
+        npv=float(matrix.npv[0]),
+        irr=None if np.isnan(irr) else irr,
+        discounted_payback=None if np.isnan(discounted_payback) else discounted_payback,
+    )
+
+
+# Wie compute_cashflow, aber je normalisierter Eingabe (Laufzeit, Anlaufzeit, Wachstumsperioden,
+# Basisumsatz, Kosten, WACC, Zeitauflösung) nur einmal berechnet; Trefferstatistik unter
+# cached_compute_cashflow.cache
+cached_compute_cashflow = memoize(CASHFLOW_CACHE_SIZE)(compute_cashflow)
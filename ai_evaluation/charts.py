@@ -0,0 +1,117 @@
+"""Diagramme der Bewertungsschritte als fertig gerenderte Bilder (PNG oder SVG).
+
+Jedes Diagramm wird je Eingabe nur einmal gerendert und als Bytes in einem
+begrenzten LRU-Cache gehalten; weitere Reruns mit denselben Eingaben liefern
+die Bytes direkt aus dem Cache. Die Figuren werden ohne pyplot erzeugt und
+nach dem Rendern geschlossen, damit kein globaler Figurenspeicher wächst.
+Die Laufzeitmessung (ai_evaluation.metrics) erfasst nur tatsächliches Rendern,
+keine Cache-Treffer.
+"""
+
+from io import BytesIO
+
+from . import metrics
+from .cache import memoize
+
+# Anzahl der zwischengespeicherten Bilder je Diagrammart
+CHART_CACHE_SIZE = 64
+
+# Auflösung wie bei st.pyplot
+CHART_DPI = 200
+
+
+def _figure(figsize=None):
+    from matplotlib.figure import Figure
+
+    return Figure(figsize=figsize)
+
+
+def _render(fig, fmt):
+    buffer = BytesIO()
+    try:
+        fig.savefig(buffer, format=fmt, dpi=CHART_DPI, bbox_inches='tight')
+    finally:
+        fig.clear()
+    return buffer.getvalue()
+
+
+@memoize(CHART_CACHE_SIZE)
+@metrics.timer('diagramm.amortisation')
+def amortisation_chart(years, cumulative_revenue, cumulative_costs, ramp_up_time, payback_period,
+                       project_duration, fmt='png'):
+    # Amortisationsdiagramm aus Schritt 5: kumulierter Umsatz und Kosten mit Anlaufzeit und Break-Even
+    fig = _figure(figsize=(10, 6))
+    ax = fig.subplots()
+    ax.plot(years, cumulative_revenue, label='Kumulativer Umsatz', marker='o')
+    ax.plot(years, cumulative_costs, label='Kumulative Kosten', marker='o')
+    if ramp_up_time > 0:
+        ax.axvspan(0, ramp_up_time, color='yellow', alpha=0.3, label='Anlaufzeit')
+    if payback_period is not None:
+        ax.axvline(x=payback_period, color='grey', linestyle='--',
+                   label=f'Break-Even-Punkt ({payback_period:.2f} Jahr(e))')
+    ax.set_xlabel('Jahre')
+    ax.set_ylabel('Euro (€)')
+    ax.set_title('Amortisationsdiagramm mit Break-Even-Punkt')
+    ax.set_xlim(0, project_duration)
+    ax.legend()
+    return _render(fig, fmt)
+
+
+@memoize(CHART_CACHE_SIZE)
+@metrics.timer('diagramm.risikomatrix')
+def risk_matrix_chart(risks, fmt='png'):
+    # Risikomatrix aus Schritt 6; risks ist die Liste der Risiken wie in den Sitzungsdaten
+    fig = _figure()
+    ax = fig.subplots()
+    ax.scatter(
+        [r['Wahrscheinlichkeit'] for r in risks],
+        [r['Auswirkung'] for r in risks],
+        s=100,
+        c='red',
+    )
+    for risk in risks:
+        ax.annotate(risk['Beschreibung'], (risk['Wahrscheinlichkeit'], risk['Auswirkung']))
+    ax.set_xlabel('Wahrscheinlichkeit (%)')
+    ax.set_ylabel('Auswirkung (1-10)')
+    ax.set_title('Risikomatrix')
+    return _render(fig, fmt)
+
+
+@memoize(CHART_CACHE_SIZE)
+@metrics.timer('diagramm.nutzwert')
+def score_chart(weighted_scores, fmt='png'):
+    # Balkendiagramm der gewichteten Bewertungen aus Schritt 13 (Kriterium -> Wert)
+    fig = _figure()
+    ax = fig.subplots()
+    ax.bar(list(weighted_scores.keys()), list(weighted_scores.values()), color='skyblue')
+    ax.set_ylabel('Gewichtete Bewertung')
+    ax.set_ylim(0, 10)
+    ax.tick_params(axis='x', labelrotation=45)
+    return _render(fig, fmt)
+
+
+@memoize(CHART_CACHE_SIZE)
+@metrics.timer('diagramm.tornado')
+def tornado_chart(rows, level, metric_label, fmt='png'):
+    # Tornado-Diagramm der Sensitivitätsanalyse aus Schritt 5; rows ist eine Liste
+    # (Parameter, Änderung bei -level %, Änderung bei +level %), größte Spannweite zuerst
+    fig = _figure(figsize=(10, max(3, 0.5 * len(rows) + 1)))
+    ax = fig.subplots()
+    labels = [row[0] for row in rows][::-1]  # größte Spannweite oben
+    low = [0.0 if row[1] != row[1] else row[1] for row in rows][::-1]  # NaN (z.B. kein Break-Even) als 0
+    high = [0.0 if row[2] != row[2] else row[2] for row in rows][::-1]
+    ax.barh(labels, low, color='tomato', label=f'-{level:g} %')
+    ax.barh(labels, high, color='seagreen', alpha=0.8, label=f'+{level:g} %')
+    ax.axvline(0, color='black', linewidth=0.8)
+    ax.set_xlabel(f'Änderung {metric_label}')
+    ax.set_title(f'Sensitivität (Eingaben ±{level:g} %)')
+    ax.legend()
+    return _render(fig, fmt)
+
+
+def cache_stats():
+    # Trefferstatistik aller Diagramm-Caches
+    return {
+        chart.__name__: chart.cache.stats()
+        for chart in (amortisation_chart, risk_matrix_chart, score_chart, tornado_chart)
+    }
@@ -0,0 +1,74 @@
+"""Verbindungsverwaltung für ki_initiativen.db.
+
+Streamlit führt jede Sitzung in eigenen Threads aus. Statt einer globalen
+Verbindung leiht sich jeder Thread für die Dauer eines Zugriffs eine eigene
+Verbindung aus dem Pool; ungenutzte Verbindungen werden wiederverwendet.
+"""
+
+import sqlite3
+import threading
+from contextlib import contextmanager
+
+DB_PATH = 'ki_initiativen.db'
+
+# Pragmas für jede neue Verbindung. WAL erlaubt parallele Leser neben einem Schreiber,
+# synchronous=NORMAL ist im WAL-Modus absturzsicher und spart ein fsync pro Commit.
+PRAGMAS = (
+    'PRAGMA journal_mode = WAL',
+    'PRAGMA synchronous = NORMAL',
+    'PRAGMA busy_timeout = 5000',
+    'PRAGMA foreign_keys = ON',
+)
+
+
+def connect(db_path=DB_PATH):
+    # Neue Verbindung mit den Standard-Pragmas. check_same_thread ist deaktiviert, weil
+    # der Pool eine Verbindung nacheinander an verschiedene Threads verleiht (nie gleichzeitig).
+    conn = sqlite3.connect(db_path, check_same_thread=False)
+    for pragma in PRAGMAS:
+        conn.execute(pragma)
+    return conn
+
+
+class ConnectionPool:
+    def __init__(self, db_path=DB_PATH, max_idle=8):
+        self.db_path = db_path
+        self.max_idle = max_idle  # Anzahl der Verbindungen, die für die Wiederverwendung offen bleiben
+        self._idle = []
+        self._lock = threading.Lock()
+        self._closed = False
+
+    @contextmanager
+    def connection(self):
+        # Leiht eine Verbindung exklusiv für den aktuellen Thread aus
+        conn = self._acquire()
+        try:
+            yield conn
+        finally:
+            self._release(conn)
+
+    def close(self):
+        # Schließt alle ungenutzten Verbindungen; ausgeliehene werden bei Rückgabe geschlossen
+        with self._lock:
+            self._closed = True
+            idle, self._idle = self._idle, []
+        for conn in idle:
+            conn.close()
+
+    def _acquire(self):
+        with self._lock:
+            if self._closed:
+                raise RuntimeError('ConnectionPool wurde bereits geschlossen.')
+            if self._idle:
+                return self._idle.pop()
+        return connect(self.db_path)
+
+    def _release(self, conn):
+        # Nicht abgeschlossene Transaktionen dürfen nicht an den nächsten Thread weitergegeben werden
+        if conn.in_transaction:
+            conn.rollback()
+        with self._lock:
+            if not self._closed and len(self._idle) < self.max_idle:
+                self._idle.append(conn)
+                return
+        conn.close()
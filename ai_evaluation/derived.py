@@ -0,0 +1,130 @@
+"""Abgeleitete Werte der Bewertung als Abhängigkeitsgraph über den Eingabefeldern.
+
+Jeder abgeleitete Wert deklariert, aus welchen Eingabefeldern oder anderen
+abgeleiteten Werten er berechnet wird. Berechnet wird erst beim Zugriff und
+nur, wenn sich eines der zugrunde liegenden Eingabefelder seit der letzten
+Berechnung geändert hat; eine geänderte Entwicklungskosten-Angabe macht also
+z.B. Anfangsinvestition und Finanzmodell ungültig, die Nutzwertanalyse nicht.
+Namen mit führendem Unterstrich sind Zwischenergebnisse und landen nicht in
+den Eingabedaten.
+"""
+
+from dataclasses import dataclass
+from typing import Callable
+
+from . import engine
+from .cache import normalise
+from .storage import SCORE_CRITERIA
+
+# Ergebnis, wenn Pflichteingaben fehlen (None ist ein gültiger Wert, z.B. ROI ohne Kosten)
+MISSING = object()
+
+
+@dataclass(frozen=True)
+class Derivation:
+    inputs: tuple  # Eingabefelder oder Namen anderer abgeleiteter Werte
+    compute: Callable  # erhält die Werte von inputs in derselben Reihenfolge
+    required: tuple = ()  # fehlt eines dieser Felder, bleibt der Wert unberechnet
+
+
+def _cashflow(*values):
+    return engine.financial_model(dict(zip(engine.CASHFLOW_FIELDS, values)))
+
+
+def _weighted_scores(*values):
+    *scores, weights = values
+    return engine.weighted_scores(dict(zip(SCORE_CRITERIA, scores)), weights)
+
+
+def _from_cashflow(key):
+    return Derivation(('_cashflow_values',), lambda values: values[key])
+
+
+GRAPH = {
+    'Anfangsinvestition': Derivation(
+        ('Entwicklungskosten', 'Risikobudget'), engine.initial_investment, required=('Entwicklungskosten',),
+    ),
+    '_cashflow': Derivation(tuple(engine.CASHFLOW_FIELDS), _cashflow, required=engine.CASHFLOW_REQUIRED),
+    '_cashflow_values': Derivation(('_cashflow',), engine.cashflow_values),
+    **{
+        key: _from_cashflow(key)
+        for key in (
+            'Jährlicher Umsatz (€)',
+            'Kosteneinsparungen je Jahr (€)',
+            'Jährliche Kosten (€)',
+            'Jährlicher Gewinn (€)',
+            'Gesamtkosten (€)',
+            'Gesamter Gewinn (€)',
+            'ROI (%)',
+            'Amortisationsdauer (Jahre)',
+            'Kapitalwert (€)',
+            'Interner Zinsfuß (%)',
+            'Diskontierte Amortisationsdauer (Jahre)',
+            'Businessplan',
+        )
+    },
+    'Gewichtete Bewertungen': Derivation(
+        SCORE_CRITERIA + ('Gewichtungen',), _weighted_scores, required=('Gewichtungen',),
+    ),
+    'Gesamtbewertung': Derivation(('Gewichtete Bewertungen',), lambda weighted: sum(weighted.values())),
+}
+
+
+class DerivedValues:
+    def __init__(self, graph=GRAPH):
+        self.graph = graph
+        self.computations = 0  # Anzahl tatsächlicher Neuberechnungen
+        self._values = {}  # Name -> (Fingerabdruck der Eingabefelder, Wert)
+        self._fields = {name: self._input_fields(name) for name in graph}
+
+    def _input_fields(self, name):
+        # Alle Eingabefelder, von denen name direkt oder über andere abgeleitete Werte abhängt
+        fields = []
+        for dependency in self.graph[name].inputs:
+            for field in self._input_fields(dependency) if dependency in self.graph else (dependency,):
+                if field not in fields:
+                    fields.append(field)
+        return tuple(fields)
+
+    def dependents(self, field):
+        # Abgeleitete Werte, die bei einer Änderung von field neu berechnet werden müssen
+        return [name for name, fields in self._fields.items() if field in fields]
+
+    def _fingerprint(self, data, name):
+        return normalise([data.get(field) for field in self._fields[name]])
+
+    def is_dirty(self, data, name):
+        cached = self._values.get(name)
+        return cached is None or cached[0] != self._fingerprint(data, name)
+
+    def get(self, data, name):
+        # Aktueller Wert von name für data; MISSING, wenn Pflichteingaben fehlen
+        derivation = self.graph[name]
+        fingerprint = self._fingerprint(data, name)
+        cached = self._values.get(name)
+        if cached is not None and cached[0] == fingerprint:
+            return cached[1]
+        if any(data.get(field) is None for field in derivation.required):
+            value = MISSING
+        else:
+            arguments = [self.get(data, i) if i in self.graph else data.get(i) for i in derivation.inputs]
+            if any(argument is MISSING for argument in arguments):
+                value = MISSING
+            else:
+                value = derivation.compute(*arguments)
+                self.computations += 1
+        self._values[name] = (fingerprint, value)
+        return value
+
+    def update(self, data):
+        # Schreibt alle berechenbaren abgeleiteten Werte in data (nur geänderte werden neu berechnet);
+        # nicht mehr berechenbare (z.B. nach geleerter Eingabe) werden entfernt statt veraltet zu bleiben
+        for name in self.graph:
+            if name.startswith('_'):
+                continue
+            value = self.get(data, name)
+            if value is MISSING:
+                data.pop(name, None)
+            else:
+                data[name] = value
+        return data
@@ -0,0 +1,221 @@
+"""Bewertungslogik einer KI-Initiative ohne Streamlit.
+
+Stabile Python-API für Kostenaggregation (Schritt 4), Finanzmodell mit ROI,
+Amortisationsdauer und diskontierten Kennzahlen (Schritt 5), Risikobewertung (Schritt 6) und
+Nutzwertanalyse (Schritt 13). Eingaben sind Dicts mit denselben Schlüsseln wie
+st.session_state.data bzw. storage.load_initiative(); die Streamlit-Oberfläche
+sammelt nur die Eingaben und zeigt die Ergebnisse an.
+
+    from ai_evaluation.engine import evaluate
+    result = evaluate(data)
+    result.roi, result.payback_period, result.npv, result.gesamtbewertung, result.to_dict()
+"""
+
+from dataclasses import dataclass
+from typing import Optional
+
+from . import metrics
+from .storage import SCORE_CRITERIA
+
+# Standardgewichtung je Kriterium der Nutzwertanalyse (%)
+DEFAULT_WEIGHT = 20.0
+
+# Eingaben des Finanzmodells (Schlüssel im Eingabe-Dict -> Parameter von compute_cashflow)
+CASHFLOW_FIELDS = {
+    'Projektlaufzeit (Jahre)': 'project_duration',
+    'Anlaufzeit (Jahre)': 'ramp_up_time',
+    'Dynamische Wachstumsraten': 'growth_periods',
+    'Basisumsatz (€)': 'basisumsatz',
+    'Jährliche Kosteneinsparungen (€)': 'cost_savings',
+    'Entwicklungskosten': 'development_cost',
+    'Risikobudget': 'risk_budget',
+    'Laufende Betriebskosten': 'operating_cost',
+    'WACC (%)': 'wacc',
+    'Perioden pro Jahr': 'periods_per_year',
+}
+
+# Ohne diese Eingaben lässt sich das Finanzmodell nicht berechnen (z.B. ältere gespeicherte Initiativen)
+CASHFLOW_REQUIRED = ('Projektlaufzeit (Jahre)', 'Basisumsatz (€)')
+
+
+def _amount(value):
+    return value or 0.0
+
+
+# --- Schritt 4: Kosten ---
+
+def initial_investment(development_cost, risk_budget):
+    # Anfangsinvestition = Entwicklungskosten + Risikobudget
+    return _amount(development_cost) + _amount(risk_budget)
+
+
+# --- Schritt 5: Finanzmodell ---
+
+def validate_growth_periods(growth_periods):
+    # Fehlermeldungen zu den Wachstumsperioden (leer, wenn gültig); Überschneidungen
+    # erkennt der sortierte Index, die Reihenfolge der Eingabe spielt keine Rolle
+    from .cashflow import growth_index
+
+    errors = []
+    for earlier, later in growth_index(growth_periods).overlaps:
+        if later == earlier + 1:
+            errors.append(f"Zeitraum {later + 1}: Startjahr muss nach dem Endjahr des vorherigen Zeitraums liegen.")
+        else:
+            errors.append(f"Zeitraum {later + 1}: Überschneidet sich mit Zeitraum {earlier + 1}.")
+    return errors
+
+
+@metrics.timer('finanzmodell')
+def financial_model(data):
+    # CashflowResult für die Eingaben in data (zwischengespeichert je Eingabe), None ohne Pflichteingaben
+    if any(data.get(field) is None for field in CASHFLOW_REQUIRED):
+        return None
+    from .cashflow import DEFAULT_WACC, cached_compute_cashflow
+
+    return cached_compute_cashflow(
+        int(data['Projektlaufzeit (Jahre)']),
+        ramp_up_time=_amount(data.get('Anlaufzeit (Jahre)')),
+        growth_periods=data.get('Dynamische Wachstumsraten') or (),
+        basisumsatz=_amount(data.get('Basisumsatz (€)')),
+        cost_savings=_amount(data.get('Jährliche Kosteneinsparungen (€)')),
+        development_cost=_amount(data.get('Entwicklungskosten')),
+        risk_budget=_amount(data.get('Risikobudget')),
+        operating_cost=_amount(data.get('Laufende Betriebskosten')),
+        wacc=DEFAULT_WACC if data.get('WACC (%)') is None else data['WACC (%)'],
+        periods_per_year=int(data.get('Perioden pro Jahr') or 1),
+    )
+
+
+def cashflow_values(cashflow):
+    # Ergebnisse des Finanzmodells unter den Schlüsseln des Eingabe-Dicts
+    return {
+        'Jährlicher Umsatz (€)': cashflow.revenue.tolist(),
+        'Kosteneinsparungen je Jahr (€)': cashflow.cost_savings.tolist(),
+        'Jährliche Kosten (€)': cashflow.costs.tolist(),
+        'Jährlicher Gewinn (€)': cashflow.profit.tolist(),
+        'Gesamtkosten (€)': cashflow.total_costs,
+        'Gesamter Gewinn (€)': cashflow.total_profit,
+        'ROI (%)': cashflow.roi,
+        'Amortisationsdauer (Jahre)': cashflow.payback_period,
+        'Kapitalwert (€)': cashflow.npv,
+        'Interner Zinsfuß (%)': cashflow.irr,
+        'Diskontierte Amortisationsdauer (Jahre)': cashflow.discounted_payback,
+        'Businessplan': business_plan_records(cashflow),
+    }
+
+
+def business_plan_records(cashflow):
+    # Businessplan als Liste von Zeilen (Dicts), wie im Bericht ausgegeben
+    columns = (
+        ('Jahr', cashflow.years),
+        ('Umsatz (€)', cashflow.revenue),
+        ('Kosteneinsparungen (€)', cashflow.cost_savings),
+        ('Kosten (€)', cashflow.costs),
+        ('Gewinn (€)', cashflow.profit),
+        ('Kumulativer Umsatz (€)', cashflow.cumulative_revenue),
+        ('Kumulative Kosten (€)', cashflow.cumulative_costs),
+        ('Kumulativer Gewinn (€)', cashflow.cumulative_profit),
+    )
+    lists = [(name, values.tolist()) for name, values in columns]
+    return [{name: values[i] for name, values in lists} for i in range(len(cashflow.years))]
+
+
+# --- Schritt 6: Risikobewertung ---
+
+@dataclass(frozen=True)
+class RiskScore:
+    beschreibung: str
+    wahrscheinlichkeit: float  # in %
+    auswirkung: float  # 1-10
+    risikowert: float  # Wahrscheinlichkeit x Auswirkung, 0-10
+
+
+def risk_scores(risks):
+    # Risikowert je Risiko, höchster Wert zuerst
+    scores = [
+        RiskScore(
+            beschreibung=risk.get('Beschreibung', ''),
+            wahrscheinlichkeit=float(risk.get('Wahrscheinlichkeit', 0)),
+            auswirkung=float(risk.get('Auswirkung', 0)),
+            risikowert=float(risk.get('Wahrscheinlichkeit', 0)) / 100 * float(risk.get('Auswirkung', 0)),
+        )
+        for risk in risks or ()
+    ]
+    return sorted(scores, key=lambda score: score.risikowert, reverse=True)
+
+
+# --- Schritt 13: Nutzwertanalyse ---
+
+def criterion_scores(data):
+    # Bewertungen der Kriterien aus den Schritten 3 und 7 (0 ohne Angabe)
+    return {criterion: data.get(criterion, 0) for criterion in SCORE_CRITERIA}
+
+
+def weights_valid(weights):
+    return sum(weights.values()) == 100.0
+
+
+def weighted_scores(scores, weights):
+    # Bewertung je Kriterium gewichtet mit der Gewichtung (%)
+    return {criterion: _amount(scores[criterion]) * (weights.get(criterion, 0.0) / 100) for criterion in scores}
+
+
+def utility_analysis(scores, weights):
+    # (gewichtete Bewertungen, Gesamtbewertung)
+    weighted = weighted_scores(scores, weights)
+    return weighted, sum(weighted.values())
+
+
+# --- Gesamtbewertung ---
+
+@dataclass(frozen=True)
+class EvaluationResult:
+    anfangsinvestition: Optional[float]
+    cashflow: Optional[object]  # CashflowResult, None ohne Finanzmodell
+    risks: tuple  # RiskScore, höchster Risikowert zuerst
+    weighted_scores: Optional[dict]  # None ohne Gewichtungen
+    gesamtbewertung: Optional[float]
+
+    @property
+    def roi(self):
+        return self.cashflow.roi if self.cashflow is not None else None
+
+    @property
+    def payback_period(self):
+        return self.cashflow.payback_period if self.cashflow is not None else None
+
+    @property
+    def npv(self):
+        return self.cashflow.npv if self.cashflow is not None else None
+
+    @property
+    def irr(self):
+        return self.cashflow.irr if self.cashflow is not None else None
+
+    def to_dict(self):
+        # Abgeleitete Werte unter den Schlüsseln des Eingabe-Dicts (nur berechenbare)
+        values = {}
+        if self.anfangsinvestition is not None:
+            values['Anfangsinvestition'] = self.anfangsinvestition
+        if self.cashflow is not None:
+            values.update(cashflow_values(self.cashflow))
+        if self.weighted_scores is not None:
+            values['Gewichtete Bewertungen'] = self.weighted_scores
+            values['Gesamtbewertung'] = self.gesamtbewertung
+        return values
+
+
+def evaluate(data):
+    # Vollständige Bewertung einer Initiative aus ihrem Eingabe-Dict
+    weights = data.get('Gewichtungen')
+    weighted, total = utility_analysis(criterion_scores(data), weights) if weights else (None, None)
+    return EvaluationResult(
+        anfangsinvestition=(
+            initial_investment(data['Entwicklungskosten'], data.get('Risikobudget'))
+            if data.get('Entwicklungskosten') is not None else None
+        ),
+        cashflow=financial_model(data),
+        risks=tuple(risk_scores(data.get('Risiken'))),
+        weighted_scores=weighted,
+        gesamtbewertung=total,
+    )
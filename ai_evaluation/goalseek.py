@@ -0,0 +1,310 @@
+"""Zielwertsuche im Finanzmodell aus Schritt 5.
+
+Sucht für eine Eingabe (z.B. Basisumsatz oder Entwicklungskosten) den Wert,
+bei dem eine Kennzahl (ROI, Amortisationsdauer oder Kapitalwert) genau einen
+Zielwert erreicht, also den mindestens nötigen Umsatz bzw. die höchstens
+tragbaren Kosten. Alle übrigen Eingaben bleiben unverändert. Die Suche läuft
+für beliebig viele Initiativen gleichzeitig: je Iteration ein Aufruf von
+cashflow_matrix für die noch offenen Initiativen (Regula falsi nach dem
+Illinois-Verfahren, abgesichert durch Bisektion).
+
+Aufruf von der Kommandozeile (alle Initiativen in ki_initiativen.db):
+
+    python -m ai_evaluation.goalseek --eingabe basisumsatz --kennzahl amortisationsdauer --ziel 3
+    python -m ai_evaluation.goalseek --eingabe entwicklungskosten --kennzahl roi --ziel 15 [--csv datei.csv]
+"""
+
+import argparse
+import sys
+import time
+from dataclasses import dataclass, field
+
+import numpy as np
+
+from .cache import memoize
+from .cashflow import DEFAULT_WACC, cashflow_matrix, growth_rates, period_times
+
+# Gesuchte Eingaben: Spalte in initiativen -> (Schlüssel im Eingabe-Dict, Parameter von cashflow_matrix).
+# Umsatz und Einsparungen verbessern die Kennzahlen (gesucht: Mindestwert), Kosten verschlechtern sie
+# (gesucht: Obergrenze).
+VARIABLES = {
+    'basisumsatz': ('Basisumsatz (€)', 'basisumsatz'),
+    'kosteneinsparungen': ('Jährliche Kosteneinsparungen (€)', 'cost_savings'),
+    'entwicklungskosten': ('Entwicklungskosten', 'development_cost'),
+    'laufende_betriebskosten': ('Laufende Betriebskosten', 'operating_cost'),
+}
+INCREASING = ('basisumsatz', 'cost_savings')
+
+# Zielkennzahlen: Spalte in initiativen -> (Feld von CashflowMatrix, Bezeichnung, größer ist besser)
+TARGETS = {
+    'roi': ('roi', 'ROI (%)', True),
+    'amortisationsdauer': ('payback_period', 'Amortisationsdauer (Jahre)', False),
+    'kapitalwert': ('npv', 'Kapitalwert (€)', True),
+}
+
+# Vorgeschlagene Zielwerte je Kennzahl
+DEFAULT_TARGETS = {'roi': 15.0, 'amortisationsdauer': 3.0, 'kapitalwert': 0.0}
+
+# Genauigkeit des Ergebnisses in €, der Kennzahl (in ihrer Einheit) und höchste Anzahl an Iterationen
+TOLERANCE = 0.01
+METRIC_TOLERANCE = 1e-6
+ITERATIONS = 100
+# Das Suchintervall [0, Obergrenze] wird mit EXPANSION vergrößert, bis es das Ziel einschließt, aber
+# nicht über UPPER_LIMIT (€) hinaus: Ziele, die erst darüber (oder nur asymptotisch) erreicht würden,
+# gelten als nicht erreichbar bzw. die Kosten als ohne Obergrenze
+EXPANSION = 4.0
+UPPER_LIMIT = 1e12
+
+# Anzahl der zwischengespeicherten Ergebnisse von cached_goal_seek
+GOAL_SEEK_CACHE_SIZE = 64
+
+# Eingaben von cashflow_matrix, die je Initiative ein Vektor sind
+_VECTOR_INPUTS = ('project_duration', 'ramp_up_time', 'basisumsatz', 'cost_savings',
+                  'development_cost', 'risk_budget', 'operating_cost', 'wacc')
+
+
+@dataclass(frozen=True)
+class GoalSeekResult:
+    variable: str  # Spalte in initiativen, z.B. 'basisumsatz'
+    metric: str  # 'roi', 'amortisationsdauer' oder 'kapitalwert'
+    target: float
+    current: np.ndarray  # aktueller Wert der Eingabe je Initiative
+    values: np.ndarray  # gesuchter Wert je Initiative; NaN: Ziel nicht erreichbar, inf: keine Obergrenze
+    achieved: np.ndarray  # Kennzahl beim gesuchten Wert
+    iterations: int
+    seconds: float = field(default=0.0, compare=False)
+
+    @property
+    def is_minimum(self):
+        # True, wenn values ein Mindestwert ist (Umsatz, Einsparungen), sonst eine Obergrenze (Kosten)
+        return VARIABLES[self.variable][1] in INCREASING
+
+    def headroom(self):
+        # Gesuchter minus aktueller Wert: bei Mindestwerten der fehlende Betrag (negativ: Reserve),
+        # bei Obergrenzen der verbleibende Spielraum (negativ: Überschreitung)
+        return self.values - self.current
+
+
+def _metric_values(result, metric, target):
+    # Abstand der Kennzahl zum Ziel, so ausgerichtet, dass >= 0 "Ziel erreicht" bedeutet.
+    # Ohne Break-Even gilt die Amortisationsdauer als länger als die Laufzeit, ohne Kosten (ROI NaN)
+    # ist ein nicht negativer Gewinn ein erreichtes Ziel.
+    attribute, _, higher_is_better = TARGETS[metric]
+    values = getattr(result, attribute)
+    if attribute == 'payback_period':
+        never_negative = (result.cumulative_profit >= 0).all(axis=1)
+        values = np.where(np.isnan(values), np.where(never_negative, 0.0, np.inf), values)
+    elif attribute == 'roi':
+        values = np.where(np.isnan(values), np.where(result.total_profit >= 0, np.inf, -np.inf), values)
+    return values - target if higher_is_better else target - values
+
+
+def solve(inputs, variable, metric, target, tolerance=TOLERANCE, iterations=ITERATIONS):
+    # Zielwertsuche für alle Initiativen in inputs (Parameter von cashflow_matrix, wie
+    # portfolio.cashflow_inputs()); variable und metric als Schlüssel von VARIABLES bzw. TARGETS
+    start = time.perf_counter()
+    periods_per_year = inputs.get('periods_per_year', 1)
+    growth = np.atleast_2d(np.asarray(inputs['growth_rates'], dtype=float))
+    n = growth.shape[0]
+    inputs = {
+        **{name: np.broadcast_to(np.asarray(inputs.get(name, DEFAULT_WACC if name == 'wacc' else 0.0),
+                                            dtype=float), (n,))
+           for name in _VECTOR_INPUTS},
+        'growth_rates': growth,
+    }
+    param = VARIABLES[variable][1]
+    increasing = param in INCREASING
+    current = inputs[param].copy()
+
+    def distance(rows, x):
+        # Abstand zum Ziel für die Initiativen rows, wenn die Eingabe den Wert x hat
+        if not len(rows):
+            return np.empty(0)
+        kwargs = {name: values[rows] for name, values in inputs.items()}
+        kwargs[param] = x
+        result = cashflow_matrix(**kwargs, solve_irr=False, periods_per_year=periods_per_year)
+        return _metric_values(result, metric, target)
+
+    # Suchintervall [low, high]: beim nicht zielerreichenden Ende beginnen, das andere Ende vergrößern,
+    # bis sich das Vorzeichen des Abstands ändert
+    values = np.full(n, np.nan)
+    rows = np.arange(n)
+    low = np.zeros(n)
+    f_low = distance(rows, low)
+    if increasing:
+        # Ziel schon ohne Umsatz bzw. Einsparungen erreicht: Mindestwert 0
+        values[f_low >= 0] = 0.0
+        rows = rows[f_low < 0]
+    else:
+        # Ziel selbst ohne Kosten nicht erreichbar: NaN
+        rows = rows[f_low >= 0]
+    low, f_low = low[rows], f_low[rows]
+    high = np.clip(np.abs(current[rows]) * 2, 1000.0, UPPER_LIMIT)
+    f_high = distance(rows, high)
+    bracketed = (f_high >= 0) if increasing else (f_high < 0)
+    while True:
+        open_rows = ~bracketed & (high < UPPER_LIMIT)
+        if not open_rows.any():
+            break
+        high = np.where(open_rows, np.minimum(high * EXPANSION, UPPER_LIMIT), high)
+        f_high[open_rows] = distance(rows[open_rows], high[open_rows])
+        bracketed = (f_high >= 0) if increasing else (f_high < 0)
+    if not increasing:
+        # Kosten, die das Ziel nie verfehlen lassen: keine Obergrenze
+        values[rows[~bracketed]] = np.inf
+    rows, low, high, f_low, f_high = (a[bracketed] for a in (rows, low, high, f_low, f_high))
+
+    # Regula falsi (Illinois): der Abstand ist in der Eingabe monoton und meist glatt, bei ROI und
+    # Kapitalwert im Umsatz sogar linear. Bei nicht endlichen Abständen (z.B. ohne Break-Even)
+    # wird die Intervallmitte genommen, Schritte auf oder außerhalb der Grenzen werden um eine
+    # halbe Toleranz nach innen verschoben.
+    side = np.zeros(len(rows), dtype=int)  # -1/+1: welche Grenze zuletzt zweimal in Folge blieb
+    iteration = 0
+    for iteration in range(1, iterations + 1):
+        done = high - low <= np.maximum(tolerance, 1e-12 * high)
+        if done.any():
+            # Ergebnis ist die zielerreichende Grenze: Mindestwert oben, Obergrenze unten
+            values[rows[done]] = high[done] if increasing else low[done]
+            active = ~done
+            rows, low, high, f_low, f_high, side = (a[active] for a in (rows, low, high, f_low, f_high, side))
+        if not len(rows):
+            break
+        with np.errstate(divide='ignore', invalid='ignore'):
+            x = high - f_high * (high - low) / (f_high - f_low)
+        step = np.maximum(tolerance, 1e-12 * high) / 2
+        secant = np.isfinite(f_low) & np.isfinite(f_high) & np.isfinite(x)
+        x = np.where(secant, np.clip(x, low + step, high - step), (low + high) / 2)
+        f_x = distance(rows, x)
+        # Grenze auf derselben Seite des Ziels wie x ersetzen; bleibt eine Grenze zweimal in Folge,
+        # wird ihr Abstand halbiert (Illinois)
+        replaces_low = (f_x >= 0) == (f_low >= 0)
+        keep_high = replaces_low & (side == 1)
+        keep_low = ~replaces_low & (side == -1)
+        f_high = np.where(keep_high, f_high / 2, f_high)
+        f_low = np.where(keep_low, f_low / 2, f_low)
+        low, f_low = np.where(replaces_low, x, low), np.where(replaces_low, f_x, f_low)
+        high, f_high = np.where(replaces_low, high, x), np.where(replaces_low, f_high, f_x)
+        side = np.where(replaces_low, 1, -1)
+        # Ziel bis auf METRIC_TOLERANCE erreicht: x ist das Ergebnis
+        hit = (f_x >= 0) & (f_x <= METRIC_TOLERANCE)
+        low, high = np.where(hit, x, low), np.where(hit, x, high)
+    values[rows] = high if increasing else low  # nach iterations Schritten: zielerreichende Grenze
+
+    solved = np.flatnonzero(np.isfinite(values))
+    achieved = np.full(n, np.nan)
+    if len(solved):
+        kwargs = {name: values_[solved] for name, values_ in inputs.items()}
+        kwargs[param] = values[solved]
+        result = cashflow_matrix(**kwargs, solve_irr=False, periods_per_year=periods_per_year)
+        achieved[solved] = getattr(result, TARGETS[metric][0])
+    return GoalSeekResult(
+        variable=variable,
+        metric=metric,
+        target=float(target),
+        current=current,
+        values=values,
+        achieved=achieved,
+        iterations=iteration,
+        seconds=time.perf_counter() - start,
+    )
+
+
+def goal_seek(data, variable, metric, target, **kwargs):
+    # Zielwertsuche für eine Initiative (Schlüssel wie in engine.CASHFLOW_FIELDS)
+    duration = int(data['Projektlaufzeit (Jahre)'])
+    periods_per_year = int(data.get('Perioden pro Jahr') or 1)
+    wacc = data.get('WACC (%)')
+    inputs = {
+        'project_duration': duration,
+        'ramp_up_time': float(data.get('Anlaufzeit (Jahre)') or 0.0),
+        'basisumsatz': float(data.get('Basisumsatz (€)') or 0.0),
+        'cost_savings': float(data.get('Jährliche Kosteneinsparungen (€)') or 0.0),
+        'development_cost': float(data.get('Entwicklungskosten') or 0.0),
+        'risk_budget': float(data.get('Risikobudget') or 0.0),
+        'operating_cost': float(data.get('Laufende Betriebskosten') or 0.0),
+        'wacc': DEFAULT_WACC if wacc is None else float(wacc),
+        'growth_rates': growth_rates(period_times(duration, periods_per_year),
+                                     data.get('Dynamische Wachstumsraten') or ())[None, :],
+        'periods_per_year': periods_per_year,
+    }
+    return solve(inputs, variable, metric, target, **kwargs)
+
+
+# Wie goal_seek, aber je normalisierter Eingabe nur einmal berechnet (Streamlit-Reruns in Schritt 5)
+cached_goal_seek = memoize(GOAL_SEEK_CACHE_SIZE)(goal_seek)
+
+
+def goal_seek_portfolio(inputs, variable, metric, target, **kwargs):
+    # Zielwertsuche für alle Zeilen von inputs (DataFrame wie portfolio.load_inputs());
+    # Ergebnis je Initiative: aktueller Wert, Zielwert, Abstand und erreichte Kennzahl
+    import pandas as pd
+
+    from .portfolio import cashflow_inputs, resolution_groups
+
+    # Je Zeitauflösung eine Suche, Ergebnisse in der Reihenfolge von inputs
+    parts = [
+        (rows, solve(cashflow_inputs(inputs.iloc[rows], m), variable, metric, target, **kwargs))
+        for m, rows in resolution_groups(inputs).items()
+    ]
+    if len(parts) == 1:
+        result = parts[0][1]
+    else:
+        arrays = {name: np.full(len(inputs), np.nan) for name in ('current', 'values', 'achieved')}
+        for rows, part in parts:
+            for name, array in arrays.items():
+                array[rows] = getattr(part, name)
+        result = GoalSeekResult(
+            variable=variable,
+            metric=metric,
+            target=float(target),
+            iterations=max((part.iterations for _, part in parts), default=0),
+            seconds=sum(part.seconds for _, part in parts),
+            **arrays,
+        )
+    return result, pd.DataFrame({
+        'aktuell': result.current,
+        'zielwert': result.values,
+        'abstand': result.headroom(),
+        metric: result.achieved,
+    }, index=inputs.index)
+
+
+def main(argv=None):
+    import pandas as pd
+
+    from . import migrations
+    from .db import DB_PATH, connect
+    from .portfolio import load_inputs
+
+    parser = argparse.ArgumentParser(
+        description='Sucht je Initiative den Wert einer Eingabe, bei dem eine Kennzahl den Zielwert erreicht.')
+    parser.add_argument('--db', default=DB_PATH, help='Pfad zur SQLite-Datenbank')
+    parser.add_argument('--eingabe', required=True, choices=list(VARIABLES), help='Gesuchte Eingabe')
+    parser.add_argument('--kennzahl', required=True, choices=list(TARGETS), help='Zielkennzahl')
+    parser.add_argument('--ziel', required=True, type=float, help='Zielwert der Kennzahl')
+    parser.add_argument('--csv', help='Ergebnisse zusätzlich als CSV-Datei speichern')
+    parser.add_argument('--top', type=int, default=10, help='Anzahl der angezeigten Initiativen')
+    args = parser.parse_args(argv)
+
+    conn = connect(args.db)
+    try:
+        migrations.migrate(conn)
+        inputs = load_inputs(conn)
+    finally:
+        conn.close()
+
+    result, table = goal_seek_portfolio(inputs, args.eingabe, args.kennzahl, args.ziel)
+    table.insert(0, 'projektname', inputs['projektname'])
+    print(f'{len(table)} Initiative(n) in {result.seconds * 1000:.1f} ms gelöst '
+          f'({result.iterations} Iteration(en), {int(np.isnan(result.values).sum())} ohne Lösung).')
+    if args.csv:
+        table.to_csv(args.csv)
+    # Größter fehlender Umsatz bzw. kleinster Kostenspielraum zuerst
+    table = table.sort_values('abstand', ascending=not result.is_minimum)
+    with pd.option_context('display.width', 160, 'display.max_columns', None):
+        print(table.head(args.top).to_string())
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,147 @@
+"""Laufzeitmessung der heißen Pfade (Schritte, Finanzmodell, Speichern, Diagramme, PDF).
+
+Messpunkte werden mit timed() oder dem Dekorator timer() markiert und in
+Histogrammen mit festen, logarithmisch verteilten Klassen gesammelt. Die
+Messung ist standardmäßig aus; dann kostet ein Messpunkt nur die Abfrage
+eines globalen Schalters. Eingeschaltet wird sie mit enable() bzw. in der App
+über die Umgebungsvariable KI_METRICS=1.
+
+    with metrics.timed('db.speichern'):
+        ...
+    metrics.snapshot()  # {Name: {anzahl, summe, mittel, min, max, p50, p95, p99, klassen}}
+"""
+
+import bisect
+import contextlib
+import functools
+import json
+import threading
+import time
+
+# Obergrenzen der Histogrammklassen in Sekunden: 10 µs bis ca. 84 s, je Klasse Faktor 2
+BUCKET_BOUNDS = tuple(1e-5 * 2 ** i for i in range(24))
+
+_NULL = contextlib.nullcontext()
+
+_enabled = False
+_lock = threading.Lock()
+_histograms = {}
+
+
+class Histogram:
+    def __init__(self):
+        self.counts = [0] * (len(BUCKET_BOUNDS) + 1)  # letzte Klasse: über der größten Grenze
+        self.count = 0
+        self.total = 0.0
+        self.minimum = float('inf')
+        self.maximum = 0.0
+
+    def observe(self, seconds):
+        self.counts[bisect.bisect_left(BUCKET_BOUNDS, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+        self.minimum = min(self.minimum, seconds)
+        self.maximum = max(self.maximum, seconds)
+
+    def percentile(self, q):
+        # Obergrenze der Klasse, in der das q-Quantil liegt (höchstens das gemessene Maximum)
+        if not self.count:
+            return None
+        rank = q / 100 * self.count
+        cumulative = 0
+        for bound, count in zip(BUCKET_BOUNDS + (self.maximum,), self.counts):
+            cumulative += count
+            if cumulative >= rank and count:
+                return min(bound, self.maximum)
+        return self.maximum
+
+    def to_dict(self):
+        return {
+            'anzahl': self.count,
+            'summe': self.total,
+            'mittel': self.total / self.count if self.count else None,
+            'min': self.minimum if self.count else None,
+            'max': self.maximum if self.count else None,
+            'p50': self.percentile(50),
+            'p95': self.percentile(95),
+            'p99': self.percentile(99),
+            # Klassen mit mindestens einem Wert: Obergrenze (Sekunden, None = darüber) -> Anzahl
+            'klassen': [
+                [bound, count]
+                for bound, count in zip(BUCKET_BOUNDS + (None,), self.counts) if count
+            ],
+        }
+
+
+def enable():
+    global _enabled
+    _enabled = True
+
+
+def disable():
+    global _enabled
+    _enabled = False
+
+
+def is_enabled():
+    return _enabled
+
+
+def observe(name, seconds):
+    with _lock:
+        histogram = _histograms.get(name)
+        if histogram is None:
+            histogram = _histograms[name] = Histogram()
+        histogram.observe(seconds)
+
+
+@contextlib.contextmanager
+def _timed(name):
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        observe(name, time.perf_counter() - start)
+
+
+def timed(name):
+    # Kontextmanager, der die Dauer des Blocks unter name erfasst (ohne Wirkung, wenn ausgeschaltet)
+    return _timed(name) if _enabled else _NULL
+
+
+def timer(name):
+    # Dekorator: jeden Aufruf der Funktion unter name erfassen
+    def decorator(function):
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return function(*args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                observe(name, time.perf_counter() - start)
+
+        return wrapper
+
+    return decorator
+
+
+def snapshot():
+    # Aktueller Stand aller Histogramme, nach Name sortiert
+    with _lock:
+        return {name: _histograms[name].to_dict() for name in sorted(_histograms)}
+
+
+def reset():
+    with _lock:
+        _histograms.clear()
+
+
+def dump(extra=None):
+    # Maschinenlesbarer Export als JSON (extra z.B. für Cache-Statistiken)
+    return json.dumps({
+        'zeitpunkt': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'messwerte': snapshot(),
+        **(extra or {}),
+    }, indent=2, ensure_ascii=False)
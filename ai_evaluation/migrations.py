@@ -0,0 +1,472 @@
+"""Versionierte Schema-Migrationen für ki_initiativen.db.
+
+Die Schema-Version steht in PRAGMA user_version. Beim Start werden alle
+Migrationen mit höherer Version der Reihe nach angewendet, jede in einer
+eigenen Transaktion zusammen mit dem Hochsetzen der Version. Die Schritte
+sind idempotent, damit auch Datenbanken ohne gesetzte Version (ältere
+Programmversionen) sicher aktualisiert werden können.
+
+Aufruf von der Kommandozeile:
+
+    python -m ai_evaluation.migrations [ki_initiativen.db]
+"""
+
+import json
+import logging
+import sys
+import time
+
+logger = logging.getLogger(__name__)
+
+
+def _columns(conn, table):
+    return {row[1] for row in conn.execute(f'PRAGMA table_info({table})')}
+
+
+def _add_columns(conn, table, columns):
+    # Fügt fehlende Spalten hinzu und gibt deren Namen zurück
+    existing = _columns(conn, table)
+    missing = [(name, sql_type) for name, sql_type in columns if name not in existing]
+    for name, sql_type in missing:
+        conn.execute(f'ALTER TABLE {table} ADD COLUMN {name} {sql_type}')
+    return [name for name, _ in missing]
+
+
+def _create_initiativen(conn):
+    # Ausgangsschema der Programmversionen bis v06
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS initiativen (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            projektname TEXT,
+            projektbeschreibung TEXT,
+            projektverantwortlicher TEXT,
+            strategische_ziele TEXT,
+            kpis TEXT,
+            ausrichtung TEXT,
+            ki_technologie TEXT,
+            zweck TEXT,
+            anwendungsbereich TEXT,
+            art_der_innovation TEXT,
+            kosten TEXT,
+            umsatz_roi TEXT,
+            risiken TEXT,
+            skalierbarkeit_nachhaltigkeit TEXT,
+            erfolgsmessung TEXT,
+            entscheidung TEXT,
+            implementierung TEXT,
+            ueberwachung TEXT,
+            nutzwertanalyse TEXT,
+            gesamtbewertung REAL
+        )
+    ''')
+
+
+# Migrationen sind eingefroren: Sie verwenden nur die hier abgelegten Kopien von Abbildungen und
+# Berechnungen im Stand ihrer Einführung, nicht storage oder cashflow, die sich weiterentwickeln.
+
+# Kriterien der Nutzwertanalyse und Detailtabellen im Stand von Schema-Version 2
+_V2_SCORE_CRITERIA = (
+    'Datenverfügbarkeit',
+    'Technische Fähigkeiten',
+    'Technologiekompatibilität',
+    'Skalierbarkeit',
+    'Nachhaltigkeit',
+)
+_V2_DETAIL_INSERT_SQL = {
+    'cashflow_jahre': 'INSERT INTO cashflow_jahre VALUES (?, ?, ?, ?, ?, ?)',
+    'risikobewertungen': 'INSERT INTO risikobewertungen VALUES (?, ?, ?, ?, ?)',
+    'gewichtungen': 'INSERT INTO gewichtungen VALUES (?, ?, ?)',
+    'bewertungen': 'INSERT INTO bewertungen VALUES (?, ?, ?, ?)',
+}
+
+
+def _v2_loads(text, default):
+    try:
+        value = json.loads(text) if text else default
+    except (TypeError, ValueError):
+        return default
+    return value if isinstance(value, type(default)) else default
+
+
+def _v2_row_values(row):
+    # Kennzahlen-Spalten und Detailzeilen (ohne initiative_id) aus den JSON-Spalten einer Zeile
+    kosten = _v2_loads(row.get('kosten'), {})
+    umsatz_roi = _v2_loads(row.get('umsatz_roi'), {})
+    skalierung = _v2_loads(row.get('skalierbarkeit_nachhaltigkeit'), {})
+    nutzwert = _v2_loads(row.get('nutzwertanalyse'), {})
+    revenue = umsatz_roi.get('umsatz', []) or []
+    costs = umsatz_roi.get('kosten', []) or []
+    profit = umsatz_roi.get('gewinn', []) or []
+    metrics = (
+        kosten.get('anfangsinvestition', 0.0),
+        kosten.get('laufende_betriebskosten', 0.0),
+        sum(costs) if costs else None,
+        sum(profit) if profit else None,
+        umsatz_roi.get('roi'),
+        umsatz_roi.get('payback_period'),
+    )
+
+    def at(values, year):
+        return values[year] if year < len(values) else None
+
+    scores = {'Skalierbarkeit': skalierung.get('skalierbarkeit', 0),
+              'Nachhaltigkeit': skalierung.get('nachhaltigkeit', 0)}
+    weights = nutzwert.get('gewichtungen', {}) or {}
+    weighted_scores = nutzwert.get('gewichtete_bewertungen', {}) or {}
+    criteria = [k for k in _V2_SCORE_CRITERIA if k in scores or k in weighted_scores]
+    criteria += [k for k in weighted_scores if k not in criteria]
+    details = {
+        'cashflow_jahre': [
+            (year, at(revenue, year), None, at(costs, year), at(profit, year))
+            for year in range(max(len(revenue), len(costs), len(profit)))
+        ],
+        'risikobewertungen': [
+            (nr, risk.get('Beschreibung'), risk.get('Wahrscheinlichkeit'), risk.get('Auswirkung'))
+            for nr, risk in enumerate(_v2_loads(row.get('risiken'), []) or [])
+        ],
+        'gewichtungen': list(weights.items()),
+        'bewertungen': [
+            (criterion, scores.get(criterion), weighted_scores.get(criterion))
+            for criterion in criteria
+        ],
+    }
+    return metrics, details
+
+
+def _normalised_schema(conn):
+    # Kennzahlen-Spalten und Detailtabellen; einmalige Befüllung aus den JSON-Spalten
+    added = _add_columns(conn, 'initiativen', (
+        ('anfangsinvestition', 'REAL'),
+        ('laufende_betriebskosten', 'REAL'),
+        ('gesamtkosten', 'REAL'),
+        ('gesamtgewinn', 'REAL'),
+        ('roi', 'REAL'),
+        ('amortisationsdauer', 'REAL'),
+    ))
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS cashflow_jahre (
+            initiative_id INTEGER NOT NULL REFERENCES initiativen(id) ON DELETE CASCADE,
+            jahr INTEGER NOT NULL,
+            umsatz REAL,
+            kosteneinsparungen REAL,
+            kosten REAL,
+            gewinn REAL,
+            PRIMARY KEY (initiative_id, jahr)
+        ) WITHOUT ROWID
+    ''')
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS risikobewertungen (
+            initiative_id INTEGER NOT NULL REFERENCES initiativen(id) ON DELETE CASCADE,
+            nr INTEGER NOT NULL,
+            beschreibung TEXT,
+            wahrscheinlichkeit REAL,
+            auswirkung REAL,
+            PRIMARY KEY (initiative_id, nr)
+        ) WITHOUT ROWID
+    ''')
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS gewichtungen (
+            initiative_id INTEGER NOT NULL REFERENCES initiativen(id) ON DELETE CASCADE,
+            kriterium TEXT NOT NULL,
+            gewichtung REAL,
+            PRIMARY KEY (initiative_id, kriterium)
+        ) WITHOUT ROWID
+    ''')
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS bewertungen (
+            initiative_id INTEGER NOT NULL REFERENCES initiativen(id) ON DELETE CASCADE,
+            kriterium TEXT NOT NULL,
+            bewertung REAL,
+            gewichtete_bewertung REAL,
+            PRIMARY KEY (initiative_id, kriterium)
+        ) WITHOUT ROWID
+    ''')
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_cashflow_jahre_jahr ON cashflow_jahre (jahr)')
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_initiativen_roi ON initiativen (roi)')
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_initiativen_amortisationsdauer ON initiativen (amortisationsdauer)')
+
+    if not added:
+        return
+    cursor = conn.execute('SELECT * FROM initiativen')
+    names = [d[0] for d in cursor.description]
+    for row in cursor.fetchall():
+        row = dict(zip(names, row))
+        metrics, details = _v2_row_values(row)
+        conn.execute(
+            '''UPDATE initiativen SET anfangsinvestition = ?, laufende_betriebskosten = ?, gesamtkosten = ?,
+               gesamtgewinn = ?, roi = ?, amortisationsdauer = ? WHERE id = ?''',
+            metrics + (row['id'],),
+        )
+        for table, sql in _V2_DETAIL_INSERT_SQL.items():
+            conn.execute(f'DELETE FROM {table} WHERE initiative_id = ?', (row['id'],))
+            conn.executemany(sql, [(row['id'],) + detail for detail in details[table]])
+
+
+def _financial_inputs(conn):
+    # Eingaben des Finanzmodells, die bisher nicht gespeichert wurden (u.a. Basisumsatz, Wachstumsraten)
+    _add_columns(conn, 'initiativen', (
+        ('entwicklungskosten', 'REAL'),
+        ('risikobudget', 'REAL'),
+        ('projektlaufzeit', 'INTEGER'),
+        ('anlaufzeit', 'REAL'),
+        ('basisumsatz', 'REAL'),
+        ('kosteneinsparungen', 'REAL'),
+    ))
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS wachstumsperioden (
+            initiative_id INTEGER NOT NULL REFERENCES initiativen(id) ON DELETE CASCADE,
+            nr INTEGER NOT NULL,
+            start_jahr REAL,
+            end_jahr REAL,
+            wachstumsrate REAL,
+            PRIMARY KEY (initiative_id, nr)
+        ) WITHOUT ROWID
+    ''')
+    # Soweit ableitbar aus vorhandenen Daten befüllen
+    conn.execute('''
+        UPDATE initiativen SET
+            entwicklungskosten = COALESCE(entwicklungskosten, CASE WHEN json_valid(kosten)
+                THEN json_extract(kosten, '$.entwicklungskosten') END),
+            risikobudget = COALESCE(risikobudget, CASE WHEN json_valid(kosten)
+                THEN json_extract(kosten, '$.risikobudget') END),
+            projektlaufzeit = COALESCE(projektlaufzeit, (
+                SELECT MAX(jahr) FROM cashflow_jahre c WHERE c.initiative_id = initiativen.id
+            ))
+    ''')
+
+
+def _portfolio_indexes(conn):
+    # Entscheidung als filterbare Spalte und Indizes für Sortierung und Filter der Portfolio-Übersicht
+    if _add_columns(conn, 'initiativen', (('entscheidung_status', 'TEXT'),)):
+        conn.execute('''
+            UPDATE initiativen SET entscheidung_status = NULLIF(CASE WHEN json_valid(entscheidung)
+                THEN json_extract(entscheidung, '$.entscheidung') END, '')
+        ''')
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_initiativen_gesamtbewertung ON initiativen (gesamtbewertung)')
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_initiativen_projektname ON initiativen (projektname COLLATE NOCASE)')
+    # Abdeckender Index: Filter und Kennzahlen der Übersicht lesen nicht die breiten JSON-Zeilen
+    conn.execute('''
+        CREATE INDEX IF NOT EXISTS idx_initiativen_portfolio ON initiativen (
+            entscheidung_status, gesamtbewertung, roi, amortisationsdauer, gesamtkosten, gesamtgewinn,
+            projektname, projektverantwortlicher
+        )
+    ''')
+
+
+# Finanzmodell im Stand von Schema-Version 5 (jährlich, WACC 8 %) für die einmalige Berechnung
+_V5_WACC = 8.0
+_V5_IRR_BOUNDS = (-99.0, 1000.0)
+_V5_IRR_ITERATIONS = 100
+
+
+def _v5_nullable(values):
+    return [None if value != value else float(value) for value in values.tolist()]
+
+
+def _v5_payback(years, cumulative):
+    # Erster Vorzeichenwechsel der kumulierten Werte je Zeile, linear interpoliert (NaN ohne Wechsel)
+    import numpy as np
+
+    if cumulative.shape[1] < 2:
+        return np.full(cumulative.shape[0], np.nan)
+    crossings = (cumulative[:, 1:] >= 0) & (cumulative[:, :-1] < 0)
+    i = crossings.argmax(axis=1) + 1
+    rows = np.arange(len(cumulative))
+    before, after = cumulative[rows, i - 1], cumulative[rows, i]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        payback = years[i - 1] - before * (years[i] - years[i - 1]) / (after - before)
+    return np.where(crossings.any(axis=1), payback, np.nan)
+
+
+def _v5_irr(years, profit):
+    # Interner Zinsfuß (%) je Zeile: Newton-Verfahren mit Bisektionsintervall, Start bei 10 %;
+    # NaN, wenn der Kapitalwert im Suchintervall das Vorzeichen nicht wechselt
+    import numpy as np
+
+    def npv(rates, values):
+        return np.sum(values * (1 + rates[:, None] / 100) ** -years, axis=1)
+
+    n = len(profit)
+    npv_low = npv(np.full(n, _V5_IRR_BOUNDS[0]), profit)
+    found = np.sign(npv_low) * np.sign(npv(np.full(n, _V5_IRR_BOUNDS[1]), profit)) < 0
+    result = np.full(n, np.nan)
+    rows = np.flatnonzero(found)
+    profit, npv_low = profit[rows], npv_low[rows]
+    low, high = np.full(len(rows), _V5_IRR_BOUNDS[0]), np.full(len(rows), _V5_IRR_BOUNDS[1])
+    rate = np.full(len(rows), 10.0)
+    for _ in range(_V5_IRR_ITERATIONS):
+        factors = (1 + rate[:, None] / 100) ** -years
+        value = np.sum(profit * factors, axis=1)
+        slope = np.sum(-years * profit * factors, axis=1) / (100 + rate)
+        same_sign = np.sign(value) == np.sign(npv_low)
+        low, npv_low = np.where(same_sign, rate, low), np.where(same_sign, value, npv_low)
+        high = np.where(same_sign, high, rate)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            step = rate - value / slope
+        new_rate = np.where((step >= low) & (step <= high), step, (low + high) / 2)
+        done = (np.abs(new_rate - rate) <= 1e-7) | (high - low <= 1e-7)
+        result[rows[done]] = new_rate[done]
+        active = ~done
+        rows, profit, npv_low = rows[active], profit[active], npv_low[active]
+        low, high, rate = low[active], high[active], new_rate[active]
+        if not len(rows):
+            break
+    result[rows] = rate
+    return result
+
+
+def _v5_discounted_metrics(conn):
+    # Kapitalwert, interner Zinsfuß und diskontierte Amortisationsdauer aller nachrechenbaren
+    # Initiativen; gibt (IDs, Kapitalwert, Zinsfuß, diskontierte Amortisationsdauer) zurück
+    import numpy as np
+
+    rows = conn.execute('''
+        SELECT id, projektlaufzeit, anlaufzeit, basisumsatz, kosteneinsparungen, entwicklungskosten,
+               risikobudget, laufende_betriebskosten
+        FROM initiativen
+        WHERE projektlaufzeit IS NOT NULL AND basisumsatz IS NOT NULL
+        ORDER BY id
+    ''').fetchall()
+    ids = [row[0] for row in rows]
+    inputs = np.array([[np.nan if v is None else v for v in row[1:]] for row in rows], dtype=float)
+    inputs = np.nan_to_num(inputs)
+    duration, ramp_up, base, savings, development, risk, operating = (c[:, None] for c in inputs.T)
+    duration = duration.astype(int)
+    years = np.arange(int(duration.max(initial=0)) + 1)
+
+    # Wachstumsrate je Jahr: erster passender Zeitraum (rückwärts überschreiben)
+    position = {initiative_id: i for i, initiative_id in enumerate(ids)}
+    periods = {}
+    for initiative_id, start, end, rate in conn.execute(
+        'SELECT initiative_id, start_jahr, end_jahr, wachstumsrate FROM wachstumsperioden ORDER BY initiative_id, nr'
+    ):
+        if initiative_id in position:
+            periods.setdefault(initiative_id, []).append((start, end, rate))
+    growth = np.zeros((len(ids), len(years)))
+    for initiative_id, items in periods.items():
+        row = growth[position[initiative_id]]
+        for start, end, rate in reversed(items):
+            if None not in (start, end):
+                row[(start <= years) & (years <= end)] = np.nan if rate is None else rate
+
+    # Umsatz ab dem ersten aktiven Jahr mit Zinseszins, Kosten und Einsparungen nach der Anlaufzeit
+    active = (years > ramp_up) & (years <= duration)
+    active[:, 0] = False
+    first_active = np.where(active.any(axis=1), active.argmax(axis=1), len(years))
+    factors = 1 + growth / 100
+    factors[years <= first_active[:, None]] = 1.0
+    revenue = np.where(active, base * np.cumprod(factors, axis=1), 0.0)
+    costs = np.where(active, operating, 0.0)
+    costs[:, 0] = (development + risk)[:, 0]
+    profit = revenue + np.where(active, savings, 0.0) - costs
+
+    discounted = profit * (1 + _V5_WACC / 100) ** -years.astype(float)
+    return (
+        ids,
+        discounted.sum(axis=1),
+        _v5_irr(years.astype(float), profit),
+        _v5_payback(years, np.cumsum(discounted, axis=1)),
+    )
+
+
+def _discounted_metrics(conn):
+    # Kapitalkosten und diskontierte Kennzahlen; einmalige Berechnung für alle nachrechenbaren Initiativen
+    added = _add_columns(conn, 'initiativen', (
+        ('wacc', 'REAL'),
+        ('kapitalwert', 'REAL'),
+        ('interner_zinsfuss', 'REAL'),
+        ('diskontierte_amortisationsdauer', 'REAL'),
+    ))
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_initiativen_kapitalwert ON initiativen (kapitalwert)')
+    # Abdeckender Index der Übersicht um den Kapitalwert erweitert
+    conn.execute('DROP INDEX IF EXISTS idx_initiativen_portfolio')
+    conn.execute('''
+        CREATE INDEX idx_initiativen_portfolio ON initiativen (
+            entscheidung_status, gesamtbewertung, roi, amortisationsdauer, gesamtkosten, gesamtgewinn,
+            kapitalwert, projektname, projektverantwortlicher
+        )
+    ''')
+    if not added or conn.execute(
+        'SELECT NOT EXISTS (SELECT 1 FROM initiativen WHERE projektlaufzeit IS NOT NULL AND basisumsatz IS NOT NULL)'
+    ).fetchone()[0]:
+        return
+    ids, kapitalwert, zinsfuss, diskontierte_amortisation = _v5_discounted_metrics(conn)
+    conn.executemany(
+        '''UPDATE initiativen SET kapitalwert = ?, interner_zinsfuss = ?, diskontierte_amortisationsdauer = ?
+           WHERE id = ?''',
+        zip(_v5_nullable(kapitalwert), _v5_nullable(zinsfuss), _v5_nullable(diskontierte_amortisation), ids),
+    )
+
+
+def _sub_annual_resolution(conn):
+    # Zeitauflösung des Finanzmodells; bestehende Initiativen bleiben jährlich (NULL)
+    _add_columns(conn, 'initiativen', (('perioden_pro_jahr', 'INTEGER'),))
+
+
+# (Version, Beschreibung, Funktion) in aufsteigender Reihenfolge; nie umnummerieren
+MIGRATIONS = (
+    (1, 'Tabelle initiativen', _create_initiativen),
+    (2, 'Normalisiertes Schema (Kennzahlen, Cashflow-Jahre, Risiken, Gewichtungen, Bewertungen)', _normalised_schema),
+    (3, 'Eingaben des Finanzmodells und Wachstumsperioden', _financial_inputs),
+    (4, 'Entscheidungsstatus und Indizes für die Portfolio-Übersicht', _portfolio_indexes),
+    (5, 'Kapitalkosten, Kapitalwert, interner Zinsfuß und diskontierte Amortisationsdauer', _discounted_metrics),
+    (6, 'Zeitauflösung des Finanzmodells (Perioden pro Jahr)', _sub_annual_resolution),
+)
+
+SCHEMA_VERSION = MIGRATIONS[-1][0]
+
+
+def schema_version(conn):
+    return conn.execute('PRAGMA user_version').fetchone()[0]
+
+
+def migrate(conn, migrations=MIGRATIONS):
+    # Wendet alle ausstehenden Migrationen an. Gibt [(Version, Beschreibung, Sekunden)] zurück.
+    applied = []
+    isolation_level = conn.isolation_level
+    conn.isolation_level = None  # Transaktionen werden hier explizit gesteuert (inklusive DDL)
+    try:
+        for version, description, upgrade in migrations:
+            if version <= schema_version(conn):
+                continue
+            start = time.perf_counter()
+            # IMMEDIATE sperrt sofort für Schreiber; die Version wird danach erneut geprüft,
+            # falls ein anderer Prozess dieselbe Migration gerade abgeschlossen hat
+            conn.execute('BEGIN IMMEDIATE')
+            try:
+                if version <= schema_version(conn):
+                    conn.execute('ROLLBACK')
+                    continue
+                upgrade(conn)
+                conn.execute(f'PRAGMA user_version = {int(version)}')
+                conn.execute('COMMIT')
+            except BaseException:
+                conn.execute('ROLLBACK')
+                raise
+            seconds = time.perf_counter() - start
+            logger.info('Migration %d (%s) in %.3f s angewendet', version, description, seconds)
+            applied.append((version, description, seconds))
+    finally:
+        conn.isolation_level = isolation_level
+    return applied
+
+
+def main(argv=None):
+    from .db import DB_PATH, connect
+
+    argv = sys.argv[1:] if argv is None else argv
+    conn = connect(argv[0] if argv else DB_PATH)
+    try:
+        before = schema_version(conn)
+        applied = migrate(conn)
+    finally:
+        conn.close()
+    if not applied:
+        print(f'Schema ist aktuell (Version {before}).')
+    for version, description, seconds in applied:
+        print(f'Version {version}: {description} ({seconds * 1000:.1f} ms)')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,120 @@
+"""Abfragen der Portfolio-Übersicht über alle Initiativen.
+
+Filter, Sortierung, seitenweise Ausgabe und Kennzahlen werden vollständig in
+SQLite berechnet; es wird immer nur eine Seite der Tabelle initiativen geladen.
+"""
+
+from dataclasses import dataclass
+from typing import Optional
+
+# Sortierbare Spalten: Anzeigename -> Spalte in initiativen
+SORT_COLUMNS = {
+    'Gesamtbewertung': 'gesamtbewertung',
+    'ROI (%)': 'roi',
+    'Amortisationsdauer (Jahre)': 'amortisationsdauer',
+    'Kapitalwert (€)': 'kapitalwert',
+    'Projektname': 'projektname COLLATE NOCASE',
+    'ID': 'id',
+}
+
+# Entscheidungen aus Schritt 10; DECISION_OPEN steht für Initiativen ohne Entscheidung
+DECISIONS = ('Projekt durchführen', 'Projekt verschieben', 'Projekt ablehnen')
+DECISION_OPEN = 'Offen'
+
+# Angezeigte Spalten: Anzeigename -> Spalte in initiativen
+LIST_COLUMNS = {
+    'ID': 'id',
+    'Projektname': 'projektname',
+    'Projektverantwortlicher': 'projektverantwortlicher',
+    'ROI (%)': 'roi',
+    'Amortisationsdauer (Jahre)': 'amortisationsdauer',
+    'Kapitalwert (€)': 'kapitalwert',
+    'Gesamtbewertung': 'gesamtbewertung',
+    'Entscheidung': 'entscheidung_status',
+}
+
+
+@dataclass(frozen=True)
+class OverviewFilter:
+    search: str = ''  # Teil von Projektname oder Projektverantwortlichem
+    decisions: tuple = ()  # leer = alle Entscheidungen
+    min_roi: Optional[float] = None
+    max_payback: Optional[float] = None
+    min_score: Optional[float] = None
+
+
+def where_clause(overview_filter):
+    # WHERE-Bedingung und Parameter für den Filter
+    conditions, params = [], []
+    if overview_filter.search:
+        conditions.append("(projektname LIKE ? ESCAPE '\\' OR projektverantwortlicher LIKE ? ESCAPE '\\')")
+        pattern = '%' + overview_filter.search.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_') + '%'
+        params += [pattern, pattern]
+    if overview_filter.decisions:
+        decided = [d for d in overview_filter.decisions if d != DECISION_OPEN]
+        options = []
+        if decided:
+            options.append(f"entscheidung_status IN ({', '.join('?' * len(decided))})")
+            params += decided
+        if DECISION_OPEN in overview_filter.decisions:
+            options.append('entscheidung_status IS NULL')
+        conditions.append(f"({' OR '.join(options)})")
+    for column, operator, value in (
+        ('roi', '>=', overview_filter.min_roi),
+        ('amortisationsdauer', '<=', overview_filter.max_payback),
+        ('gesamtbewertung', '>=', overview_filter.min_score),
+    ):
+        if value is not None:
+            conditions.append(f'{column} {operator} ?')
+            params.append(value)
+    return (' WHERE ' + ' AND '.join(conditions) if conditions else ''), params
+
+
+def summary(conn, overview_filter=OverviewFilter()):
+    # Kennzahlen über alle gefilterten Initiativen und Anzahl je Entscheidung (ein Durchlauf,
+    # der sich allein aus dem Index idx_initiativen_portfolio beantworten lässt)
+    where, params = where_clause(overview_filter)
+    totals = dict.fromkeys(('anzahl', 'roi', 'n_roi', 'amortisationsdauer', 'n_amortisationsdauer',
+                            'gesamtbewertung', 'n_gesamtbewertung', 'gesamtkosten', 'gesamtgewinn',
+                            'kapitalwert'), 0)
+    decisions = {}
+    for status, *values in conn.execute(
+        f'''SELECT entscheidung_status, COUNT(*), TOTAL(roi), COUNT(roi), TOTAL(amortisationsdauer),
+                   COUNT(amortisationsdauer), TOTAL(gesamtbewertung), COUNT(gesamtbewertung),
+                   TOTAL(gesamtkosten), TOTAL(gesamtgewinn), TOTAL(kapitalwert)
+            FROM initiativen{where} GROUP BY entscheidung_status''',
+        params,
+    ):
+        decisions[status or DECISION_OPEN] = values[0]
+        for key, value in zip(totals, values):
+            totals[key] += value
+
+    def mean(key):
+        return totals[key] / totals[f'n_{key}'] if totals[f'n_{key}'] else None
+
+    return {
+        'anzahl': totals['anzahl'],
+        'roi_mittel': mean('roi'),
+        'amortisationsdauer_mittel': mean('amortisationsdauer'),
+        'gesamtbewertung_mittel': mean('gesamtbewertung'),
+        'gesamtkosten': totals['gesamtkosten'],
+        'gesamtgewinn': totals['gesamtgewinn'],
+        'kapitalwert': totals['kapitalwert'],
+        'entscheidungen': decisions,
+    }
+
+
+def fetch_page(conn, overview_filter=OverviewFilter(), sort='Gesamtbewertung', descending=True,
+               page=0, page_size=50):
+    # Eine Seite der gefilterten Initiativen als Liste von Dicts (Schlüssel wie LIST_COLUMNS).
+    # Initiativen ohne Wert in der Sortierspalte stehen immer am Ende.
+    where, params = where_clause(overview_filter)
+    column = SORT_COLUMNS[sort]
+    direction = 'DESC' if descending else 'ASC'
+    cursor = conn.execute(
+        f'''SELECT {', '.join(LIST_COLUMNS.values())} FROM initiativen{where}
+            ORDER BY {column} {direction} NULLS LAST, id {direction}
+            LIMIT ? OFFSET ?''',
+        params + [int(page_size), int(page) * int(page_size)],
+    )
+    return [dict(zip(LIST_COLUMNS, row)) for row in cursor]
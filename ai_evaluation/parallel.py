@@ -0,0 +1,198 @@
+"""Monte-Carlo-Simulation auf mehreren Prozessorkernen.
+
+Die Szenarien werden in Blöcke fester Größe (Shards) aufgeteilt und über einen
+Prozess-Pool verteilt. Jeder Shard hat einen eigenen Zufallsstrom, abgeleitet
+aus Seed, Initiative und Blocknummer; die Ergebnisse sind daher unabhängig
+von der Anzahl der Worker identisch (und für eine einzelne Initiative gleich
+denen von simulation.simulate mit demselben Seed). Die Worker schreiben ROI und
+Amortisationsdauer direkt in Shared-Memory-Puffer, große Arrays werden nicht
+zwischen den Prozessen kopiert.
+
+Aufruf von der Kommandozeile (alle Initiativen in ki_initiativen.db):
+
+    python -m ai_evaluation.parallel [--db ki_initiativen.db] [--szenarien 100000] [--workers 8] [--seed 42]
+"""
+
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from .simulation import (
+    CHUNK_SIZE, PERCENTILES, SimulationInputs, chunk_sizes, normal, relative_normal, shard_seed, simulate_chunk,
+)
+
+
+@dataclass(frozen=True)
+class ThroughputReport:
+    n_scenarios: int
+    workers: int
+    seconds: float  # Gesamtlaufzeit inklusive Verteilung der Aufgaben
+    per_worker: dict  # Prozess-ID -> (Szenarien, Rechenzeit in Sekunden)
+
+    @property
+    def scenarios_per_second(self):
+        return self.n_scenarios / self.seconds if self.seconds else float('inf')
+
+    @property
+    def scenarios_per_second_per_core(self):
+        rates = [n / s for n, s in self.per_worker.values() if s > 0]
+        return float(np.mean(rates)) if rates else float('nan')
+
+    def format(self):
+        lines = [
+            f'{self.n_scenarios:,} Szenarien in {self.seconds:.2f} s mit {self.workers} Worker(n): '
+            f'{self.scenarios_per_second:,.0f} Szenarien/s gesamt, '
+            f'{self.scenarios_per_second_per_core:,.0f} Szenarien/s je Kern'
+        ]
+        for pid, (n, seconds) in sorted(self.per_worker.items()):
+            lines.append(f'  Prozess {pid}: {n:,} Szenarien in {seconds:.2f} s ({n / seconds if seconds else 0:,.0f}/s)')
+        return '\n'.join(lines)
+
+
+@dataclass(frozen=True)
+class ParallelResult:
+    roi: np.ndarray  # Initiativen x Szenarien
+    payback_period: np.ndarray  # Initiativen x Szenarien
+    report: ThroughputReport
+
+    def summary(self, percentiles=PERCENTILES):
+        # Perzentile des ROI und Break-Even-Wahrscheinlichkeit je Initiative
+        import pandas as pd
+
+        summary = pd.DataFrame(
+            np.nanpercentile(self.roi, percentiles, axis=1).T,
+            columns=[f'roi_p{p}' for p in percentiles],
+        )
+        summary['break_even_wahrscheinlichkeit'] = np.mean(~np.isnan(self.payback_period), axis=1)
+        return summary
+
+
+def _run_shard(task):
+    # Läuft im Worker-Prozess: simuliert einen Shard und schreibt in die gemeinsamen Puffer
+    name, shape, row, offset, size, inputs, seed_sequence = task
+    start = time.perf_counter()
+    roi, payback = simulate_chunk(inputs, size, np.random.default_rng(seed_sequence))
+    buffer = shared_memory.SharedMemory(name=name)
+    try:
+        results = np.ndarray((2,) + shape, dtype=np.float64, buffer=buffer.buf)
+        results[0, row, offset:offset + size] = roi
+        results[1, row, offset:offset + size] = payback
+        del results
+    finally:
+        buffer.close()
+    return os.getpid(), size, time.perf_counter() - start
+
+
+def simulate_many(inputs_list, n_scenarios, seed=None, workers=None, chunk_size=CHUNK_SIZE):
+    # Simuliert n_scenarios Szenarien für jede Initiative in inputs_list (SimulationInputs)
+    workers = workers or os.cpu_count() or 1
+    shape = (len(inputs_list), int(n_scenarios))
+    sizes = chunk_sizes(n_scenarios, chunk_size)
+    entropy = np.random.SeedSequence(seed).entropy
+
+    buffer = shared_memory.SharedMemory(create=True, size=max(1, 2 * shape[0] * shape[1] * 8))
+    try:
+        tasks = []
+        for row, inputs in enumerate(inputs_list):
+            offset = 0
+            for chunk, size in enumerate(sizes):
+                seed_sequence = shard_seed(entropy, row, chunk)
+                tasks.append((buffer.name, shape, row, offset, size, inputs, seed_sequence))
+                offset += size
+
+        start = time.perf_counter()
+        per_worker = {}
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            batch = max(1, len(tasks) // (workers * 4))
+            for pid, size, seconds in executor.map(_run_shard, tasks, chunksize=batch):
+                n, busy = per_worker.get(pid, (0, 0.0))
+                per_worker[pid] = (n + size, busy + seconds)
+        seconds = time.perf_counter() - start
+
+        results = np.ndarray((2,) + shape, dtype=np.float64, buffer=buffer.buf)
+        roi, payback = results[0].copy(), results[1].copy()
+        del results
+    finally:
+        buffer.close()
+        buffer.unlink()
+
+    report = ThroughputReport(shape[0] * shape[1], workers, seconds, per_worker)
+    return ParallelResult(roi=roi, payback_period=payback, report=report)
+
+
+def portfolio_simulation_inputs(inputs, uncertainty=20.0, growth_uncertainty=2.0):
+    # SimulationInputs je Zeile aus portfolio.load_inputs() mit relativer Unsicherheit (%)
+    # für Basisumsatz, Betriebskosten und Kosteneinsparungen
+    def value(row, column):
+        # Fehlende Angaben (NaN, bei ganz leeren Spalten None) als 0
+        return 0.0 if row.get(column) is None or np.isnan(row[column]) else float(row[column])
+
+    result = []
+    for _, row in inputs.iterrows():
+        result.append(SimulationInputs(
+            project_duration=int(row['projektlaufzeit']),
+            ramp_up_time=value(row, 'anlaufzeit'),
+            growth_periods=tuple(
+                {
+                    'start_year': start,
+                    'end_year': end,
+                    'growth_rate': normal(rate, growth_uncertainty) if growth_uncertainty else rate,
+                }
+                for start, end, rate in row['wachstumsperioden']
+            ),
+            basisumsatz=relative_normal(value(row, 'basisumsatz'), uncertainty),
+            cost_savings=relative_normal(value(row, 'kosteneinsparungen'), uncertainty),
+            operating_cost=relative_normal(value(row, 'laufende_betriebskosten'), uncertainty),
+            development_cost=value(row, 'entwicklungskosten'),
+            risk_budget=value(row, 'risikobudget'),
+            periods_per_year=int(value(row, 'perioden_pro_jahr') or 1),
+        ))
+    return result
+
+
+def main(argv=None):
+    from . import migrations
+    from .db import DB_PATH, connect
+    from .portfolio import load_inputs
+
+    parser = argparse.ArgumentParser(description='Monte-Carlo-Simulation aller Initiativen auf mehreren Kernen.')
+    parser.add_argument('--db', default=DB_PATH, help='Pfad zur SQLite-Datenbank')
+    parser.add_argument('--szenarien', type=int, default=100_000, help='Szenarien je Initiative')
+    parser.add_argument('--workers', type=int, default=None, help='Anzahl der Prozesse (Standard: alle Kerne)')
+    parser.add_argument('--seed', type=int, default=None, help='Seed für reproduzierbare Ergebnisse')
+    parser.add_argument('--unsicherheit', type=float, default=20.0,
+                        help='Standardabweichung von Basisumsatz, Kosten und Einsparungen in %%')
+    args = parser.parse_args(argv)
+
+    conn = connect(args.db)
+    try:
+        migrations.migrate(conn)
+        inputs = load_inputs(conn)
+    finally:
+        conn.close()
+    if inputs.empty:
+        print('Keine Initiativen mit vollständigem Finanzmodell gefunden.')
+        return 0
+
+    result = simulate_many(
+        portfolio_simulation_inputs(inputs, args.unsicherheit),
+        args.szenarien,
+        seed=args.seed,
+        workers=args.workers,
+    )
+    summary = result.summary()
+    summary.index = inputs.index
+    summary.insert(0, 'projektname', inputs['projektname'])
+    print(summary.to_string())
+    print(result.report.format())
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
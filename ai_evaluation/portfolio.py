@@ -0,0 +1,269 @@
+"""Stapelbewertung des gesamten Portfolios in einem vektorisierten Durchlauf.
+
+Finanzmodell (Schritt 5) und Nutzwertanalyse (Schritt 13) werden für alle
+Initiativen gleichzeitig berechnet. Eingabe ist ein DataFrame mit einer Zeile
+je Initiative, z.B. aus load_inputs().
+
+Aufruf von der Kommandozeile (bewertet alle Initiativen in ki_initiativen.db):
+
+    python -m ai_evaluation.portfolio [--db ki_initiativen.db] [--speichern] [--csv datei.csv]
+"""
+
+import argparse
+import sys
+import time
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from .cashflow import DEFAULT_WACC, CashflowMatrix, cashflow_matrix, combine_matrices, growth_rate_matrix
+from .engine import DEFAULT_WEIGHT
+from .storage import SCORE_CRITERIA
+
+# Eingabespalten des Finanzmodells (Namen wie in der Tabelle initiativen)
+INPUT_COLUMNS = (
+    'projektlaufzeit',
+    'anlaufzeit',
+    'basisumsatz',
+    'kosteneinsparungen',
+    'entwicklungskosten',
+    'risikobudget',
+    'laufende_betriebskosten',
+    'wacc',
+    'perioden_pro_jahr',
+)
+
+
+def weight_column(criterion):
+    return f'Gewichtung {criterion}'
+
+
+def utility_scores(scores, weights):
+    # Gesamtbewertung je Initiative: Summe der Bewertungen gewichtet mit den Gewichtungen (%)
+    return np.sum(np.asarray(scores, dtype=float) * np.asarray(weights, dtype=float) / 100, axis=1)
+
+
+@dataclass(frozen=True)
+class PortfolioEvaluation:
+    ids: pd.Index
+    cashflow: CashflowMatrix
+    utility: np.ndarray  # Gesamtbewertung je Initiative
+
+    def summary(self):
+        # Kennzahlen je Initiative (Spaltennamen wie in der Tabelle initiativen)
+        return pd.DataFrame({
+            'gesamtumsatz': self.cashflow.total_revenue,
+            'gesamtkosten': self.cashflow.total_costs,
+            'gesamtgewinn': self.cashflow.total_profit,
+            'roi': self.cashflow.roi,
+            'amortisationsdauer': self.cashflow.payback_period,
+            'kapitalwert': self.cashflow.npv,
+            'interner_zinsfuss': self.cashflow.irr,
+            'diskontierte_amortisationsdauer': self.cashflow.discounted_payback,
+            'gesamtbewertung': self.utility,
+        }, index=self.ids)
+
+
+def _growth_period_arrays(periods):
+    # Liste von [(start, ende, rate), ...] je Initiative -> Matrizen Initiativen x Zeiträume (NaN-gefüllt)
+    width = max((len(p) for p in periods), default=0)
+    arrays = np.full((3, len(periods), max(width, 1)), np.nan)
+    for row, initiative_periods in enumerate(periods):
+        for col, period in enumerate(initiative_periods):
+            arrays[:, row, col] = period
+    return arrays
+
+
+def _values(inputs, column, default=0.0):
+    if column not in inputs:
+        return np.full(len(inputs), default)
+    return inputs[column].astype(float).fillna(default).to_numpy()
+
+
+def resolution_groups(inputs):
+    # Zeilenpositionen je Zeitauflösung (Perioden pro Jahr, ohne Angabe jährlich)
+    resolution = _values(inputs, 'perioden_pro_jahr', 1).astype(int)
+    return {int(m): np.flatnonzero(resolution == m) for m in np.unique(resolution)}
+
+
+def cashflow_inputs(inputs, periods_per_year=1, n_years=None):
+    # Parameter von cashflow_matrix für alle Zeilen von inputs (Spalten INPUT_COLUMNS, optional
+    # 'wachstumsperioden' als Liste von (start, ende, rate)) in der Zeitauflösung periods_per_year;
+    # n_years (Standard: längste Laufzeit + 1) legt die Anzahl der Ergebnisjahre fest
+    duration = _values(inputs, 'projektlaufzeit').astype(int)
+    if n_years is None:
+        n_years = int(duration.max(initial=0)) + 1
+    if 'wachstumsperioden' in inputs:
+        starts, ends, rates = _growth_period_arrays(list(inputs['wachstumsperioden']))
+        rate_matrix = growth_rate_matrix(starts, ends, rates, n_years, periods_per_year)
+    else:
+        rate_matrix = np.zeros((len(inputs), (n_years - 1) * periods_per_year + 1))
+    return {
+        'project_duration': duration,
+        'ramp_up_time': _values(inputs, 'anlaufzeit'),
+        'basisumsatz': _values(inputs, 'basisumsatz'),
+        'cost_savings': _values(inputs, 'kosteneinsparungen'),
+        'development_cost': _values(inputs, 'entwicklungskosten'),
+        'risk_budget': _values(inputs, 'risikobudget'),
+        'operating_cost': _values(inputs, 'laufende_betriebskosten'),
+        'growth_rates': rate_matrix,
+        'wacc': _values(inputs, 'wacc', DEFAULT_WACC),
+        'periods_per_year': periods_per_year,
+    }
+
+
+def evaluate_portfolio(inputs):
+    # Bewertet alle Zeilen von inputs. Erwartet die Spalten INPUT_COLUMNS; optional
+    # 'wachstumsperioden' (Liste von (start, ende, rate)), die Kriterien aus SCORE_CRITERIA,
+    # deren Gewichtungen (weight_column) und 'gesamtbewertung' als Ersatz ohne Einzelbewertungen.
+    def values(column, default=0.0):
+        return _values(inputs, column, default)
+
+    # Je Zeitauflösung ein Durchlauf, alle mit denselben Ergebnisjahren
+    groups = resolution_groups(inputs)
+    if len(groups) <= 1:
+        cashflow = cashflow_matrix(**cashflow_inputs(inputs, next(iter(groups), 1)))
+    else:
+        n_years = int(values('projektlaufzeit').max()) + 1
+        cashflow = combine_matrices(len(inputs), [
+            (rows, cashflow_matrix(**cashflow_inputs(inputs.iloc[rows], m, n_years)))
+            for m, rows in groups.items()
+        ])
+
+    scores = np.column_stack([values(c, np.nan) for c in SCORE_CRITERIA])
+    weights = np.column_stack([values(weight_column(c), DEFAULT_WEIGHT) for c in SCORE_CRITERIA])
+    utility = utility_scores(np.nan_to_num(scores), weights)
+    # Ohne gespeicherte Einzelbewertungen bleibt die vorhandene Gesamtbewertung bestehen
+    utility = np.where(np.isnan(scores).all(axis=1), values('gesamtbewertung', np.nan), utility)
+    return PortfolioEvaluation(ids=inputs.index, cashflow=cashflow, utility=utility)
+
+
+def load_inputs(conn):
+    # Eingaben aller Initiativen mit vollständigem Finanzmodell als DataFrame (Index: ID).
+    # Ältere Zeilen ohne gespeicherten Basisumsatz lassen sich nicht nachrechnen und fehlen.
+    inputs = pd.read_sql_query(
+        f'''
+        SELECT id, projektname, {', '.join(INPUT_COLUMNS)}, gesamtbewertung,
+               CASE WHEN json_valid(entscheidung) THEN json_extract(entscheidung, '$.entscheidung') END
+                   AS entscheidung
+        FROM initiativen
+        WHERE projektlaufzeit IS NOT NULL AND basisumsatz IS NOT NULL
+        ORDER BY id
+        ''',
+        conn,
+        index_col='id',
+    )
+
+    periods = {}
+    for initiative_id, start, end, rate in conn.execute(
+        'SELECT initiative_id, start_jahr, end_jahr, wachstumsrate FROM wachstumsperioden ORDER BY initiative_id, nr'
+    ):
+        periods.setdefault(initiative_id, []).append((start, end, rate))
+    inputs['wachstumsperioden'] = [periods.get(i, []) for i in inputs.index]
+
+    scores = pd.read_sql_query(
+        'SELECT initiative_id, kriterium, bewertung FROM bewertungen', conn
+    ).pivot(index='initiative_id', columns='kriterium', values='bewertung')
+    weights = pd.read_sql_query(
+        'SELECT initiative_id, kriterium, gewichtung FROM gewichtungen', conn
+    ).pivot(index='initiative_id', columns='kriterium', values='gewichtung')
+    for criterion in SCORE_CRITERIA:
+        inputs[criterion] = scores[criterion].reindex(inputs.index) if criterion in scores else np.nan
+        inputs[weight_column(criterion)] = (
+            weights[criterion].reindex(inputs.index) if criterion in weights else np.nan
+        )
+    return inputs
+
+
+def _nullable(values):
+    return [None if np.isnan(v) else float(v) for v in values]
+
+
+def store_discounted_metrics(conn, evaluation):
+    # Schreibt Kapitalwert, internen Zinsfuß und diskontierte Amortisationsdauer (in der laufenden Transaktion)
+    cashflow = evaluation.cashflow
+    conn.executemany(
+        '''UPDATE initiativen SET kapitalwert = ?, interner_zinsfuss = ?, diskontierte_amortisationsdauer = ?
+           WHERE id = ?''',
+        zip(
+            _nullable(cashflow.npv),
+            _nullable(cashflow.irr),
+            _nullable(cashflow.discounted_payback),
+            [int(i) for i in evaluation.ids],
+        ),
+    )
+
+
+def store_results(conn, evaluation, project_duration):
+    # Schreibt Kennzahlen und Cashflow-Jahre der Bewertung zurück in die Datenbank
+    cashflow = evaluation.cashflow
+    ids = [int(i) for i in evaluation.ids]
+    with conn:
+        store_discounted_metrics(conn, evaluation)
+        conn.executemany(
+            '''UPDATE initiativen SET gesamtkosten = ?, gesamtgewinn = ?, roi = ?, amortisationsdauer = ?,
+               gesamtbewertung = ? WHERE id = ?''',
+            zip(
+                _nullable(cashflow.total_costs),
+                _nullable(cashflow.total_profit),
+                _nullable(cashflow.roi),
+                _nullable(cashflow.payback_period),
+                _nullable(evaluation.utility),
+                ids,
+            ),
+        )
+        conn.executemany('DELETE FROM cashflow_jahre WHERE initiative_id = ?', [(i,) for i in ids])
+        rows, years = np.nonzero(cashflow.years <= np.asarray(project_duration)[:, None])
+        conn.executemany(
+            'INSERT INTO cashflow_jahre VALUES (?, ?, ?, ?, ?, ?)',
+            zip(
+                (ids[r] for r in rows),
+                years.tolist(),
+                cashflow.revenue[rows, years].tolist(),
+                cashflow.cost_savings[rows, years].tolist(),
+                cashflow.costs[rows, years].tolist(),
+                cashflow.profit[rows, years].tolist(),
+            ),
+        )
+
+
+def main(argv=None):
+    from . import migrations
+    from .db import DB_PATH, connect
+
+    parser = argparse.ArgumentParser(description='Bewertet alle Initiativen in der Datenbank neu.')
+    parser.add_argument('--db', default=DB_PATH, help='Pfad zur SQLite-Datenbank')
+    parser.add_argument('--speichern', action='store_true', help='Ergebnisse in die Datenbank zurückschreiben')
+    parser.add_argument('--csv', help='Ergebnisse zusätzlich als CSV-Datei speichern')
+    parser.add_argument('--top', type=int, default=10, help='Anzahl der angezeigten Initiativen')
+    parser.add_argument('--sortieren', default='kapitalwert',
+                        choices=['kapitalwert', 'roi', 'interner_zinsfuss', 'gesamtbewertung'],
+                        help='Rangfolge der angezeigten Initiativen (Standard: Kapitalwert)')
+    args = parser.parse_args(argv)
+
+    conn = connect(args.db)
+    try:
+        migrations.migrate(conn)
+        inputs = load_inputs(conn)
+        start = time.perf_counter()
+        evaluation = evaluate_portfolio(inputs)
+        seconds = time.perf_counter() - start
+        if args.speichern:
+            store_results(conn, evaluation, inputs['projektlaufzeit'].to_numpy())
+    finally:
+        conn.close()
+
+    summary = evaluation.summary()
+    summary.insert(0, 'projektname', inputs['projektname'])
+    summary['entscheidung'] = inputs['entscheidung']
+    print(f'{len(summary)} Initiative(n) in {seconds * 1000:.1f} ms bewertet.')
+    if args.csv:
+        summary.to_csv(args.csv)
+    with pd.option_context('display.width', 160, 'display.max_columns', None):
+        print(summary.sort_values(args.sortieren, ascending=False).head(args.top).to_string())
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
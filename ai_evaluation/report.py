@@ -0,0 +1,117 @@
+"""PDF-Bewertungsbericht einer Initiative.
+
+Der Bericht wird von reportlab direkt in eine Datei bzw. ein dateiähnliches
+Objekt geschrieben; im Speicher liegt er dabei höchstens einmal vor.
+"""
+
+import functools
+import os
+import re
+import tempfile
+
+import numpy as np
+from reportlab.lib import colors
+from reportlab.lib.styles import getSampleStyleSheet
+from reportlab.platypus import Paragraph, SimpleDocTemplate, Spacer, Table, TableStyle
+
+from . import metrics
+
+# Bereits oben im Bericht ausgegebene Felder
+HEADER_FIELDS = ('Projektname', 'Projektverantwortlicher', 'Projektbeschreibung', 'Businessplan')
+
+
+def report_filename(data):
+    # Dateiname des Berichts, ohne Zeichen, die in Dateinamen Probleme bereiten
+    name = re.sub(r'[^\w\-. ]+', '_', str(data.get('Projektname') or 'Unbekanntes Projekt')).strip()
+    return f'Bericht_{name}.pdf'
+
+
+@functools.lru_cache(maxsize=None)
+def sample_styles():
+    # Absatzformate einmal je Prozess aufbauen und für alle Berichte wiederverwenden
+    return getSampleStyleSheet()
+
+
+@functools.lru_cache(maxsize=None)
+def business_plan_table_style():
+    return TableStyle([
+        ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
+        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+        ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+        ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
+        ('GRID', (0, 0), (-1, -1), 1, colors.black),
+    ])
+
+
+def _format_value(value):
+    if isinstance(value, list):
+        return ', '.join(str(v) for v in value)
+    if isinstance(value, dict):
+        return ', '.join([f"{k}: {v}" for k, v in value.items()])
+    if isinstance(value, np.ndarray):
+        return ', '.join([f"{v:.2f}" for v in value])
+    return str(value)
+
+
+def report_elements(data):
+    # Inhalte des Berichts (reportlab-Flowables) aus den Eingaben einer Initiative
+    styles = sample_styles()
+    elements = []
+
+    elements.append(Paragraph("KI-Projekt Bewertungsbericht", styles['Title']))
+    elements.append(Spacer(1, 12))
+
+    # Projektinformationen hinzufügen
+    project_name = data.get('Projektname', 'Unbekanntes Projekt')
+    project_manager = data.get('Projektverantwortlicher', 'Unbekannt')
+    project_description = data.get('Projektbeschreibung', '')
+
+    elements.append(Paragraph(f"<b>Projektname:</b> {project_name}", styles['Heading2']))
+    elements.append(Paragraph(f"<b>Projektverantwortlicher:</b> {project_manager}", styles['Normal']))
+    elements.append(Paragraph("<b>Projektbeschreibung:</b>", styles['Normal']))
+    elements.append(Paragraph(project_description, styles['Normal']))
+    elements.append(Spacer(1, 12))
+
+    # Restliche Daten hinzufügen
+    for key, value in data.items():
+        if key in HEADER_FIELDS:
+            continue  # Diese wurden bereits hinzugefügt
+        if hasattr(value, 'to_html'):  # pandas.DataFrame
+            elements.append(Paragraph(f"<b>{key}:</b>", styles['Normal']))
+            elements.append(Paragraph(value.to_html(index=False), styles['Normal']))
+            elements.append(Spacer(1, 12))
+            continue
+        elements.append(Paragraph(f"<b>{key}:</b> {_format_value(value)}", styles['Normal']))
+        elements.append(Spacer(1, 12))
+
+    # Businessplan hinzufügen, falls vorhanden (Liste von Zeilen als Dicts)
+    business_plan = data.get('Businessplan', [])
+    if business_plan:
+        elements.append(Paragraph("<b>Businessplan Übersicht:</b>", styles['Normal']))
+        columns = list(business_plan[0].keys())
+        rows = [columns] + [[row.get(column) for column in columns] for row in business_plan]
+        table = Table(rows)
+        table.setStyle(business_plan_table_style())
+        elements.append(table)
+        elements.append(Spacer(1, 12))
+    return elements
+
+
+@metrics.timer('pdf.erstellen')
+def build_pdf(data, target):
+    # Schreibt den Bericht nach target (Dateipfad oder binär geöffnetes dateiähnliches Objekt)
+    SimpleDocTemplate(target).build(report_elements(data))
+
+
+def write_temp_pdf(data):
+    # Bericht in eine temporäre Datei schreiben; der Aufrufer löscht die Datei nach der Auslieferung
+    handle, path = tempfile.mkstemp(prefix='ki_bericht_', suffix='.pdf')
+    os.close(handle)
+    try:
+        build_pdf(data, path)
+    except Exception:
+        os.remove(path)
+        raise
+    return path
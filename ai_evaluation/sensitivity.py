@@ -0,0 +1,117 @@
+"""Sensitivitätsanalyse (Tornado) des Finanzmodells aus Schritt 5.
+
+Jede Eingabe wird einzeln um ±x % verändert, alle übrigen bleiben auf ihrem
+Wert. Alle Veränderungen aller Eingaben und Stufen werden zusammen als eine
+Matrix Szenarien x Perioden mit cashflow_matrix berechnet. Die Wachstumsraten
+werden je Zeitraum einzeln verändert (relativ zur jeweiligen Rate).
+"""
+
+import time
+from dataclasses import dataclass, field
+from typing import Optional
+
+import numpy as np
+
+from .cache import memoize
+from .cashflow import cashflow_matrix, period_times
+from .simulation import period_index
+
+# Veränderungen in % (jeweils nach oben und unten)
+DEFAULT_LEVELS = (5.0, 10.0, 20.0)
+
+# Anzahl der zwischengespeicherten Ergebnisse von cached_sensitivity
+SENSITIVITY_CACHE_SIZE = 64
+
+# Skalare Eingaben: Schlüssel im Eingabe-Dict -> Parameter von cashflow_matrix
+SCALAR_INPUTS = {
+    'Basisumsatz (€)': 'basisumsatz',
+    'Jährliche Kosteneinsparungen (€)': 'cost_savings',
+    'Laufende Betriebskosten': 'operating_cost',
+    'Entwicklungskosten': 'development_cost',
+    'Risikobudget': 'risk_budget',
+    'Anlaufzeit (Jahre)': 'ramp_up_time',
+}
+
+
+def growth_rate_label(i):
+    return f'Wachstumsrate Zeitraum {i + 1}'
+
+
+@dataclass(frozen=True)
+class SensitivityResult:
+    parameters: tuple  # Namen der veränderten Eingaben
+    levels: tuple  # Veränderungen in %, aufsteigend (z.B. -20, -10, -5, 5, 10, 20)
+    base_roi: Optional[float]  # in %, None ohne Kosten
+    base_payback: Optional[float]  # in Jahren, None ohne Break-Even
+    roi: np.ndarray  # Parameter x Stufen, in % (NaN ohne Kosten)
+    payback_period: np.ndarray  # Parameter x Stufen, in Jahren (NaN ohne Break-Even)
+    seconds: float = field(default=0.0, compare=False)
+
+    def roi_delta(self):
+        return self.roi - (np.nan if self.base_roi is None else self.base_roi)
+
+    def payback_delta(self):
+        return self.payback_period - (np.nan if self.base_payback is None else self.base_payback)
+
+    def tornado(self, level, metric='roi'):
+        # Liste (Parameter, Änderung bei -level, Änderung bei +level) für metric ('roi' oder
+        # 'payback_period'), größte Spannweite zuerst
+        deltas = self.roi_delta() if metric == 'roi' else self.payback_delta()
+        low = deltas[:, self.levels.index(-level)]
+        high = deltas[:, self.levels.index(level)]
+        swing = np.nan_to_num(np.abs(high - low), nan=0.0)
+        return [
+            (self.parameters[i], float(low[i]), float(high[i]))
+            for i in np.argsort(-swing, kind='stable')
+        ]
+
+
+def sensitivity(data, levels=DEFAULT_LEVELS):
+    # Sensitivitätsanalyse für die Eingaben in data (Schlüssel wie in engine.CASHFLOW_FIELDS)
+    start = time.perf_counter()
+    duration = int(data['Projektlaufzeit (Jahre)'])
+    periods_per_year = int(data.get('Perioden pro Jahr') or 1)
+    growth_periods = data.get('Dynamische Wachstumsraten') or ()
+    levels = tuple(sorted({-abs(float(level)) for level in levels} | {abs(float(level)) for level in levels}))
+    factors = 1 + np.array(levels) / 100
+    parameters = tuple(SCALAR_INPUTS) + tuple(growth_rate_label(i) for i in range(len(growth_periods)))
+    n_params, n_levels = len(parameters), len(levels)
+    # Zeile 0: unveränderte Eingaben, danach je Parameter eine Zeile je Stufe
+    n_scenarios = 1 + n_params * n_levels
+
+    def scenario_factors(p):
+        # Faktor je Szenario für Parameter p (1 außer in dessen eigenen Zeilen)
+        column = np.ones(n_scenarios)
+        column[1 + p * n_levels:1 + (p + 1) * n_levels] = factors
+        return column
+
+    values = {
+        param: float(data.get(key) or 0.0) * scenario_factors(p)
+        for p, (key, param) in enumerate(SCALAR_INPUTS.items())
+    }
+    values['ramp_up_time'] = np.clip(values['ramp_up_time'], 0.0, duration)
+
+    # Wachstumsrate je Zeitraum und Szenario, danach auf die Perioden verteilt (Szenarien x Perioden)
+    period_rates = np.column_stack(
+        [float(period['growth_rate']) * scenario_factors(len(SCALAR_INPUTS) + i)
+         for i, period in enumerate(growth_periods)]
+        + [np.zeros(n_scenarios)]  # Spalte -1: Jahre ohne Zeitraum wachsen nicht
+    )
+    rates = period_rates[:, period_index(period_times(duration, periods_per_year), growth_periods)]
+
+    result = cashflow_matrix(duration, growth_rates=rates, solve_irr=False, periods_per_year=periods_per_year,
+                             **values)
+    base_roi, base_payback = float(result.roi[0]), float(result.payback_period[0])
+    return SensitivityResult(
+        parameters=parameters,
+        levels=levels,
+        base_roi=None if np.isnan(base_roi) else base_roi,
+        base_payback=None if np.isnan(base_payback) else base_payback,
+        roi=result.roi[1:].reshape(n_params, n_levels),
+        payback_period=result.payback_period[1:].reshape(n_params, n_levels),
+        seconds=time.perf_counter() - start,
+    )
+
+
+# Wie sensitivity, aber je normalisierter Eingabe nur einmal berechnet (Streamlit-Reruns in Schritt 5)
+cached_sensitivity = memoize(SENSITIVITY_CACHE_SIZE)(sensitivity)
@@ -0,0 +1,434 @@
+"""HTTP/JSON-Dienst für die Bewertung von Initiativen ohne die Streamlit-Oberfläche.
+
+Reine ASGI-Anwendung ohne Framework. Die Berechnungen (ai_evaluation.engine)
+laufen in einem Prozess-Pool, Datenbankzugriffe in Threads über den
+Verbindungspool; die Handler selbst blockieren die Ereignisschleife nicht.
+
+Endpunkte (Anfrage- und Antwortkörper JSON, Eingaben mit den Schlüsseln der App):
+
+    GET  /health
+    POST /finanzmodell         Eingaben der Schritte 4 und 5 -> ROI, Amortisationsdauer, Kapitalwert, Businessplan
+    POST /risiken              {"Risiken": [...]} -> Risikowerte (Schritt 6)
+    POST /nutzwertanalyse      Bewertungen und {"Gewichtungen": {...}} -> Gesamtbewertung (Schritt 13)
+    POST /bewertung            vollständiges Eingabe-Dict -> alle Kennzahlen
+    POST /initiativen          bewerten und als neue Initiative speichern
+    GET  /initiativen/<id>     gespeicherte Initiative mit Kennzahlen
+    PUT  /initiativen/<id>     bewerten und bestehende Initiative überschreiben
+
+Start (uvicorn muss installiert sein):
+
+    python -m ai_evaluation.service [--host 127.0.0.1] [--port 8000] [--workers 4] [--db ki_initiativen.db]
+
+Ohne Server lässt sich die Anwendung mit call() direkt aufrufen:
+
+    app = EvaluationService('test.db', workers=0)
+    status, body = call(app, 'POST', '/bewertung', {...})
+"""
+
+import argparse
+import asyncio
+import dataclasses
+import json
+import logging
+import math
+import multiprocessing
+import re
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+from . import engine, migrations, storage
+from .cashflow import RESOLUTIONS
+from .db import DB_PATH, ConnectionPool
+
+logger = logging.getLogger(__name__)
+
+# Größter akzeptierter Anfragekörper (Bytes)
+MAX_BODY_SIZE = 1_000_000
+
+# Längste akzeptierte Projektlaufzeit (Jahre); begrenzt Rechenzeit und Speicher je Anfrage
+MAX_PROJECT_DURATION = 100
+
+# Erwartete Form der Eingaben (Schlüssel der App): Zahlenfelder, Listen von Objekten mit ihren
+# Zahlenfeldern (Pflichtfelder, optionale Felder) und Objekte mit Zahlen je Schlüssel
+NUMBER_FIELDS = tuple(field for field in engine.CASHFLOW_FIELDS if field != 'Dynamische Wachstumsraten') + (
+    'Gesamtbewertung',
+) + storage.SCORE_CRITERIA
+LIST_FIELDS = {
+    'Dynamische Wachstumsraten': (('start_year', 'end_year', 'growth_rate'), ()),
+    'Risiken': ((), ('Wahrscheinlichkeit', 'Auswirkung')),
+}
+MAPPING_FIELDS = ('Gewichtungen', 'Gewichtete Bewertungen')
+
+
+class RequestError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+# --- Berechnungen (laufen im Worker-Prozess, daher Funktionen auf Modulebene) ---
+
+def _is_number(value):
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def validate_input(data):
+    # Prüft die Form der Eingaben, bevor gerechnet wird; Fehler als RequestError(400)
+    for field in NUMBER_FIELDS:
+        if data.get(field) is not None and not _is_number(data[field]):
+            raise RequestError(400, f"'{field}' muss eine Zahl sein.")
+    for field, (required, optional) in LIST_FIELDS.items():
+        items = data.get(field)
+        if items is None:
+            continue
+        if not isinstance(items, list) or not all(isinstance(item, dict) for item in items):
+            raise RequestError(400, f"'{field}' muss eine Liste von Objekten sein.")
+        for nr, item in enumerate(items, start=1):
+            for key in required + optional:
+                if (key in required or item.get(key) is not None) and not _is_number(item.get(key)):
+                    raise RequestError(400, f"'{field}', Eintrag {nr}: '{key}' muss eine Zahl sein.")
+    for field in MAPPING_FIELDS:
+        values = data.get(field)
+        if values is not None and not (
+            isinstance(values, dict) and all(_is_number(value) for value in values.values())
+        ):
+            raise RequestError(400, f"'{field}' muss ein Objekt mit Zahlen je Kriterium sein.")
+    _validate_ranges(data)
+
+
+def _validate_ranges(data):
+    # Wertebereiche der Finanzmodell-Eingaben (Vergleiche so formuliert, dass auch NaN abgelehnt wird)
+    duration = data.get('Projektlaufzeit (Jahre)')
+    if duration is not None and not (1 <= duration <= MAX_PROJECT_DURATION and duration == int(duration)):
+        raise RequestError(
+            400, f"'Projektlaufzeit (Jahre)' muss eine ganze Zahl von 1 bis {MAX_PROJECT_DURATION} sein.")
+    ramp_up_time = data.get('Anlaufzeit (Jahre)')
+    if ramp_up_time is not None and not (0 <= ramp_up_time <= (duration or MAX_PROJECT_DURATION)):
+        raise RequestError(400, "'Anlaufzeit (Jahre)' muss zwischen 0 und der Projektlaufzeit liegen.")
+    periods_per_year = data.get('Perioden pro Jahr')
+    if periods_per_year is not None and periods_per_year not in RESOLUTIONS.values():
+        allowed = ', '.join(str(m) for m in RESOLUTIONS.values())
+        raise RequestError(400, f"'Perioden pro Jahr' muss einer der Werte {allowed} sein.")
+    wacc = data.get('WACC (%)')
+    if wacc is not None and not (-100 < wacc < float('inf')):
+        raise RequestError(400, "'WACC (%)' muss größer als -100 sein.")
+
+
+def _validate_growth_periods(data):
+    errors = engine.validate_growth_periods(data.get('Dynamische Wachstumsraten') or [])
+    if errors:
+        raise RequestError(400, ' '.join(errors))
+
+
+def _cashflow_payload(cashflow):
+    return {
+        'gesamtumsatz': cashflow.total_revenue,
+        'gesamtkosten': cashflow.total_costs,
+        'gesamtgewinn': cashflow.total_profit,
+        'roi': cashflow.roi,
+        'amortisationsdauer': cashflow.payback_period,
+        'kapitalwert': cashflow.npv,
+        'interner_zinsfuss': cashflow.irr,
+        'diskontierte_amortisationsdauer': cashflow.discounted_payback,
+        'businessplan': engine.business_plan_records(cashflow),
+    }
+
+
+def _risk_payload(scores):
+    return [dataclasses.asdict(score) for score in scores]
+
+
+def financial_model(data):
+    validate_input(data)
+    missing = [field for field in engine.CASHFLOW_REQUIRED if data.get(field) is None]
+    if missing:
+        raise RequestError(400, f"Pflichtfelder fehlen: {', '.join(missing)}")
+    _validate_growth_periods(data)
+    return _cashflow_payload(engine.financial_model(data))
+
+
+def risk_assessment(data):
+    validate_input(data)
+    return {'risiken': _risk_payload(engine.risk_scores(data.get('Risiken')))}
+
+
+def utility_analysis(data):
+    validate_input(data)
+    weights = data.get('Gewichtungen')
+    if isinstance(weights, dict):
+        unknown = [name for name in weights if name not in storage.SCORE_CRITERIA]
+        if unknown:
+            raise RequestError(400, f"Unbekannte Kriterien in 'Gewichtungen': {', '.join(unknown)}")
+    if not isinstance(weights, dict) or not engine.weights_valid(weights):
+        raise RequestError(400, 'Die Summe der Gewichtungen muss 100% betragen.')
+    weighted, total = engine.utility_analysis(engine.criterion_scores(data), weights)
+    return {'gewichtete_bewertungen': weighted, 'gesamtbewertung': total}
+
+
+def evaluation(data):
+    # Alle Kennzahlen sowie die abgeleiteten Werte unter den Schlüsseln der App (zum Speichern)
+    validate_input(data)
+    _validate_growth_periods(data)
+    result = engine.evaluate(data)
+    payload = {
+        'anfangsinvestition': result.anfangsinvestition,
+        **(_cashflow_payload(result.cashflow) if result.cashflow is not None else {}),
+        'risiken': _risk_payload(result.risks),
+        'gewichtete_bewertungen': result.weighted_scores,
+        'gesamtbewertung': result.gesamtbewertung,
+    }
+    return payload, result.to_dict()
+
+
+def _run(function, data):
+    # Einstieg im Worker: Fehler in den Eingaben werden als (Status, Meldung) zurückgegeben,
+    # alle übrigen Fehler als 500, damit der Worker immer eine Antwort liefert
+    try:
+        return 200, function(data)
+    except RequestError as error:
+        return error.status, {'fehler': str(error)}
+    except (KeyError, TypeError, ValueError) as error:
+        return 400, {'fehler': f'Ungültige Eingaben: {error}'}
+    except Exception:
+        logger.exception('Berechnung %s fehlgeschlagen', function.__name__)
+        return 500, {'fehler': 'Interner Fehler bei der Berechnung.'}
+
+
+# --- ASGI-Anwendung ---
+
+def _json_safe(value):
+    # NaN und ±inf sind kein gültiges JSON und werden zu null; NumPy-Werte werden zu Python-Werten
+    if isinstance(value, dict):
+        return {key: _json_safe(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_json_safe(item) for item in value]
+    if hasattr(value, 'tolist'):
+        return _json_safe(value.tolist())
+    if isinstance(value, float) and not math.isfinite(value):
+        return None
+    return value
+
+
+def encode_json(payload):
+    return json.dumps(_json_safe(payload), ensure_ascii=False, allow_nan=False).encode()
+
+
+class EvaluationService:
+    # Routen: (Methode, Pfad als regulärer Ausdruck, Name der Handler-Methode)
+    ROUTES = (
+        ('GET', r'/health', 'health'),
+        ('POST', r'/finanzmodell', 'post_financial_model'),
+        ('POST', r'/risiken', 'post_risks'),
+        ('POST', r'/nutzwertanalyse', 'post_utility_analysis'),
+        ('POST', r'/bewertung', 'post_evaluation'),
+        ('POST', r'/initiativen', 'post_initiative'),
+        ('GET', r'/initiativen/(\d+)', 'get_initiative'),
+        ('PUT', r'/initiativen/(\d+)', 'put_initiative'),
+    )
+
+    def __init__(self, db_path=DB_PATH, workers=None):
+        # workers: Anzahl der Rechenprozesse (None = alle Kerne, 0 = Berechnung in Threads)
+        self.db_path = db_path
+        self.workers = workers
+        self._executor = None
+        self._pool = None
+        self._routes = [(method, re.compile(pattern + '$'), name) for method, pattern, name in self.ROUTES]
+
+    # Lebenszyklus
+
+    def startup(self):
+        if self._pool is not None:
+            return
+        self._pool = ConnectionPool(self.db_path)
+        with self._pool.connection() as conn:
+            migrations.migrate(conn)
+        if self.workers != 0:
+            self._executor = ProcessPoolExecutor(self.workers, mp_context=multiprocessing.get_context('spawn'))
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+        if self._pool is not None:
+            self._pool.close()
+            self._pool = None
+
+    async def _lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                self.startup()
+                await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                self.shutdown()
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
+
+    # Hilfsfunktionen für die Handler
+
+    async def compute(self, function, data):
+        # Rechenarbeit im Prozess-Pool (bzw. Thread-Pool bei workers=0)
+        loop = asyncio.get_running_loop()
+        status, payload = await loop.run_in_executor(self._executor, _run, function, data)
+        if status != 200:
+            raise RequestError(status, payload['fehler'])
+        return payload
+
+    async def database(self, function, *args):
+        # Datenbankzugriff mit einer geliehenen Verbindung in einem Thread
+        def run():
+            with self._pool.connection() as conn:
+                return function(conn, *args)
+
+        return await asyncio.get_running_loop().run_in_executor(None, run)
+
+    # Handler
+
+    async def health(self, body):
+        return 200, {'status': 'ok'}
+
+    async def post_financial_model(self, body):
+        return 200, await self.compute(financial_model, body)
+
+    async def post_risks(self, body):
+        return 200, await self.compute(risk_assessment, body)
+
+    async def post_utility_analysis(self, body):
+        return 200, await self.compute(utility_analysis, body)
+
+    async def post_evaluation(self, body):
+        payload, _ = await self.compute(evaluation, body)
+        return 200, payload
+
+    async def _save(self, body, initiative_id=None):
+        payload, derived = await self.compute(evaluation, body)
+        initiative_id = await self.database(storage.save_initiative, {**body, **derived}, initiative_id)
+        return {'id': initiative_id, **payload}
+
+    async def post_initiative(self, body):
+        return 201, await self._save(body)
+
+    async def get_initiative(self, body, initiative_id):
+        data = await self.database(storage.load_initiative, int(initiative_id))
+        if data is None:
+            raise RequestError(404, f'Initiative {initiative_id} nicht gefunden.')
+        return 200, {'id': int(initiative_id), 'daten': data}
+
+    async def put_initiative(self, body, initiative_id):
+        exists = await self.database(
+            lambda conn, i: conn.execute('SELECT 1 FROM initiativen WHERE id = ?', (i,)).fetchone(),
+            int(initiative_id),
+        )
+        if exists is None:
+            raise RequestError(404, f'Initiative {initiative_id} nicht gefunden.')
+        return 200, await self._save(body, int(initiative_id))
+
+    # ASGI
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] == 'lifespan':
+            await self._lifespan(receive, send)
+            return
+        if scope['type'] != 'http':
+            return
+        self.startup()  # ohne Lifespan-Unterstützung (z.B. call()) beim ersten Aufruf
+        try:
+            handler, args = self._route(scope['method'], scope['path'])
+            body = await self._read_json(scope, receive) if scope['method'] in ('POST', 'PUT') else None
+            status, payload = await handler(body, *args)
+        except RequestError as error:
+            status, payload = error.status, {'fehler': str(error)}
+        except Exception:
+            # Jede Anfrage erhält eine JSON-Antwort, auch bei unerwarteten Fehlern
+            logger.exception('%s %s fehlgeschlagen', scope['method'], scope['path'])
+            status, payload = 500, {'fehler': 'Interner Serverfehler.'}
+        await self._respond(send, status, payload)
+
+    def _route(self, method, path):
+        allowed = False
+        for route_method, pattern, name in self._routes:
+            match = pattern.match(path.rstrip('/') or '/')
+            if match:
+                if route_method == method:
+                    return getattr(self, name), match.groups()
+                allowed = True
+        if allowed:
+            raise RequestError(405, f'Methode {method} für {path} nicht erlaubt.')
+        raise RequestError(404, f'Unbekannter Pfad: {path}')
+
+    async def _read_json(self, scope, receive):
+        chunks, size = [], 0
+        while True:
+            message = await receive()
+            chunk = message.get('body', b'')
+            size += len(chunk)
+            if size > MAX_BODY_SIZE:
+                raise RequestError(413, 'Anfrage zu groß.')
+            chunks.append(chunk)
+            if not message.get('more_body'):
+                break
+        try:
+            body = json.loads(b''.join(chunks) or b'{}')
+        except ValueError:
+            raise RequestError(400, 'Der Anfragekörper ist kein gültiges JSON.') from None
+        if not isinstance(body, dict):
+            raise RequestError(400, 'Der Anfragekörper muss ein JSON-Objekt sein.')
+        return body
+
+    async def _respond(self, send, status, payload):
+        body = encode_json(payload)
+        await send({
+            'type': 'http.response.start',
+            'status': status,
+            'headers': [(b'content-type', b'application/json; charset=utf-8'),
+                        (b'content-length', str(len(body)).encode())],
+        })
+        await send({'type': 'http.response.body', 'body': body})
+
+
+# --- Lokaler Client (ohne Netzwerk, z.B. für Tests) ---
+
+async def request(app, method, path, body=None):
+    # Ruft die ASGI-Anwendung direkt auf; gibt (Status, JSON-Antwort) zurück
+    payload = b'' if body is None else json.dumps(body).encode()
+    messages = [{'type': 'http.request', 'body': payload, 'more_body': False}]
+    response = {}
+
+    async def receive():
+        return messages.pop(0) if messages else {'type': 'http.disconnect'}
+
+    async def send(message):
+        if message['type'] == 'http.response.start':
+            response['status'] = message['status']
+        elif message['type'] == 'http.response.body':
+            response['body'] = response.get('body', b'') + message.get('body', b'')
+
+    scope = {'type': 'http', 'method': method, 'path': path, 'headers': [], 'query_string': b''}
+    await app(scope, receive, send)
+    return response['status'], json.loads(response['body'])
+
+
+def call(app, method, path, body=None):
+    return asyncio.run(request(app, method, path, body))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Startet den Bewertungsdienst (ASGI über uvicorn).')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8000)
+    parser.add_argument('--workers', type=int, default=None, help='Rechenprozesse (Standard: alle Kerne)')
+    parser.add_argument('--db', default=DB_PATH, help='Pfad zur SQLite-Datenbank')
+    args = parser.parse_args(argv)
+
+    try:
+        import uvicorn
+    except ImportError:
+        print('Für den Dienst wird uvicorn benötigt: pip install uvicorn', file=sys.stderr)
+        return 1
+    uvicorn.run(EvaluationService(args.db, workers=args.workers), host=args.host, port=args.port,
+                log_level='info')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,114 @@
+"""Messung der Importkosten beim Start der Anwendung.
+
+Mit der Umgebungsvariable KI_STARTUP_PROFILE=1 protokolliert die Streamlit-App,
+welche Module beim ersten Import wie lange gebraucht haben (einschließlich der
+von ihnen nachgeladenen Module), und zeigt die Werte in der Seitenleiste an.
+
+Kaltstartkosten einzelner Module in einem frischen Prozess:
+
+    python -m ai_evaluation.startup [modul ...]
+"""
+
+import builtins
+import subprocess
+import sys
+import threading
+import time
+
+# Module, die ohne Angabe auf der Kommandozeile gemessen werden
+DEFAULT_MODULES = (
+    'streamlit',
+    'numpy',
+    'pandas',
+    'matplotlib.pyplot',
+    'reportlab.platypus',
+    'ai_evaluation.storage',
+    'ai_evaluation.cashflow',
+    'ai_evaluation.charts',
+)
+
+
+class ImportProfiler:
+    # Ersetzt builtins.__import__ und misst jeden erstmaligen Import auf oberster Ebene
+
+    def __init__(self):
+        self.timings = {}  # Modul -> Sekunden (inklusive nachgeladener Module)
+        self._local = threading.local()
+        self._original = None
+        self._lock = threading.Lock()
+
+    def install(self):
+        if self._original is None:
+            self._original = builtins.__import__
+            builtins.__import__ = self._import
+        return self
+
+    def uninstall(self):
+        if self._original is not None:
+            builtins.__import__ = self._original
+            self._original = None
+
+    def _new_modules(self, name, fromlist, level):
+        # Namen der Module, die dieser Import erstmals lädt (nur absolute Importe)
+        if level:
+            return []
+        if name not in sys.modules:
+            return [name]
+        return [f'{name}.{item}' for item in fromlist or () if f'{name}.{item}' not in sys.modules
+                and not hasattr(sys.modules[name], item)]
+
+    def _import(self, name, globals=None, locals=None, fromlist=(), level=0):
+        depth = getattr(self._local, 'depth', 0)
+        measured = self._new_modules(name, fromlist, level) if depth == 0 else []
+        self._local.depth = depth + 1
+        start = time.perf_counter()
+        try:
+            return self._original(name, globals, locals, fromlist, level)
+        finally:
+            self._local.depth = depth
+            if measured:
+                with self._lock:
+                    key = ', '.join(measured)
+                    self.timings[key] = self.timings.get(key, 0.0) + time.perf_counter() - start
+
+    def report(self):
+        # Liste (Modul, Sekunden), teuerste Importe zuerst
+        with self._lock:
+            return sorted(self.timings.items(), key=lambda item: item[1], reverse=True)
+
+
+_profiler = None
+
+
+def enable():
+    # Aktiviert die Messung einmal je Prozess (Streamlit führt das Skript bei jedem Rerun erneut aus)
+    global _profiler
+    if _profiler is None:
+        _profiler = ImportProfiler().install()
+    return _profiler
+
+
+def cold_import_times(modules, python=sys.executable):
+    # Kumulierte Importzeit (Sekunden) je Modul, jeweils in einem frischen Interpreter gemessen
+    result = {}
+    for module in modules:
+        completed = subprocess.run(
+            [python, '-X', 'importtime', '-c', f'import {module}'],
+            capture_output=True, text=True, check=True,
+        )
+        for line in completed.stderr.splitlines():
+            parts = line.split('|')
+            if len(parts) == 3 and parts[2].strip() == module:
+                result[module] = int(parts[1]) / 1e6
+    return result
+
+
+def main(argv=None):
+    modules = (sys.argv[1:] if argv is None else argv) or DEFAULT_MODULES
+    for module, seconds in cold_import_times(modules).items():
+        print(f'{module:<30} {seconds * 1000:8.1f} ms')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
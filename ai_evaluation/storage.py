@@ -0,0 +1,338 @@
+"""Persistenz der KI-Initiativen in der SQLite-Datenbank ki_initiativen.db."""
+
+import json
+
+from . import metrics
+
+# Spalten der Tabelle initiativen in der Reihenfolge von initiative_row()
+INITIATIVE_COLUMNS = (
+    'projektname',
+    'projektbeschreibung',
+    'projektverantwortlicher',
+    'strategische_ziele',
+    'kpis',
+    'ausrichtung',
+    'ki_technologie',
+    'zweck',
+    'anwendungsbereich',
+    'art_der_innovation',
+    'kosten',
+    'umsatz_roi',
+    'risiken',
+    'skalierbarkeit_nachhaltigkeit',
+    'erfolgsmessung',
+    'entscheidung',
+    'implementierung',
+    'ueberwachung',
+    'nutzwertanalyse',
+    'gesamtbewertung',
+    # Kennzahlen als eigene Spalten, damit Portfolio-Abfragen ohne JSON auskommen
+    'anfangsinvestition',
+    'laufende_betriebskosten',
+    'gesamtkosten',
+    'gesamtgewinn',
+    'roi',
+    'amortisationsdauer',
+    # Eingaben des Finanzmodells (Schritte 4 und 5)
+    'entwicklungskosten',
+    'risikobudget',
+    'projektlaufzeit',
+    'anlaufzeit',
+    'basisumsatz',
+    'kosteneinsparungen',
+    # Entscheidung aus Schritt 10 als eigene Spalte für Filter der Portfolio-Übersicht
+    'entscheidung_status',
+    # Kapitalkosten und diskontierte Kennzahlen (Ranking nach Kapitalwert ohne Neuberechnung)
+    'wacc',
+    'kapitalwert',
+    'interner_zinsfuss',
+    'diskontierte_amortisationsdauer',
+    # Zeitauflösung des Finanzmodells (ohne Angabe jährlich)
+    'perioden_pro_jahr',
+)
+
+# Kriterien der Nutzwertanalyse (Schritt 13)
+SCORE_CRITERIA = (
+    'Datenverfügbarkeit',
+    'Technische Fähigkeiten',
+    'Technologiekompatibilität',
+    'Skalierbarkeit',
+    'Nachhaltigkeit',
+)
+
+# INSERT-Anweisungen der Detailtabellen (initiative_id steht jeweils vorne)
+DETAIL_INSERT_SQL = {
+    'cashflow_jahre': 'INSERT INTO cashflow_jahre VALUES (?, ?, ?, ?, ?, ?)',
+    'risikobewertungen': 'INSERT INTO risikobewertungen VALUES (?, ?, ?, ?, ?)',
+    'gewichtungen': 'INSERT INTO gewichtungen VALUES (?, ?, ?)',
+    'bewertungen': 'INSERT INTO bewertungen VALUES (?, ?, ?, ?)',
+    'wachstumsperioden': 'INSERT INTO wachstumsperioden VALUES (?, ?, ?, ?, ?)',
+}
+
+# Upsert: Ohne ID vergibt SQLite eine neue, mit ID wird die bestehende Zeile überschrieben
+UPSERT_INITIATIVE_SQL = '''
+    INSERT INTO initiativen (id, {columns})
+    VALUES (?, {placeholders})
+    ON CONFLICT(id) DO UPDATE SET {updates}
+'''.format(
+    columns=', '.join(INITIATIVE_COLUMNS),
+    placeholders=', '.join('?' for _ in INITIATIVE_COLUMNS),
+    updates=', '.join(f'{column} = excluded.{column}' for column in INITIATIVE_COLUMNS),
+)
+
+
+def initiative_row(data):
+    # Wandelt die Eingaben in die Spaltenwerte der Tabelle initiativen um (Listen und Dicts als JSON)
+    return (
+        data.get('Projektname', ''),
+        data.get('Projektbeschreibung', ''),
+        data.get('Projektverantwortlicher', ''),
+        json.dumps(data.get('Strategische Ziele', [])),
+        json.dumps(data.get('KPIs', [])),
+        data.get('Ausrichtung auf Geschäftsziele', ''),
+        data.get('Art der KI-Technologie', ''),
+        data.get('Zweck des KI-Einsatzes', ''),
+        data.get('Anwendungsbereich', ''),
+        data.get('Art der Innovation', ''),
+        json.dumps({
+            'entwicklungskosten': data.get('Entwicklungskosten', 0.0),
+            'laufende_betriebskosten': data.get('Laufende Betriebskosten', 0.0),
+            'risikobudget': data.get('Risikobudget', 0.0),
+            'anfangsinvestition': data.get('Anfangsinvestition', 0.0)
+        }),
+        json.dumps({
+            'umsatz': data.get('Jährlicher Umsatz (€)', []),
+            'kosten': data.get('Jährliche Kosten (€)', []),
+            'gewinn': data.get('Jährlicher Gewinn (€)', []),
+            'roi': data.get('ROI (%)', 0.0),
+            'payback_period': data.get('Amortisationsdauer (Jahre)', 0.0)
+        }),
+        json.dumps(data.get('Risiken', [])),
+        json.dumps({
+            'skalierbarkeit': data.get('Skalierbarkeit', 0),
+            'nachhaltigkeit': data.get('Nachhaltigkeit', 0)
+        }),
+        json.dumps({
+            'metriken': data.get('Erfolgsmessungsmetriken', []),
+            'zielwerte': data.get('Zielwerte', [])
+        }),
+        json.dumps({
+            'entscheidung': data.get('Entscheidung', ''),
+            'begründung': data.get('Begründung', '')
+        }),
+        json.dumps({
+            'projektplan': data.get('Projektplan', ''),
+            'rollen': data.get('Rollen und Verantwortlichkeiten', []),
+            'ressourcen': data.get('Benötigte Ressourcen', '')
+        }),
+        json.dumps({
+            'leistungsüberwachung': data.get('Leistungsüberwachung', ''),
+            'regelmäßige_überprüfungen': data.get('Regelmäßige Überprüfungen', '')
+        }),
+        json.dumps({
+            'gewichtungen': data.get('Gewichtungen', {}),
+            'gewichtete_bewertungen': data.get('Gewichtete Bewertungen', {})
+        }),
+        data.get('Gesamtbewertung', 0.0),
+        data.get('Anfangsinvestition'),
+        data.get('Laufende Betriebskosten'),
+        data.get('Gesamtkosten (€)'),
+        data.get('Gesamter Gewinn (€)'),
+        data.get('ROI (%)'),
+        data.get('Amortisationsdauer (Jahre)'),
+        data.get('Entwicklungskosten'),
+        data.get('Risikobudget'),
+        data.get('Projektlaufzeit (Jahre)'),
+        data.get('Anlaufzeit (Jahre)'),
+        data.get('Basisumsatz (€)'),
+        data.get('Jährliche Kosteneinsparungen (€)'),
+        data.get('Entscheidung') or None,
+        data.get('WACC (%)'),
+        data.get('Kapitalwert (€)'),
+        data.get('Interner Zinsfuß (%)'),
+        data.get('Diskontierte Amortisationsdauer (Jahre)'),
+        data.get('Perioden pro Jahr'),
+    )
+
+
+def detail_rows(data):
+    # Zeilen der normalisierten Detailtabellen (ohne initiative_id)
+    revenue = data.get('Jährlicher Umsatz (€)') or []
+    costs = data.get('Jährliche Kosten (€)') or []
+    profit = data.get('Jährlicher Gewinn (€)') or []
+    savings = data.get('Kosteneinsparungen je Jahr (€)') or []
+
+    def at(values, year):
+        return values[year] if year < len(values) else None
+
+    weights = data.get('Gewichtungen') or {}
+    weighted_scores = data.get('Gewichtete Bewertungen') or {}
+    criteria = [k for k in SCORE_CRITERIA if k in data or k in weighted_scores]
+    criteria += [k for k in weighted_scores if k not in criteria]
+
+    return {
+        'cashflow_jahre': [
+            (year, at(revenue, year), at(savings, year), at(costs, year), at(profit, year))
+            for year in range(max(len(revenue), len(costs), len(profit)))
+        ],
+        'risikobewertungen': [
+            (nr, risk.get('Beschreibung'), risk.get('Wahrscheinlichkeit'), risk.get('Auswirkung'))
+            for nr, risk in enumerate(data.get('Risiken') or [])
+        ],
+        'gewichtungen': list(weights.items()),
+        'bewertungen': [
+            (criterion, data.get(criterion), weighted_scores.get(criterion))
+            for criterion in criteria
+        ],
+        'wachstumsperioden': [
+            (nr, period.get('start_year'), period.get('end_year'), period.get('growth_rate'))
+            for nr, period in enumerate(data.get('Dynamische Wachstumsraten') or [])
+        ],
+    }
+
+
+def serialize_initiative(data):
+    # Vollständiger, vom Dict unabhängiger Stand einer Initiative zum Schreiben
+    return initiative_row(data), detail_rows(data)
+
+
+def _loads(text, default):
+    try:
+        value = json.loads(text) if text else default
+    except (TypeError, ValueError):
+        return default
+    return value if isinstance(value, type(default)) else default
+
+
+def row_to_data(row):
+    # Baut aus einer Zeile von initiativen (sqlite3.Row oder Dict) wieder ein Eingabe-Dict
+    row = dict(row)
+    kosten = _loads(row.get('kosten'), {})
+    umsatz_roi = _loads(row.get('umsatz_roi'), {})
+    skalierung = _loads(row.get('skalierbarkeit_nachhaltigkeit'), {})
+    erfolgsmessung = _loads(row.get('erfolgsmessung'), {})
+    entscheidung = _loads(row.get('entscheidung'), {})
+    implementierung = _loads(row.get('implementierung'), {})
+    ueberwachung = _loads(row.get('ueberwachung'), {})
+    nutzwert = _loads(row.get('nutzwertanalyse'), {})
+
+    data = {
+        'Projektname': row.get('projektname') or '',
+        'Projektbeschreibung': row.get('projektbeschreibung') or '',
+        'Projektverantwortlicher': row.get('projektverantwortlicher') or '',
+        'Strategische Ziele': _loads(row.get('strategische_ziele'), []),
+        'KPIs': _loads(row.get('kpis'), []),
+        'Ausrichtung auf Geschäftsziele': row.get('ausrichtung') or '',
+        'Art der KI-Technologie': row.get('ki_technologie') or '',
+        'Zweck des KI-Einsatzes': row.get('zweck') or '',
+        'Anwendungsbereich': row.get('anwendungsbereich') or '',
+        'Art der Innovation': row.get('art_der_innovation') or '',
+        'Entwicklungskosten': kosten.get('entwicklungskosten', 0.0),
+        'Laufende Betriebskosten': kosten.get('laufende_betriebskosten', 0.0),
+        'Risikobudget': kosten.get('risikobudget', 0.0),
+        'Anfangsinvestition': kosten.get('anfangsinvestition', 0.0),
+        'Jährlicher Umsatz (€)': umsatz_roi.get('umsatz', []),
+        'Jährliche Kosten (€)': umsatz_roi.get('kosten', []),
+        'Jährlicher Gewinn (€)': umsatz_roi.get('gewinn', []),
+        'ROI (%)': umsatz_roi.get('roi'),
+        'Amortisationsdauer (Jahre)': umsatz_roi.get('payback_period'),
+        'Risiken': _loads(row.get('risiken'), []),
+        'Skalierbarkeit': skalierung.get('skalierbarkeit', 0),
+        'Nachhaltigkeit': skalierung.get('nachhaltigkeit', 0),
+        'Erfolgsmessungsmetriken': erfolgsmessung.get('metriken', []),
+        'Zielwerte': erfolgsmessung.get('zielwerte', []),
+        'Entscheidung': entscheidung.get('entscheidung', ''),
+        'Begründung': entscheidung.get('begründung', ''),
+        'Projektplan': implementierung.get('projektplan', ''),
+        'Rollen und Verantwortlichkeiten': implementierung.get('rollen', []),
+        'Benötigte Ressourcen': implementierung.get('ressourcen', ''),
+        'Leistungsüberwachung': ueberwachung.get('leistungsüberwachung', ''),
+        'Regelmäßige Überprüfungen': ueberwachung.get('regelmäßige_überprüfungen', ''),
+        'Gewichtungen': nutzwert.get('gewichtungen', {}),
+        'Gewichtete Bewertungen': nutzwert.get('gewichtete_bewertungen', {}),
+        'Gesamtbewertung': row.get('gesamtbewertung') or 0.0,
+    }
+    # Eingaben des Finanzmodells liegen nur in eigenen Spalten vor (ab Schema-Version 3)
+    for key, column in (
+        ('Entwicklungskosten', 'entwicklungskosten'),
+        ('Risikobudget', 'risikobudget'),
+        ('Projektlaufzeit (Jahre)', 'projektlaufzeit'),
+        ('Anlaufzeit (Jahre)', 'anlaufzeit'),
+        ('Basisumsatz (€)', 'basisumsatz'),
+        ('Jährliche Kosteneinsparungen (€)', 'kosteneinsparungen'),
+    ):
+        if row.get(column) is not None:
+            data[key] = row[column]
+    # Kapitalkosten und diskontierte Kennzahlen (ab Schema-Version 5)
+    for key, column in (
+        ('WACC (%)', 'wacc'),
+        ('Kapitalwert (€)', 'kapitalwert'),
+        ('Interner Zinsfuß (%)', 'interner_zinsfuss'),
+        ('Diskontierte Amortisationsdauer (Jahre)', 'diskontierte_amortisationsdauer'),
+    ):
+        if row.get(column) is not None:
+            data[key] = row[column]
+    # Zeitauflösung des Finanzmodells (ab Schema-Version 6)
+    if row.get('perioden_pro_jahr') is not None:
+        data['Perioden pro Jahr'] = row['perioden_pro_jahr']
+    if data['Jährliche Kosten (€)']:
+        data['Gesamtkosten (€)'] = sum(data['Jährliche Kosten (€)'])
+    if data['Jährlicher Gewinn (€)']:
+        data['Gesamter Gewinn (€)'] = sum(data['Jährlicher Gewinn (€)'])
+    return data
+
+
+def load_initiative(conn, initiative_id):
+    # Lädt eine Initiative als Eingabe-Dict oder None, falls die ID nicht existiert
+    cursor = conn.execute('SELECT * FROM initiativen WHERE id = ?', (initiative_id,))
+    row = cursor.fetchone()
+    if row is None:
+        return None
+    data = row_to_data(zip((d[0] for d in cursor.description), row))
+
+    # Wachstumsperioden und Einzelbewertungen aus den Detailtabellen ergänzen
+    periods = conn.execute(
+        'SELECT start_jahr, end_jahr, wachstumsrate FROM wachstumsperioden WHERE initiative_id = ? ORDER BY nr',
+        (initiative_id,),
+    ).fetchall()
+    if periods:
+        data['Dynamische Wachstumsraten'] = [
+            {'start_year': start, 'end_year': end, 'growth_rate': rate} for start, end, rate in periods
+        ]
+        data['Anzahl Wachstumsperioden'] = len(periods)
+    for criterion, score in conn.execute(
+        'SELECT kriterium, bewertung FROM bewertungen WHERE initiative_id = ? AND bewertung IS NOT NULL',
+        (initiative_id,),
+    ):
+        # Die Schieberegler der Schritte 3 und 7 erwarten ganze Zahlen
+        data[criterion] = int(score) if float(score).is_integer() else score
+    return data
+
+
+def _write_initiative(conn, initiative_id, record):
+    # Schreibt Hauptzeile und Detailzeilen einer Initiative (innerhalb der laufenden Transaktion)
+    row, details = record
+    cursor = conn.execute(UPSERT_INITIATIVE_SQL, (initiative_id,) + row)
+    if initiative_id is None:
+        initiative_id = cursor.lastrowid
+    else:
+        for table in DETAIL_INSERT_SQL:
+            conn.execute(f'DELETE FROM {table} WHERE initiative_id = ?', (initiative_id,))
+    for table, sql in DETAIL_INSERT_SQL.items():
+        if details[table]:
+            conn.executemany(sql, [(initiative_id,) + detail for detail in details[table]])
+    return initiative_id
+
+
+def save_initiative(conn, data, initiative_id=None):
+    # Legt beim ersten Speichern eine Zeile an und aktualisiert danach genau diese Zeile.
+    # Gibt die ID der Initiative zurück.
+    with metrics.timed('db.speichern'), conn:
+        return _write_initiative(conn, initiative_id, serialize_initiative(data))
+
+
+def write_initiatives(conn, records):
+    # Schreibt bereits serialisierte Stände {initiative_id: serialize_initiative(...)} in einer Transaktion
+    with metrics.timed('db.sammelschreiben'), conn:
+        for initiative_id, record in records.items():
+            _write_initiative(conn, initiative_id, record)
@@ -0,0 +1,95 @@
+"""Synthetische Initiativen für Benchmarks und Lasttests.
+
+Erzeugt vollständige Eingabe-Dicts mit denselben Schlüsseln wie
+st.session_state.data, einschließlich der abgeleiteten Werte aus
+engine.evaluate(). Laufzeit, Anzahl der Wachstumsperioden und Risiken sowie
+die Textlänge lassen sich einstellen, um die Datenmenge zu skalieren. Mit
+demselben Seed entstehen immer dieselben Initiativen.
+"""
+
+import random
+
+from . import engine
+from .cashflow import DEFAULT_WACC
+from .overview import DECISIONS
+from .storage import SCORE_CRITERIA
+
+_WORDS = ('Daten', 'Modell', 'Prozess', 'Kunde', 'Qualität', 'Automatisierung', 'Prognose',
+          'Fertigung', 'Service', 'Analyse', 'Plattform', 'Wartung', 'Logistik', 'Vertrieb')
+
+
+def _text(rng, n_words):
+    return ' '.join(rng.choice(_WORDS) for _ in range(n_words))
+
+
+def growth_periods(rng, project_duration, n_periods):
+    # n_periods lückenlose, nicht überlappende Zeiträume über die Laufzeit (ganze Jahre)
+    n_periods = min(n_periods, project_duration)
+    if n_periods <= 0:
+        return []
+    bounds = sorted(rng.sample(range(2, project_duration + 1), n_periods - 1)) if n_periods > 1 else []
+    starts = [1] + bounds
+    ends = [b - 1 for b in bounds] + [project_duration]
+    return [
+        {'start_year': float(s), 'end_year': float(e), 'growth_rate': round(rng.uniform(-5, 25), 1)}
+        for s, e in zip(starts, ends)
+    ]
+
+
+def initiative(rng, project_duration=10, n_periods=3, n_risks=5, text_words=30, name=None, periods_per_year=1):
+    # Eine Initiative mit zufälligen Eingaben aller Schritte und den daraus berechneten Werten
+    weights = [rng.randint(1, 10) for _ in SCORE_CRITERIA]
+    data = {
+        'Projektname': name or f'Initiative {_text(rng, 2)}',
+        'Projektbeschreibung': _text(rng, text_words),
+        'Projektverantwortlicher': rng.choice(('A. Berger', 'M. Schulz', 'K. Yilmaz', 'L. Wagner')),
+        'Strategische Ziele': [_text(rng, 4) for _ in range(3)],
+        'KPIs': [_text(rng, 2) for _ in range(3)],
+        'Ausrichtung auf Geschäftsziele': _text(rng, text_words // 2),
+        'Art der KI-Technologie': rng.choice(('Maschinelles Lernen', 'Computer Vision', 'NLP')),
+        'Zweck des KI-Einsatzes': _text(rng, 8),
+        'Anwendungsbereich': rng.choice(('Produktion', 'Vertrieb', 'Verwaltung')),
+        'Art der Innovation': rng.choice(('Inkrementell', 'Radikal')),
+        'Entwicklungskosten': float(rng.randrange(20_000, 2_000_000, 1_000)),
+        'Risikobudget': float(rng.randrange(0, 200_000, 1_000)),
+        'Laufende Betriebskosten': float(rng.randrange(5_000, 300_000, 1_000)),
+        'Projektlaufzeit (Jahre)': project_duration,
+        'Anlaufzeit (Jahre)': round(rng.uniform(0, min(3, project_duration)), 1),
+        'Dynamische Wachstumsraten': growth_periods(rng, project_duration, n_periods),
+        'Basisumsatz (€)': float(rng.randrange(10_000, 1_500_000, 1_000)),
+        'Jährliche Kosteneinsparungen (€)': float(rng.randrange(0, 300_000, 1_000)),
+        'WACC (%)': DEFAULT_WACC,
+        'Perioden pro Jahr': periods_per_year,
+        'Risiken': [
+            {'Beschreibung': _text(rng, 3), 'Wahrscheinlichkeit': rng.randint(0, 100), 'Auswirkung': rng.randint(1, 10)}
+            for _ in range(n_risks)
+        ],
+        **{criterion: rng.randint(0, 10) for criterion in SCORE_CRITERIA},
+        'Erfolgsmessungsmetriken': [_text(rng, 2) for _ in range(2)],
+        'Zielwerte': [str(rng.randint(1, 100)) for _ in range(2)],
+        'Entscheidung': rng.choice(DECISIONS + ('',)),
+        'Begründung': _text(rng, text_words // 2),
+        'Projektplan': _text(rng, text_words),
+        'Rollen und Verantwortlichkeiten': [_text(rng, 2) for _ in range(3)],
+        'Benötigte Ressourcen': _text(rng, 6),
+        'Leistungsüberwachung': _text(rng, 6),
+        'Regelmäßige Überprüfungen': rng.choice(('Monatlich', 'Quartalsweise', 'Jährlich')),
+        # Gewichtungen mit Summe 100 %, damit die Nutzwertanalyse berechnet wird
+        'Gewichtungen': dict(zip(SCORE_CRITERIA, _percentages(weights))),
+    }
+    data.update(engine.evaluate(data).to_dict())
+    return data
+
+
+def _percentages(weights):
+    # Ganzzahlige Prozentwerte mit Summe genau 100
+    total = sum(weights)
+    values = [float(100 * w // total) for w in weights]
+    values[0] += 100.0 - sum(values)
+    return values
+
+
+def initiatives(n, seed=0, **kwargs):
+    # n reproduzierbare Initiativen; kwargs wie bei initiative()
+    rng = random.Random(seed)
+    return [initiative(rng, name=f'Initiative {i + 1:05d}', **kwargs) for i in range(n)]
@@ -1,14 +1,32 @@
+import os
+import time
+
+# Startzeit-Messung (KI_STARTUP_PROFILE=1): Importkosten je Modul in der Seitenleiste anzeigen
+SCRIPT_START = time.perf_counter()
+if os.environ.get('KI_STARTUP_PROFILE'):
+    from ai_evaluation import startup
+    import_profiler = startup.enable()
+else:
+    import_profiler = None
+
 import streamlit as st
-import pandas as pd
-import matplotlib.pyplot as plt
+import copy
+import functools
 import json
-import numpy as np
-import base64
-from io import BytesIO
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, Image
-from reportlab.lib.styles import getSampleStyleSheet
-from reportlab.lib import colors
-import sqlite3  # Hinzugefügt für die Datenbankfunktionalität
+# pandas, NumPy, matplotlib und reportlab werden erst in den Schritten importiert, die sie benötigen
+from ai_evaluation import charts, engine, metrics, migrations, storage
+from ai_evaluation.autosave import AutosaveWriter
+from ai_evaluation.db import DB_PATH, ConnectionPool
+from ai_evaluation.derived import DerivedValues
+
+# Laufzeitmessung (KI_METRICS=1): Histogramme je Seite, Speichern, Diagramm und PDF in der Seitenleiste
+if os.environ.get('KI_METRICS'):
+    metrics.enable()
+
+# Debounce-Fenster (Sekunden), in dem Autosaves einer Initiative zusammengefasst werden
+AUTOSAVE_DEBOUNCE_SECONDS = float(os.environ.get('KI_AUTOSAVE_DEBOUNCE', '1.0'))
+# Höchstens so lange (Sekunden) wird beim Schritt- und Seitenwechsel auf ausstehende Autosaves gewartet
+AUTOSAVE_FLUSH_TIMEOUT = float(os.environ.get('KI_AUTOSAVE_FLUSH_TIMEOUT', '10.0'))
 
 st.set_page_config(page_title="KI-Initiativen Bewertungsprogramm", layout="wide")
 
@@ -20,126 +38,65 @@ if 'progress' not in st.session_state:
 if 'data' not in st.session_state:
     st.session_state.data = {}
 
-# Datenbankverbindung
-conn = sqlite3.connect('ki_initiativen.db')
-c = conn.cursor()
-
-# Tabelle erstellen, falls nicht vorhanden
-c.execute('''
-CREATE TABLE IF NOT EXISTS initiativen (
-    id INTEGER PRIMARY KEY AUTOINCREMENT,
-    projektname TEXT,
-    projektbeschreibung TEXT,
-    projektverantwortlicher TEXT,
-    strategische_ziele TEXT,
-    kpis TEXT,
-    ausrichtung TEXT,
-    ki_technologie TEXT,
-    zweck TEXT,
-    anwendungsbereich TEXT,
-    art_der_innovation TEXT,
-    kosten TEXT,
-    umsatz_roi TEXT,
-    risiken TEXT,
-    skalierbarkeit_nachhaltigkeit TEXT,
-    erfolgsmessung TEXT,
-    entscheidung TEXT,
-    implementierung TEXT,
-    ueberwachung TEXT,
-    nutzwertanalyse TEXT,
-    gesamtbewertung REAL
-)
-''')
-
-def save_initiative(data):
-    # Autosave in die Datenbank: Wandelt die Daten in JSON-Formate und speichert sie
-    strategic_goals = json.dumps(data.get('Strategische Ziele', []))
-    kpis = json.dumps(data.get('KPIs', []))
-    risks = json.dumps(data.get('Risiken', []))
-    
-    # Eintrag in die Datenbank
-    c.execute('''
-        INSERT INTO initiativen (
-            projektname, 
-            projektbeschreibung, 
-            projektverantwortlicher,
-            strategische_ziele,
-            kpis,
-            ausrichtung,
-            ki_technologie,
-            zweck,
-            anwendungsbereich,
-            art_der_innovation,
-            kosten,
-            umsatz_roi,
-            risiken,
-            skalierbarkeit_nachhaltigkeit,
-            erfolgsmessung,
-            entscheidung,
-            implementierung,
-            ueberwachung,
-            nutzwertanalyse,
-            gesamtbewertung
-        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-    ''', (
-        data.get('Projektname', ''),
-        data.get('Projektbeschreibung', ''),
-        data.get('Projektverantwortlicher', ''),
-        strategic_goals,
-        kpis,
-        data.get('Ausrichtung auf Geschäftsziele', ''),
-        data.get('Art der KI-Technologie', ''),
-        data.get('Zweck des KI-Einsatzes', ''),
-        data.get('Anwendungsbereich', ''),
-        data.get('Art der Innovation', ''),
-        json.dumps({
-            'entwicklungskosten': data.get('Entwicklungskosten', 0.0),
-            'laufende_betriebskosten': data.get('Laufende Betriebskosten', 0.0),
-            'risikobudget': data.get('Risikobudget', 0.0),
-            'anfangsinvestition': data.get('Anfangsinvestition', 0.0)
-        }),
-        json.dumps({
-            'umsatz': data.get('Jährlicher Umsatz (€)', []),
-            'kosten': data.get('Jährliche Kosten (€)', []),
-            'gewinn': data.get('Jährlicher Gewinn (€)', []),
-            'roi': data.get('ROI (%)', 0.0),
-            'payback_period': data.get('Amortisationsdauer (Jahre)', 0.0)
-        }),
-        risks,
-        json.dumps({
-            'skalierbarkeit': data.get('Skalierbarkeit', 0),
-            'nachhaltigkeit': data.get('Nachhaltigkeit', 0)
-        }),
-        json.dumps({
-            'metriken': data.get('Erfolgsmessungsmetriken', []),
-            'zielwerte': data.get('Zielwerte', [])
-        }),
-        json.dumps({
-            'entscheidung': data.get('Entscheidung', ''),
-            'begründung': data.get('Begründung', '')
-        }),
-        json.dumps({
-            'projektplan': data.get('Projektplan', ''),
-            'rollen': data.get('Rollen und Verantwortlichkeiten', []),
-            'ressourcen': data.get('Benötigte Ressourcen', '')
-        }),
-        json.dumps({
-            'leistungsüberwachung': data.get('Leistungsüberwachung', ''),
-            'regelmäßige_überprüfungen': data.get('Regelmäßige Überprüfungen', '')
-        }),
-        json.dumps({
-            'gewichtungen': data.get('Gewichtungen', {}),
-            'gewichtete_bewertungen': data.get('Gewichtete Bewertungen', {})
-        }),
-        data.get('Gesamtbewertung', 0.0)
-    ))
-    conn.commit()
+# Abgeleitete Werte (ROI, Businessplan, Gesamtbewertung, ...) werden nur bei geänderten Eingaben neu berechnet
+if 'derived' not in st.session_state:
+    st.session_state.derived = DerivedValues()
+
+# Entwurfs-ID: Alle Speichervorgänge einer Sitzung aktualisieren dieselbe Zeile in initiativen
+if 'initiative_id' not in st.session_state:
+    st.session_state.initiative_id = None
+
+@st.cache_resource
+def get_db_pool():
+    # Ein Verbindungspool pro Serverprozess; jeder Zugriff leiht sich eine eigene Verbindung.
+    # Beim Anlegen wird das Datenbankschema auf den aktuellen Stand migriert.
+    pool = ConnectionPool(DB_PATH)
+    with pool.connection() as conn:
+        migrations.migrate(conn)
+    return pool
+
+@st.cache_resource
+def get_autosave_writer():
+    # Ein Hintergrund-Schreiber pro Serverprozess, gemeinsam für alle Sitzungen
+    return AutosaveWriter(get_db_pool(), debounce_seconds=AUTOSAVE_DEBOUNCE_SECONDS)
+
+db_pool = get_db_pool()
+autosave_writer = get_autosave_writer()
+
+def save_initiative(data, initiative_id=None):
+    # Speichert die Initiative synchron (Upsert) und gibt ihre ID zurück
+    with db_pool.connection() as conn:
+        return storage.save_initiative(conn, data, initiative_id)
+
+def update_derived_values():
+    # Bringt alle abgeleiteten Werte in st.session_state.data auf den Stand der Eingaben
+    st.session_state.derived.update(st.session_state.data)
 
 def autosave():
-    # Diese Funktion speichert die Eingaben automatisch
-    save_initiative(st.session_state.data)
+    # Diese Funktion speichert die Eingaben automatisch in den Entwurf der aktuellen Initiative
+    update_derived_values()
+    if st.session_state.initiative_id is None:
+        # Erstes Speichern synchron, damit der Entwurf seine ID erhält
+        st.session_state.initiative_id = save_initiative(st.session_state.data)
+    else:
+        # Weitere Speichervorgänge übernimmt der Hintergrund-Schreiber (zusammengefasst)
+        autosave_writer.submit(st.session_state.initiative_id, st.session_state.data)
     st.sidebar.success('Daten automatisch gespeichert.')
 
+def flush_autosave():
+    # Schreibt ausstehende Autosaves; wartet nicht unbegrenzt, falls der Schreiber hängt
+    if not autosave_writer.flush(AUTOSAVE_FLUSH_TIMEOUT):
+        st.warning('Ausstehende Änderungen konnten nicht rechtzeitig gespeichert werden.')
+
+def new_initiative():
+    # Startet einen neuen Entwurf; die bisherige Initiative bleibt in der Datenbank erhalten
+    flush_autosave()
+    st.session_state.data = {}
+    st.session_state.derived = DerivedValues()
+    st.session_state.initiative_id = None
+    st.session_state.current_step = steps[0]
+    st.session_state.progress = 0
+
 # Zusätzliche Validierung: Überprüfung, ob alle erforderlichen Felder ausgefüllt sind
 def validate_input(field, field_name):
     if not field:
@@ -149,6 +106,8 @@ def validate_input(field, field_name):
 
 # Funktion zur Navigation
 def next_step():
+    # Ausstehende Autosaves beim Verlassen des Schritts schreiben
+    flush_autosave()
     current_index = step_indices[st.session_state.current_step]
     if current_index + 1 < len(steps):
         st.session_state.current_step = steps[current_index + 1]
@@ -156,6 +115,8 @@ def next_step():
         st.session_state.progress = int(((current_index + 1) / (len(steps) - 1)) * 100)
 
 def previous_step():
+    # Ausstehende Autosaves beim Verlassen des Schritts schreiben
+    flush_autosave()
     current_index = step_indices[st.session_state.current_step]
     if current_index > 0:
         st.session_state.current_step = steps[current_index - 1]
@@ -182,10 +143,6 @@ def step0():
     st.session_state.data['Projektbeschreibung'] = project_description
     project_manager = st.text_input('Projektverantwortlicher:', value=st.session_state.data.get('Projektverantwortlicher', ''), help='Geben Sie den Namen des Projektverantwortlichen an.', on_change=autosave)
     st.session_state.data['Projektverantwortlicher'] = project_manager
-    # Weiter-Button zur Navigation zum nächsten Schritt
-    if st.button('Weiter'):
-        next_step()
-    
     # Weiter-Button zur Navigation zum nächsten Schritt mit Validierung
     if st.button('Weiter'):
         valid_name = validate_input(project_name, 'Projektname')
@@ -222,7 +179,10 @@ step_indices = {step: index for index, step in enumerate(steps)}
 if 'current_step' not in st.session_state:
     st.session_state.current_step = steps[0]
 
-selected_step = st.sidebar.radio('Schritte auswählen', steps)
+# Übersicht über alle gespeicherten Initiativen (kein Schritt des Assistenten)
+PORTFOLIO_PAGE = "Portfolio"
+
+selected_step = st.sidebar.radio('Schritte auswählen', steps + [PORTFOLIO_PAGE])
 
 
 
@@ -298,22 +258,22 @@ def step2():
        
   # Weiter-Button zur Navigation mit Validierung und Autosave
     if st.button('Weiter'):
-    # Speichern der Eingaben
-    st.session_state.data['Art der KI-Technologie'] = ai_technology
-    st.session_state.data['Zweck des KI-Einsatzes'] = ai_purpose
-    st.session_state.data['Anwendungsbereich'] = application_area
-    st.session_state.data['Art der Innovation'] = innovation_type
-
-    # Validierung der Eingaben
-    valid_technology = validate_input(ai_technology, 'Art der KI-Technologie')
-    valid_purpose = validate_input(ai_purpose, 'Zweck des KI-Einsatzes')
-    valid_application = validate_input(application_area, 'Anwendungsbereich')
-    valid_innovation = validate_input(innovation_type, 'Art der Innovation')
-
-    if valid_technology and valid_purpose and valid_application and valid_innovation:
-        autosave()  # Speichern der Daten vor dem Weitergehen
-        st.success("Daten automatisch gespeichert.")  # Optional: Hinweis zur Speicherung
-        next_step()  # Navigiere zum nächsten Schritt
+        # Speichern der Eingaben
+        st.session_state.data['Art der KI-Technologie'] = ai_technology
+        st.session_state.data['Zweck des KI-Einsatzes'] = ai_purpose
+        st.session_state.data['Anwendungsbereich'] = application_area
+        st.session_state.data['Art der Innovation'] = innovation_type
+
+        # Validierung der Eingaben
+        valid_technology = validate_input(ai_technology, 'Art der KI-Technologie')
+        valid_purpose = validate_input(ai_purpose, 'Zweck des KI-Einsatzes')
+        valid_application = validate_input(application_area, 'Anwendungsbereich')
+        valid_innovation = validate_input(innovation_type, 'Art der Innovation')
+
+        if valid_technology and valid_purpose and valid_application and valid_innovation:
+            autosave()  # Speichern der Daten vor dem Weitergehen
+            st.success("Daten automatisch gespeichert.")  # Optional: Hinweis zur Speicherung
+            next_step()  # Navigiere zum nächsten Schritt
 
 def step3():
     st.header("3. Technische Machbarkeit bewerten")
@@ -343,20 +303,20 @@ def step3():
   
     # Weiter-Button zur Navigation mit Validierung und Autosave
     if st.button('Weiter'):
-    # Speichern der Eingaben
-    st.session_state.data['Datenverfügbarkeit'] = data_availability
-    st.session_state.data['Technische Fähigkeiten'] = technical_skills
-    st.session_state.data['Technologiekompatibilität'] = tech_compatibility
-
-    # Validierung der Eingaben
-    valid_data_availability = validate_input(data_availability, 'Datenverfügbarkeit')
-    valid_technical_skills = validate_input(technical_skills, 'Technische Fähigkeiten')
-    valid_tech_compatibility = validate_input(tech_compatibility, 'Technologiekompatibilität')
-
-    if valid_data_availability and valid_technical_skills and valid_tech_compatibility:
-        autosave()  # Speichern der Daten vor dem Weitergehen
-        st.success("Daten automatisch gespeichert.")  # Optional: Hinweis zur Speicherung
-        next_step()  # Navigiere zum nächsten Schritt
+        # Speichern der Eingaben
+        st.session_state.data['Datenverfügbarkeit'] = data_availability
+        st.session_state.data['Technische Fähigkeiten'] = technical_skills
+        st.session_state.data['Technologiekompatibilität'] = tech_compatibility
+
+        # Validierung der Eingaben
+        valid_data_availability = validate_input(data_availability, 'Datenverfügbarkeit')
+        valid_technical_skills = validate_input(technical_skills, 'Technische Fähigkeiten')
+        valid_tech_compatibility = validate_input(tech_compatibility, 'Technologiekompatibilität')
+
+        if valid_data_availability and valid_technical_skills and valid_tech_compatibility:
+            autosave()  # Speichern der Daten vor dem Weitergehen
+            st.success("Daten automatisch gespeichert.")  # Optional: Hinweis zur Speicherung
+            next_step()  # Navigiere zum nächsten Schritt
 
 
 def step4():
@@ -389,21 +349,20 @@ def step4():
         ) 
 # Weiter-Button zur Navigation mit Validierung und Autosave
     if st.button('Weiter'):
-    # Speichern der Eingaben
-    st.session_state.data['Entwicklungskosten'] = development_cost
-    st.session_state.data['Laufende Betriebskosten'] = operational_cost
-    st.session_state.data['Risikobudget'] = risk_budget
-    st.session_state.data['Anfangsinvestition'] = development_cost + risk_budget
-
-    # Validierung der Eingaben
-    valid_development_cost = validate_input(development_cost, 'Entwicklungskosten')
-    valid_operational_cost = validate_input(operational_cost, 'Laufende Betriebskosten')
-    valid_risk_budget = validate_input(risk_budget, 'Risikobudget')
-
-    if valid_development_cost and valid_operational_cost and valid_risk_budget:
-        autosave()  # Speichern der Daten vor dem Weitergehen
-        st.success("Daten automatisch gespeichert.")  # Optional: Hinweis zur Speicherung
-        next_step()  # Navigiere zum nächsten Schritt
+        # Speichern der Eingaben
+        st.session_state.data['Entwicklungskosten'] = development_cost
+        st.session_state.data['Laufende Betriebskosten'] = operational_cost
+        st.session_state.data['Risikobudget'] = risk_budget
+
+        # Validierung der Eingaben
+        valid_development_cost = validate_input(development_cost, 'Entwicklungskosten')
+        valid_operational_cost = validate_input(operational_cost, 'Laufende Betriebskosten')
+        valid_risk_budget = validate_input(risk_budget, 'Risikobudget')
+
+        if valid_development_cost and valid_operational_cost and valid_risk_budget:
+            autosave()  # Speichern der Daten vor dem Weitergehen
+            st.success("Daten automatisch gespeichert.")  # Optional: Hinweis zur Speicherung
+            next_step()  # Navigiere zum nächsten Schritt
 
 def step5():
     st.header("5. Umsatz, Kosten und ROI schätzen")
@@ -447,7 +406,6 @@ def step5():
         existing_growth_periods = existing_growth_periods[:num_periods]
 
     growth_periods = []
-    valid_periods = True  # Flag für gültige Zeiträume
     for i in range(num_periods):
         st.markdown(f"**Zeitraum {i+1}**")
         col1, col2, col3 = st.columns(3)
@@ -478,19 +436,18 @@ def step5():
                 key=f"growth_rate_{i}"
             )
 
-        # Überprüfen, ob der Start des aktuellen Zeitraums nach dem Ende des vorherigen Zeitraums liegt
-        if i > 0 and start_year <= growth_periods[i - 1]["end_year"]:
-            st.error(f"Zeitraum {i+1}: Startjahr muss nach dem Endjahr des vorherigen Zeitraums liegen.")
-            valid_periods = False
-
         growth_periods.append({
             "start_year": start_year,
             "end_year": end_year,
             "growth_rate": growth_rate
         })
 
-    # Wenn die Zeiträume nicht gültig sind, keine weiteren Berechnungen zulassen
-    if not valid_periods:
+    # Überprüfen, ob sich Zeiträume überschneiden;
+    # wenn die Zeiträume nicht gültig sind, keine weiteren Berechnungen zulassen
+    period_errors = engine.validate_growth_periods(growth_periods)
+    for error in period_errors:
+        st.error(error)
+    if period_errors:
         st.warning("Bitte korrigieren Sie die Zeiträume, bevor Sie fortfahren.")
         return
 
@@ -511,130 +468,221 @@ def step5():
         value=st.session_state.data.get('Basisumsatz (€)', 0.0),
         help="Der Ausgangsumsatz, auf den die Wachstumsraten angewendet werden."
     )
+    from ai_evaluation.cashflow import DEFAULT_WACC, RESOLUTIONS
+    wacc = st.number_input(
+        "Kapitalkosten (WACC) in %:",
+        step=0.5,
+        format="%.2f",
+        value=float(st.session_state.data.get('WACC (%)') or DEFAULT_WACC),
+        help="Zinssatz, mit dem die Jahresgewinne für Kapitalwert und diskontierte Amortisationsdauer abgezinst werden."
+    )
+    resolution_labels = list(RESOLUTIONS)
+    resolution = st.selectbox(
+        "Zeitauflösung des Finanzmodells:",
+        resolution_labels,
+        index=list(RESOLUTIONS.values()).index(st.session_state.data.get('Perioden pro Jahr') or 1),
+        help="Bei quartalsweiser oder monatlicher Rechnung wirken Anlaufzeit und Wachstumszeiträume auf das Quartal bzw. den Monat genau. Der Businessplan zeigt weiterhin Jahreswerte."
+    )
+    periods_per_year = RESOLUTIONS[resolution]
 
     # Abrufen der Kosten aus Schritt 4
     development_cost = st.session_state.data.get('Entwicklungskosten', 0.0)
     risk_budget = st.session_state.data.get('Risikobudget', 0.0)
     operating_cost = st.session_state.data.get('Laufende Betriebskosten', 0.0)
 
-    total_initial_cost = development_cost + risk_budget  # Kosten im Jahr 0
-
-    # Berechnung der jährlichen Umsätze unter Berücksichtigung des Wachstums und der Anlaufzeit
-    years = np.arange(0, project_duration + 1)  # Einschließlich Jahr 0 bis Projektlaufzeit
-    revenue = np.zeros(project_duration + 1)
-    for i in range(1, project_duration + 1):
-        if years[i] <= ramp_up_time:
-            revenue[i] = 0  # Während der Anlaufzeit kein Umsatz
-        else:
-            if revenue[i - 1] == 0:
-                revenue[i] = basisumsatz  # Nach Anlaufzeit mit Basisumsatz starten
-            else:
-                previous_revenue = revenue[i - 1]
-                growth_rate = 0.0
-                for period in growth_periods:
-                    if period["start_year"] <= years[i] <= period["end_year"]:
-                        growth_rate = period["growth_rate"]
-                        break
-                revenue[i] = previous_revenue * (1 + (growth_rate / 100))
-
-    # Kostenberechnung
-    annual_costs = np.zeros(project_duration + 1)
-    annual_costs[0] = total_initial_cost  # Kosten im Jahr 0
-
-    for i in range(1, project_duration + 1):
-        if years[i] <= ramp_up_time:
-            annual_costs[i] = 0  # Keine laufenden Betriebskosten während der Anlaufzeit
-        else:
-            annual_costs[i] = operating_cost  # Laufende Betriebskosten nach Anlaufzeit
-
-    # Berechnung der kumulierten Kosten
-    cumulative_costs = np.cumsum(annual_costs)
-
-
-    # Kosteneinsparungen nach der Anlaufzeit
-    cost_savings_array = np.zeros(project_duration + 1)
-    for i in range(1, project_duration + 1):
-        if years[i] > ramp_up_time:
-            cost_savings_array[i] = cost_savings
-        else:
-            cost_savings_array[i] = 0
-
-    # Gewinn = Umsatz + Kosteneinsparungen - Kosten (im aktuellen Jahr)
-    profit_annual = revenue + cost_savings_array - annual_costs
-
-    # Berechnung der kumulierten Umsätze, Kosten und Gewinne
-    cumulative_revenue = np.cumsum(revenue)
-    cumulative_profit = np.cumsum(profit_annual)
-    cumulative_costs = np.cumsum(annual_costs)
-
-    # Gesamte Kosten für die ROI-Berechnung
-    total_costs = cumulative_costs[-1]
-    total_profit = cumulative_profit[-1]
+    # Berechnung von Umsatz, Kosten, Gewinn, ROI und Break-Even über ai_evaluation.engine
+    # (Kosten aus Schritt 4, übrige Eingaben aus den Feldern oben).
+    # Bei unveränderten Eingaben liefert der Cache das Ergebnis des letzten Reruns.
+    cashflow = engine.financial_model({
+        **st.session_state.data,
+        'Projektlaufzeit (Jahre)': project_duration,
+        'Anlaufzeit (Jahre)': ramp_up_time,
+        'Dynamische Wachstumsraten': growth_periods,
+        'Basisumsatz (€)': basisumsatz,
+        'Jährliche Kosteneinsparungen (€)': cost_savings,
+        'WACC (%)': wacc,
+        'Perioden pro Jahr': periods_per_year,
+    })
+    years = cashflow.years
+    cumulative_revenue = cashflow.cumulative_revenue
+    cumulative_costs = cashflow.cumulative_costs
+    total_costs = cashflow.total_costs
+    total_profit = cashflow.total_profit
 
     # Umsatz und Kosten anzeigen
-    st.write(f"**Geschätzter gesamter Umsatz über {project_duration} Jahr(e):** € {np.sum(revenue):,.2f}")
+    st.write(f"**Geschätzter gesamter Umsatz über {project_duration} Jahr(e):** € {cashflow.total_revenue:,.2f}")
     st.write(f"**Geschätzte Gesamtkosten über {project_duration} Jahr(e):** € {total_costs:,.2f}")
     st.write(f"**Geschätzter gesamter Gewinn über {project_duration} Jahr(e):** € {total_profit:,.2f}")
 
     # ROI Berechnung
-    if total_costs > 0:
-        roi = (total_profit / total_costs) * 100
+    roi = cashflow.roi
+    if roi is not None:
         st.write(f"**Geschätzter ROI über die Projektlaufzeit:** {roi:.2f}%")
     else:
         st.warning("Bitte geben Sie zuerst die Gesamtkosten in Schritt 4 ein.")
-        roi = None
 
-    # Break-Even-Punkt ermitteln
-    cumulative_cash_flow = cumulative_profit
-    payback_period = None
-    for i in range(1, len(cumulative_cash_flow)):
-        if cumulative_cash_flow[i] >= 0 and cumulative_cash_flow[i-1] < 0:
-            # Lineare Interpolation für genaueren Break-Even-Punkt
-            payback_period = years[i-1] + (0 - cumulative_cash_flow[i-1]) * (years[i] - years[i-1]) / (cumulative_cash_flow[i] - cumulative_cash_flow[i-1])
-            break
+    # Break-Even-Punkt (linear interpoliert)
+    payback_period = cashflow.payback_period
 
     # Visualisierungen
     st.subheader("Visualisierung")
     st.markdown("**Amortisationsdiagramm**")
-    fig_am, ax_am = plt.subplots(figsize=(10, 6))
-
-    # Kumulativer Umsatz und Kosten im Diagramm darstellen
-    ax_am.plot(years, cumulative_revenue, label='Kumulativer Umsatz', marker='o')
-    ax_am.plot(years, cumulative_costs, label='Kumulative Kosten', marker='o')
+    st.image(charts.amortisation_chart(
+        years.tolist(),
+        cumulative_revenue.tolist(),
+        cumulative_costs.tolist(),
+        ramp_up_time,
+        payback_period,
+        project_duration,
+    ), width='stretch')
 
-    # Anlaufzeit markieren
-    if ramp_up_time > 0:
-        ax_am.axvspan(0, ramp_up_time, color='yellow', alpha=0.3, label='Anlaufzeit')
-
-    # Break-even-Punkt markieren
     if payback_period is not None:
-        ax_am.axvline(x=payback_period, color='grey', linestyle='--', label=f'Break-Even-Punkt ({payback_period:.2f} Jahr(e))')
         st.write(f"**Amortisationsdauer (Break-Even):** {payback_period:.2f} Jahr(e)")
     else:
         st.warning("Die Investition amortisiert sich innerhalb der Projektlaufzeit nicht.")
 
-    ax_am.set_xlabel('Jahre')
-    ax_am.set_ylabel('Euro (€)')
-    ax_am.set_title('Amortisationsdiagramm mit Break-Even-Punkt')
-    ax_am.set_xlim(0, project_duration)
-    ax_am.legend()
-    st.pyplot(fig_am)
+    # Diskontierte Kennzahlen bei den angegebenen Kapitalkosten
+    st.write(f"**Kapitalwert (NPV) bei {wacc:.2f}% WACC:** € {cashflow.npv:,.2f}")
+    if cashflow.irr is not None:
+        st.write(f"**Interner Zinsfuß (IRR):** {cashflow.irr:.2f}%")
+    if cashflow.discounted_payback is not None:
+        st.write(f"**Diskontierte Amortisationsdauer:** {cashflow.discounted_payback:.2f} Jahr(e)")
+    else:
+        st.write("**Diskontierte Amortisationsdauer:** keine Amortisation innerhalb der Projektlaufzeit")
 
     # Info-Feld für Businessplan
     with st.expander("📄 Businessplan Übersicht"):
         st.write("Hier sehen Sie eine Übersicht der erwarteten Umsätze, Kosteneinsparungen, Kosten und Gewinne über die gesamte Projektlaufzeit:")
-        business_plan_df = pd.DataFrame({
-            'Jahr': years,
-            'Umsatz (€)': revenue,
-            'Kosteneinsparungen (€)': cost_savings_array,
-            'Kosten (€)': annual_costs,
-            'Gewinn (€)': profit_annual,
-            'Kumulativer Umsatz (€)': cumulative_revenue,
-            'Kumulative Kosten (€)': cumulative_costs,
-            'Kumulativer Gewinn (€)': cumulative_profit
-        })
+        business_plan_df = cashflow.business_plan()
         st.table(business_plan_df.set_index('Jahr'))
 
+    # Monte-Carlo-Simulation: Streuung von ROI und Amortisationsdauer bei unsicheren Eingaben
+    with st.expander("🎲 Monte-Carlo-Simulation"):
+        import numpy as np
+        import pandas as pd
+        from ai_evaluation.simulation import SimulationInputs, default_scenarios, normal, relative_normal, simulate
+
+        st.write("Die Eingaben werden als normalverteilt um die oben angegebenen Werte angenommen. Für jedes Szenario wird das Finanzmodell vollständig berechnet.")
+        # Unterjährig weniger Szenarien als Standard, damit die Simulation unter einer Sekunde bleibt
+        n_scenarios = int(st.number_input("Anzahl Szenarien:", min_value=1000, max_value=1_000_000, step=10_000, value=default_scenarios(periods_per_year)))
+        col1, col2 = st.columns(2)
+        with col1:
+            basis_uncertainty = st.number_input("Unsicherheit Basisumsatz (± % Standardabweichung):", min_value=0.0, step=1.0, value=20.0)
+            growth_uncertainty = st.number_input("Unsicherheit Wachstumsraten (± Prozentpunkte):", min_value=0.0, step=0.5, value=2.0)
+        with col2:
+            operating_uncertainty = st.number_input("Unsicherheit Betriebskosten (± %):", min_value=0.0, step=1.0, value=10.0)
+            savings_uncertainty = st.number_input("Unsicherheit Kosteneinsparungen (± %):", min_value=0.0, step=1.0, value=10.0)
+
+        if st.button("Simulation starten"):
+            simulation = simulate(SimulationInputs(
+                project_duration=project_duration,
+                ramp_up_time=ramp_up_time,
+                growth_periods=tuple(
+                    {**period, 'growth_rate': normal(period['growth_rate'], growth_uncertainty) if growth_uncertainty else period['growth_rate']}
+                    for period in growth_periods
+                ),
+                basisumsatz=relative_normal(basisumsatz, basis_uncertainty),
+                cost_savings=relative_normal(cost_savings, savings_uncertainty),
+                operating_cost=relative_normal(operating_cost, operating_uncertainty),
+                development_cost=development_cost,
+                risk_budget=risk_budget,
+                periods_per_year=periods_per_year,
+            ), n_scenarios)
+
+            roi_percentiles = simulation.roi_percentiles()
+            payback_percentiles = simulation.payback_percentiles()
+            st.write(f"**Wahrscheinlichkeit des Break-Even innerhalb der Laufzeit:** {simulation.break_even_probability:.1%}")
+            st.table(pd.DataFrame({
+                'ROI (%)': roi_percentiles.values(),
+                'Amortisationsdauer (Jahre)': payback_percentiles.values(),
+            }, index=[f"P{p}" for p in roi_percentiles]))
+            counts, edges = np.histogram(simulation.roi[~np.isnan(simulation.roi)], bins=40)
+            st.bar_chart(pd.DataFrame({'Szenarien': counts}, index=np.round((edges[:-1] + edges[1:]) / 2, 1)))
+            st.caption(f"{simulation.n_scenarios:,} Szenarien in {simulation.seconds * 1000:.0f} ms berechnet.")
+
+            st.session_state.data['Monte-Carlo-Simulation'] = {
+                'Szenarien': simulation.n_scenarios,
+                'Break-Even-Wahrscheinlichkeit (%)': simulation.break_even_probability * 100,
+                **{f'ROI P{p} (%)': float(value) for p, value in roi_percentiles.items()},
+            }
+
+    # Eingaben des Finanzmodells für Sensitivitätsanalyse und Zielwertsuche; nur die Felder des
+    # Modells, damit die Ergebnis-Caches nicht von Eingaben anderer Schritte abhängen
+    model_inputs = {
+        **{field: st.session_state.data.get(field) for field in engine.CASHFLOW_FIELDS},
+        'Projektlaufzeit (Jahre)': project_duration,
+        'Anlaufzeit (Jahre)': ramp_up_time,
+        'Dynamische Wachstumsraten': growth_periods,
+        'Basisumsatz (€)': basisumsatz,
+        'Jährliche Kosteneinsparungen (€)': cost_savings,
+        'WACC (%)': wacc,
+        'Perioden pro Jahr': periods_per_year,
+    }
+
+    # Sensitivitätsanalyse: Einfluss jeder Eingabe auf ROI und Amortisationsdauer bei ±x %.
+    # Gerechnet wird erst auf Anforderung, danach je Eingabe nur einmal (Ergebnis-Cache).
+    with st.expander("🌪️ Sensitivitätsanalyse"):
+        import pandas as pd
+        from ai_evaluation.sensitivity import DEFAULT_LEVELS, cached_sensitivity
+
+        st.write("Jede Eingabe wird einzeln um den gewählten Prozentsatz nach oben und unten verändert, alle anderen Eingaben bleiben unverändert.")
+        col1, col2 = st.columns(2)
+        with col1:
+            level = st.select_slider("Veränderung der Eingaben (± %):", options=[1, 2, 5, 10, 20, 30, 50], value=10)
+        with col2:
+            metric = st.radio("Kennzahl:", ["ROI", "Amortisationsdauer"], horizontal=True)
+        if st.button("Berechnen", key="sensitivitaet_berechnen"):
+            st.session_state.sensitivity_requested = True
+        if st.session_state.get('sensitivity_requested'):
+            try:
+                result = cached_sensitivity(model_inputs, levels=tuple(sorted(set(DEFAULT_LEVELS) | {float(level)})))
+                if metric == "ROI":
+                    rows, label, deltas = result.tornado(float(level)), 'ROI (%-Punkte)', result.roi_delta()
+                else:
+                    rows, label, deltas = result.tornado(float(level), 'payback_period'), 'Amortisationsdauer (Jahre)', result.payback_delta()
+                chart = charts.tornado_chart(rows, float(level), label)
+            except Exception as error:
+                st.error(f"Die Sensitivitätsanalyse konnte nicht berechnet werden: {error}")
+            else:
+                st.image(chart, width='stretch')
+                st.dataframe(pd.DataFrame(deltas, index=list(result.parameters), columns=[f"{l:+g} %" for l in result.levels]).round(2))
+                st.caption(f"Änderung {label} gegenüber den aktuellen Eingaben; leere Werte: kein Break-Even bzw. keine Kosten. "
+                           f"{len(result.parameters) * len(result.levels)} Varianten in {result.seconds * 1000:.1f} ms berechnet.")
+
+    # Zielwertsuche: nötiger Umsatz bzw. tragbare Kosten für einen Zielwert von ROI, Amortisationsdauer oder Kapitalwert.
+    # Gerechnet wird erst auf Anforderung, danach je Eingabe nur einmal (Ergebnis-Cache).
+    with st.expander("🎯 Zielwertsuche"):
+        import numpy as np
+        from ai_evaluation.goalseek import DEFAULT_TARGETS, TARGETS, VARIABLES, cached_goal_seek
+
+        st.write("Berechnet, welchen Wert eine Eingabe mindestens (Umsatz, Einsparungen) bzw. höchstens (Kosten) haben darf, damit die gewählte Kennzahl den Zielwert erreicht. Alle anderen Eingaben bleiben unverändert.")
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            variable = st.selectbox("Gesuchte Eingabe:", list(VARIABLES), format_func=lambda v: VARIABLES[v][0])
+        with col2:
+            target_metric = st.selectbox("Kennzahl:", list(TARGETS), format_func=lambda m: TARGETS[m][1])
+        with col3:
+            target = st.number_input("Zielwert:", value=DEFAULT_TARGETS[target_metric], key=f"zielwert_{target_metric}")
+        if st.button("Berechnen", key="zielwertsuche_berechnen"):
+            st.session_state.goal_seek_requested = True
+        if st.session_state.get('goal_seek_requested'):
+            label, metric_label = VARIABLES[variable][0], TARGETS[target_metric][1]
+            try:
+                result = cached_goal_seek(model_inputs, variable, target_metric, target)
+            except Exception as error:
+                st.error(f"Die Zielwertsuche konnte nicht berechnet werden: {error}")
+            else:
+                value, current = result.values[0], result.current[0]
+                if np.isnan(value):
+                    st.warning(f"{metric_label} {target:g} ist über {label} allein nicht erreichbar.")
+                elif np.isinf(value):
+                    st.success(f"{metric_label} {target:g} wird bei beliebig hohen Werten für {label} erreicht.")
+                else:
+                    kind = "Mindestens nötig" if result.is_minimum else "Höchstens tragbar"
+                    st.write(f"**{kind} – {label}:** € {value:,.2f} (aktuell € {current:,.2f}, Differenz € {value - current:+,.2f})")
+                    achieved = "" if np.isnan(result.achieved[0]) else f"{metric_label} bei diesem Wert: {result.achieved[0]:,.2f}. "
+                    st.caption(f"{achieved}Berechnet in {result.seconds * 1000:.1f} ms ({result.iterations} Iteration(en)).")
+
     # +++NEU+++ Weiter-Button zur Navigation mit Validierung und Autosave
     if st.button('Weiter'):
         # Speichern der Eingaben
@@ -643,15 +691,9 @@ def step5():
         st.session_state.data['Dynamische Wachstumsraten'] = growth_periods
         st.session_state.data['Basisumsatz (€)'] = basisumsatz
         st.session_state.data['Jährliche Kosteneinsparungen (€)'] = cost_savings
-        st.session_state.data['Jährlicher Umsatz (€)'] = list(revenue)
-        st.session_state.data['Jährliche Kosteneinsparungen (€)'] = list(cost_savings_array)
-        st.session_state.data['Jährliche Kosten (€)'] = list(annual_costs)
-        st.session_state.data['Jährlicher Gewinn (€)'] = list(profit_annual)
-        st.session_state.data['Gesamter Gewinn (€)'] = total_profit
-        st.session_state.data['Gesamtkosten (€)'] = total_costs
-        st.session_state.data['ROI (%)'] = roi
-        st.session_state.data['Amortisationsdauer (Jahre)'] = payback_period
-        st.session_state.data['Businessplan'] = business_plan_df.to_dict(orient='records')
+        st.session_state.data['WACC (%)'] = wacc
+        st.session_state.data['Perioden pro Jahr'] = periods_per_year
+        # Jahreswerte, ROI, Amortisationsdauer und Businessplan ergänzt autosave() über den Abhängigkeitsgraphen
 
         autosave()  # +++NEU+++ Speichern der Daten vor dem Weitergehen
         st.success("Daten automatisch gespeichert.")  # Optional: Hinweis zur Speicherung
@@ -708,20 +750,9 @@ def step6():
 
         # Risikomatrix erstellen
         st.subheader("Risikomatrix")
-        risk_df = pd.DataFrame(risks)
-        fig, ax = plt.subplots()
-        scatter = ax.scatter(
-            risk_df['Wahrscheinlichkeit'],
-            risk_df['Auswirkung'],
-            s=100,
-            c='red'
-        )
-        for i, txt in enumerate(risk_df['Beschreibung']):
-            ax.annotate(txt, (risk_df['Wahrscheinlichkeit'][i], risk_df['Auswirkung'][i]))
-        ax.set_xlabel('Wahrscheinlichkeit (%)')
-        ax.set_ylabel('Auswirkung (1-10)')
-        ax.set_title('Risikomatrix')
-        st.pyplot(fig)
+        st.image(charts.risk_matrix_chart(risks), width='stretch')
+        for score in engine.risk_scores(risks):
+            st.write(f"**{score.beschreibung or 'Ohne Beschreibung'}:** Risikowert {score.risikowert:.1f} von 10")
 
         autosave()  # +++NEU+++ Speichern der Daten vor dem Weitergehen
         st.success("Daten automatisch gespeichert.")  # Optional: Hinweis zur Speicherung
@@ -793,6 +824,11 @@ def step9():
         st.write("Hier sehen Sie eine Übersicht Ihrer bisherigen Eingaben. Überprüfen Sie die Informationen und nutzen Sie diese Zusammenfassung als Grundlage für Ihre Entscheidungsfindung im nächsten Schritt.")
     
     if st.session_state.data:
+        import numpy as np
+        import pandas as pd
+
+        # Abgeleitete Werte vor der Anzeige aktualisieren, damit keine veralteten Zahlen erscheinen
+        update_derived_values()
         for key, value in st.session_state.data.items():
             if isinstance(value, list):
                 value_display = ', '.join(str(v) for v in value)
@@ -914,163 +950,38 @@ def step12():
         next_step()  # +++NEU+++ Navigiere zum nächsten Schritt
 
 
-import sqlite3  # SQLite für die Datenbankverbindung
-
-# Datenbankverbindung erstellen
-conn = sqlite3.connect('ki_initiativen.db')
-c = conn.cursor()
-
-# Tabelle für Initiativen erstellen (falls noch nicht vorhanden)
-c.execute('''
-    CREATE TABLE IF NOT EXISTS initiativen (
-        id INTEGER PRIMARY KEY AUTOINCREMENT,
-        projektname TEXT,
-        projektbeschreibung TEXT,
-        projektverantwortlicher TEXT,
-        strategische_ziele TEXT,
-        kpis TEXT,
-        ausrichtung TEXT,
-        ki_technologie TEXT,
-        zweck TEXT,
-        anwendungsbereich TEXT,
-        art_der_innovation TEXT,
-        kosten TEXT,
-        umsatz_roi TEXT,
-        risiken TEXT,
-        skalierbarkeit_nachhaltigkeit TEXT,
-        erfolgsmessung TEXT,
-        entscheidung TEXT,
-        implementierung TEXT,
-        ueberwachung TEXT,
-        nutzwertanalyse TEXT,
-        gesamtbewertung REAL
-    )
-''')
-
-# Funktion, um die Daten in die Datenbank zu speichern
-def save_initiative(data):
-    # Daten aus dem gespeicherten state in ein JSON-Format konvertieren
-    strategic_goals = json.dumps(data.get('Strategische Ziele', []))
-    kpis = json.dumps(data.get('KPIs', []))
-    risks = json.dumps(data.get('Risiken', []))
-    
-    # Speichern der Informationen in die Datenbank
-    c.execute('''
-        INSERT INTO initiativen (
-            projektname, 
-            projektbeschreibung, 
-            projektverantwortlicher,
-            strategische_ziele,
-            kpis,
-            ausrichtung,
-            ki_technologie,
-            zweck,
-            anwendungsbereich,
-            art_der_innovation,
-            kosten,
-            umsatz_roi,
-            risiken,
-            skalierbarkeit_nachhaltigkeit,
-            erfolgsmessung,
-            entscheidung,
-            implementierung,
-            ueberwachung,
-            nutzwertanalyse,
-            gesamtbewertung
-        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-    ''', (
-        data.get('Projektname', ''),
-        data.get('Projektbeschreibung', ''),
-        data.get('Projektverantwortlicher', ''),
-        strategic_goals,
-        kpis,
-        data.get('Ausrichtung auf Geschäftsziele', ''),
-        data.get('Art der KI-Technologie', ''),
-        data.get('Zweck des KI-Einsatzes', ''),
-        data.get('Anwendungsbereich', ''),
-        data.get('Art der Innovation', ''),
-        json.dumps({
-            'entwicklungskosten': data.get('Entwicklungskosten', 0.0),
-            'laufende_betriebskosten': data.get('Laufende Betriebskosten', 0.0),
-            'risikobudget': data.get('Risikobudget', 0.0),
-            'anfangsinvestition': data.get('Anfangsinvestition', 0.0)
-        }),
-        json.dumps({
-            'umsatz': data.get('Jährlicher Umsatz (€)', []),
-            'kosten': data.get('Jährliche Kosten (€)', []),
-            'gewinn': data.get('Jährlicher Gewinn (€)', []),
-            'roi': data.get('ROI (%)', 0.0),
-            'payback_period': data.get('Amortisationsdauer (Jahre)', 0.0)
-        }),
-        risks,
-        json.dumps({
-            'skalierbarkeit': data.get('Skalierbarkeit', 0),
-            'nachhaltigkeit': data.get('Nachhaltigkeit', 0)
-        }),
-        json.dumps({
-            'metriken': data.get('Erfolgsmessungsmetriken', []),
-            'zielwerte': data.get('Zielwerte', [])
-        }),
-        json.dumps({
-            'entscheidung': data.get('Entscheidung', ''),
-            'begründung': data.get('Begründung', '')
-        }),
-        json.dumps({
-            'projektplan': data.get('Projektplan', ''),
-            'rollen': data.get('Rollen und Verantwortlichkeiten', []),
-            'ressourcen': data.get('Benötigte Ressourcen', '')
-        }),
-        json.dumps({
-            'leistungsüberwachung': data.get('Leistungsüberwachung', ''),
-            'regelmäßige_überprüfungen': data.get('Regelmäßige Überprüfungen', '')
-        }),
-        json.dumps({
-            'gewichtungen': data.get('Gewichtungen', {}),
-            'gewichtete_bewertungen': data.get('Gewichtete Bewertungen', {})
-        }),
-        data.get('Gesamtbewertung', 0.0)
-    ))
-    conn.commit()
-
-  def step13():
+def step13():
     st.header("13. Nutzwertanalyse")
     with st.expander("Anleitung"):
         st.write("Analysieren Sie die gesammelten Bewertungen in einem Scoring-Modell.")
 
     # Sammlung der numerischen Bewertungen
-    scores = {
-        'Datenverfügbarkeit': st.session_state.data.get('Datenverfügbarkeit', 0),
-        'Technische Fähigkeiten': st.session_state.data.get('Technische Fähigkeiten', 0),
-        'Technologiekompatibilität': st.session_state.data.get('Technologiekompatibilität', 0),
-        'Skalierbarkeit': st.session_state.data.get('Skalierbarkeit', 0),
-        'Nachhaltigkeit': st.session_state.data.get('Nachhaltigkeit', 0)
-    }
+    scores = engine.criterion_scores(st.session_state.data)
 
     # Anpassbare Gewichtungen
     st.subheader("Gewichtungen festlegen")
     weights = {}
-    total_weight = 0
     for criterion in scores.keys():
         weight = st.number_input(
             f"Gewichtung für {criterion} (in %):",
             min_value=0.0,
             max_value=100.0,
-            value=st.session_state.data.get('Gewichtungen', {}).get(criterion, 20.0),
+            value=st.session_state.data.get('Gewichtungen', {}).get(criterion, engine.DEFAULT_WEIGHT),
             step=1.0,
             key=f"weight_{criterion}"
         )
         weights[criterion] = weight
-        total_weight += weight
 
-    if total_weight != 100.0:
+    if not engine.weights_valid(weights):
         st.error("Die Summe der Gewichtungen muss 100% betragen.")
         return
 
     # Gewichtete Bewertungen berechnen
-    weighted_scores = {k: scores[k] * (weights[k] / 100) for k in scores}
-    total_score = sum(weighted_scores.values())
+    weighted_scores, total_score = engine.utility_analysis(scores, weights)
 
     # Darstellung der Scores
+    import pandas as pd
+
     df_scores = pd.DataFrame({
         'Kriterium': list(scores.keys()),
         'Bewertung': list(scores.values()),
@@ -1083,25 +994,15 @@ def save_initiative(data):
 
     # Visualisierung
     st.subheader("Bewertungsdiagramm")
-    fig, ax = plt.subplots()
-    ax.bar(scores.keys(), weighted_scores.values(), color='skyblue')
-    ax.set_ylabel('Gewichtete Bewertung')
-    ax.set_ylim(0, 10)
-    plt.xticks(rotation=45)
-    st.pyplot(fig)
+    st.image(charts.score_chart(weighted_scores), width='stretch')
 
     # +++NEU+++ Weiter-Button zur Navigation mit Autosave
     if st.button('Weiter'):
-        # Speichern der Gesamtbewertung und gewichteten Scores
-        st.session_state.data['Gesamtbewertung'] = total_score
-        st.session_state.data['Gewichtete Bewertungen'] = weighted_scores
+        # Speichern der Gewichtungen; Gesamtbewertung und gewichtete Scores leitet autosave() daraus ab
         st.session_state.data['Gewichtungen'] = weights
 
-        autosave()  # +++NEU+++ Speichern der Daten vor dem Weitergehen
-        st.success("Daten automatisch gespeichert.")  # Optional: Hinweis zur Speicherung
-        
-        # Speichern in die Datenbank
-        save_initiative(st.session_state.data)
+        # Speichern in die Datenbank (aktualisiert den Entwurf der aktuellen Initiative)
+        autosave()
         st.success("Initiative wurde erfolgreich in der Datenbank gespeichert.")
         
         next_step()  # +++NEU+++ Navigiere zum nächsten Schritt
@@ -1109,15 +1010,26 @@ def save_initiative(data):
 
 
 def generate_report():
+    import pandas as pd
+
     st.header("Bericht generieren")
     if st.session_state.data:
+        update_derived_values()
         st.subheader("Zusammenfassung der Eingaben")
         st.json(st.session_state.data)
         st.subheader("Exportieren")
         report_format = st.selectbox("Wählen Sie das Format für den Berichtsexport:", ["PDF", "JSON", "CSV"])
         if report_format == "PDF":
-            if st.button("PDF Bericht generieren"):
-                generate_pdf()
+            from ai_evaluation.report import report_filename
+
+            # Der Bericht wird erst beim Klick auf den Button erzeugt und ohne base64-Umweg ausgeliefert
+            st.download_button(
+                "Download PDF Bericht",
+                data=functools.partial(generate_pdf, copy.deepcopy(st.session_state.data)),
+                file_name=report_filename(st.session_state.data),
+                mime='application/pdf',
+                on_click='ignore',
+            )
         elif report_format == "JSON":
             st.download_button("Download JSON", data=json.dumps(st.session_state.data, indent=4), file_name='bericht.json')
         elif report_format == "CSV":
@@ -1128,110 +1040,172 @@ def generate_report():
     else:
         st.warning("Es sind keine Daten vorhanden. Bitte füllen Sie zuerst die Schritte aus.")
 
-def generate_pdf():
-    buffer = BytesIO()
-    doc = SimpleDocTemplate(buffer)
-    styles = getSampleStyleSheet()
-    elements = []
-
-    elements.append(Paragraph("KI-Projekt Bewertungsbericht", styles['Title']))
-    elements.append(Spacer(1, 12))
-
-    # Projektinformationen hinzufügen
-    project_name = st.session_state.data.get('Projektname', 'Unbekanntes Projekt')
-    project_manager = st.session_state.data.get('Projektverantwortlicher', 'Unbekannt')
-    project_description = st.session_state.data.get('Projektbeschreibung', '')
-
-    elements.append(Paragraph(f"<b>Projektname:</b> {project_name}", styles['Heading2']))
-    elements.append(Paragraph(f"<b>Projektverantwortlicher:</b> {project_manager}", styles['Normal']))
-    elements.append(Paragraph(f"<b>Projektbeschreibung:</b>", styles['Normal']))
-    elements.append(Paragraph(project_description, styles['Normal']))
-    elements.append(Spacer(1, 12))
-
-    # Restliche Daten hinzufügen
-    for key, value in st.session_state.data.items():
-        if key in ['Projektname', 'Projektverantwortlicher', 'Projektbeschreibung', 'Businessplan']:
-            continue  # Diese wurden bereits hinzugefügt
-        if isinstance(value, list):
-            value = ', '.join(str(v) for v in value)
-        elif isinstance(value, dict):
-            value = ', '.join([f"{k}: {v}" for k, v in value.items()])
-        elif isinstance(value, pd.DataFrame):
-            df_html = value.to_html(index=False)
-            elements.append(Paragraph(f"<b>{key}:</b>", styles['Normal']))
-            elements.append(Paragraph(df_html, styles['Normal']))
-            elements.append(Spacer(1, 12))
-            continue
-        elif isinstance(value, np.ndarray):
-            value = ', '.join([f"{v:.2f}" for v in value])
-        else:
-            value = str(value)
-        elements.append(Paragraph(f"<b>{key}:</b> {value}", styles['Normal']))
-        elements.append(Spacer(1, 12))
-
-    # Businessplan hinzufügen, falls vorhanden
-    business_plan = st.session_state.data.get('Businessplan', [])
-    if business_plan:
-        elements.append(Paragraph("<b>Businessplan Übersicht:</b>", styles['Normal']))
-        bp_df = pd.DataFrame(business_plan)
-        # Tabelle formatieren
-        data = [bp_df.columns.tolist()] + bp_df.values.tolist()
-        table = Table(data)
-        table.setStyle(TableStyle([
-            ('BACKGROUND', (0,0), (-1,0), colors.grey),
-            ('TEXTCOLOR',(0,0),(-1,0),colors.whitesmoke),
-            ('ALIGN',(0,0),(-1,-1),'CENTER'),
-            ('FONTNAME', (0,0),(-1,0), 'Helvetica-Bold'),
-            ('BOTTOMPADDING', (0,0),(-1,0),12),
-            ('BACKGROUND',(0,1),(-1,-1),colors.beige),
-            ('GRID', (0,0), (-1,-1), 1, colors.black),
-        ]))
-        elements.append(table)
-        elements.append(Spacer(1, 12))
-
-    doc.build(elements)
-    pdf = buffer.getvalue()
-    buffer.close()
-    b64 = base64.b64encode(pdf).decode()
-    href = f'<a href="data:application/octet-stream;base64,{b64}" download="Bericht_{project_name}.pdf">Download PDF Bericht</a>'
-    st.markdown(href, unsafe_allow_html=True)
+    # Stapelexport: ein PDF-Bericht je gespeicherter Initiative, gesammelt in einer ZIP-Datei
+    st.subheader("Berichte aller Initiativen")
+    if st.button("PDF-Berichte aller Initiativen erzeugen"):
+        generate_batch_reports()
+
+def portfolio_page():
+    from ai_evaluation import overview
+
+    st.header("Portfolio")
+    with st.expander("Anleitung"):
+        st.write("Übersicht über alle gespeicherten Initiativen. Filter, Sortierung und Blättern werden direkt in der Datenbank ausgeführt.")
+
+    # Ausstehende Autosaves schreiben, damit der aktuelle Entwurf enthalten ist
+    flush_autosave()
+
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        search = st.text_input("Suche (Projektname oder Verantwortlicher):")
+        decisions = st.multiselect("Entscheidung:", list(overview.DECISIONS) + [overview.DECISION_OPEN])
+    with col2:
+        min_roi = st.number_input("ROI mindestens (%):", value=None, step=10.0)
+        max_payback = st.number_input("Amortisationsdauer höchstens (Jahre):", value=None, min_value=0.0, step=0.5)
+    with col3:
+        min_score = st.number_input("Gesamtbewertung mindestens:", value=None, min_value=0.0, max_value=10.0, step=0.5)
+        sort = st.selectbox("Sortieren nach:", list(overview.SORT_COLUMNS))
+    with col4:
+        descending = st.checkbox("Absteigend", value=True)
+        page_size = st.selectbox("Einträge je Seite:", [25, 50, 100, 200], index=1)
+
+    overview_filter = overview.OverviewFilter(
+        search=search.strip(),
+        decisions=tuple(decisions),
+        min_roi=min_roi,
+        max_payback=max_payback,
+        min_score=min_score,
+    )
+    with db_pool.connection() as conn:
+        summary = overview.summary(conn, overview_filter)
+        pages = max(1, -(-summary['anzahl'] // page_size))
+        page = st.number_input(f"Seite (von {pages}):", min_value=1, max_value=pages, value=1, step=1)
+        rows = overview.fetch_page(conn, overview_filter, sort, descending, page - 1, page_size)
+
+    def number(value, fmt):
+        return "–" if value is None else format(value, fmt)
+
+    tiles = st.columns(6)
+    tiles[0].metric("Initiativen", f"{summary['anzahl']:,}")
+    tiles[1].metric("Ø ROI (%)", number(summary['roi_mittel'], ',.2f'))
+    tiles[2].metric("Ø Amortisationsdauer (Jahre)", number(summary['amortisationsdauer_mittel'], ',.2f'))
+    tiles[3].metric("Ø Gesamtbewertung", number(summary['gesamtbewertung_mittel'], ',.2f'))
+    tiles[4].metric("Gesamtgewinn (€)", f"{summary['gesamtgewinn']:,.0f}")
+    tiles[5].metric("Summe Kapitalwerte (€)", f"{summary['kapitalwert']:,.0f}")
+    if summary['entscheidungen']:
+        st.caption(" · ".join(f"{status}: {count:,}" for status, count in sorted(summary['entscheidungen'].items())))
+
+    if rows:
+        st.dataframe(rows, hide_index=True, width='stretch')
+    else:
+        st.info("Keine Initiativen gefunden.")
+
+def generate_batch_reports():
+    import tempfile
+    from ai_evaluation.batch_report import export_reports, load_report_data
+
+    flush_autosave()
+    with db_pool.connection() as conn:
+        reports = load_report_data(conn)
+    if not reports:
+        st.warning("Es sind keine gespeicherten Initiativen vorhanden.")
+        return
+
+    progress_bar = st.progress(0.0, text="Berichte werden erzeugt ...")
+
+    def progress(done, total, timing):
+        progress_bar.progress(done / total, text=f"{done}/{total}: {timing.filename} ({timing.seconds:.2f} s)")
+
+    handle, path = tempfile.mkstemp(prefix='ki_berichte_', suffix='.zip')
+    os.close(handle)
+    try:
+        timings = export_reports(reports, path, progress=progress)
+        with open(path, 'rb') as zip_file:
+            archive = zip_file.read()
+    finally:
+        os.remove(path)
+
+    st.caption(f"{len(timings)} Bericht(e), Ø {sum(t.seconds for t in timings) / len(timings):.2f} s je Bericht.")
+    st.download_button("Download ZIP", data=archive, file_name='Berichte.zip', mime='application/zip', on_click='ignore')
+
+def generate_pdf(data):
+    # Bericht über eine temporäre Datei erzeugen und einmalig als Bytes einlesen
+    from ai_evaluation import report
+
+    path = report.write_temp_pdf(data)
+    try:
+        with open(path, 'rb') as pdf_file:
+            return pdf_file.read()
+    finally:
+        os.remove(path)
 
 # Schritt auswählen und entsprechende Funktion aufrufen
-if selected_step == "0. Projektinformationen":
-    step0()
-elif selected_step == "1. Geschäftsziele definieren":
-    step1()
-elif selected_step == "2. KI-Einsatz beschreiben":
-    step2()
-elif selected_step == "3. Technische Machbarkeit bewerten":
-    step3()
-elif selected_step == "4. Kosten und Ressourcen schätzen":
-    step4()
-elif selected_step == "5. Umsatz, Kosten und ROI schätzen":
-    step5()
-elif selected_step == "6. Risikobewertung":
-    step6()
-elif selected_step == "7. Skalierbarkeit und Nachhaltigkeit":
-    step7()
-elif selected_step == "8. Erfolgsmessung definieren":
-    step8()
-elif selected_step == "9. Zusammenfassung der bisherigen Eingaben":
-    step9()
-elif selected_step == "10. Entscheidungsfindung":
-    step10()
-elif selected_step == "11. Implementierungsplanung":
-    step11()
-elif selected_step == "12. Überwachung und Evaluierung":
-    step12()
-elif selected_step == "13. Nutzwertanalyse":
-    step13()
-elif selected_step == "Bericht generieren":
-    generate_report()
-else:
-    st.header(selected_step)
-    st.write("Dieser Schritt ist noch nicht implementiert.")
+with metrics.timed(f'seite.{selected_step}'):
+    if selected_step == "0. Projektinformationen":
+        step0()
+    elif selected_step == "1. Geschäftsziele definieren":
+        step1()
+    elif selected_step == "2. KI-Einsatz beschreiben":
+        step2()
+    elif selected_step == "3. Technische Machbarkeit bewerten":
+        step3()
+    elif selected_step == "4. Kosten und Ressourcen schätzen":
+        step4()
+    elif selected_step == "5. Umsatz, Kosten und ROI schätzen":
+        step5()
+    elif selected_step == "6. Risikobewertung":
+        step6()
+    elif selected_step == "7. Skalierbarkeit und Nachhaltigkeit":
+        step7()
+    elif selected_step == "8. Erfolgsmessung definieren":
+        step8()
+    elif selected_step == "9. Zusammenfassung der bisherigen Eingaben":
+        step9()
+    elif selected_step == "10. Entscheidungsfindung":
+        step10()
+    elif selected_step == "11. Implementierungsplanung":
+        step11()
+    elif selected_step == "12. Überwachung und Evaluierung":
+        step12()
+    elif selected_step == "13. Nutzwertanalyse":
+        step13()
+    elif selected_step == "Bericht generieren":
+        generate_report()
+    elif selected_step == PORTFOLIO_PAGE:
+        portfolio_page()
+    else:
+        st.header(selected_step)
+        st.write("Dieser Schritt ist noch nicht implementiert.")
 
 # Option zum Bericht generieren in der Sidebar
 st.sidebar.markdown("---")
 if st.sidebar.button("Bericht generieren"):
     st.session_state.current_step = "Bericht generieren"
+
+# Neue Initiative beginnen (neuer Entwurf mit eigener ID)
+st.sidebar.button("Neue Initiative beginnen", on_click=new_initiative)
+
+# Startzeit-Messung anzeigen
+if import_profiler is not None:
+    with st.sidebar.expander("⏱️ Startzeit"):
+        st.write(f"Skriptlauf: {(time.perf_counter() - SCRIPT_START) * 1000:.0f} ms")
+        for module, seconds in import_profiler.report():
+            st.text(f"{module}: {seconds * 1000:.1f} ms")
+
+# Messwerte anzeigen (Dauer je Aufruf in ms) und als JSON exportieren
+if metrics.is_enabled():
+    metrics.observe('skript.lauf', time.perf_counter() - SCRIPT_START)
+    with st.sidebar.expander("🔧 Messwerte"):
+        for name, values in metrics.snapshot().items():
+            st.text(f"{name}: {values['anzahl']}x, Ø {values['mittel'] * 1000:.1f}, "
+                    f"p95 {values['p95'] * 1000:.1f}, max {values['max'] * 1000:.1f}")
+        from ai_evaluation.cashflow import cached_compute_cashflow
+        cache_stats = {'finanzmodell': cached_compute_cashflow.cache.stats(), **charts.cache_stats()}
+        for name, stats in cache_stats.items():
+            st.text(f"Cache {name}: {stats['hits']}/{stats['hits'] + stats['misses']} Treffer")
+        st.download_button(
+            "Messwerte als JSON",
+            data=metrics.dump({'caches': cache_stats}),
+            file_name="messwerte.json",
+            mime="application/json",
+        )
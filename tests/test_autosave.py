@@ -0,0 +1,59 @@
+"""Tests für den Hintergrund-Schreiber des Autosaves."""
+
+import threading
+
+from ai_evaluation import autosave, migrations
+from ai_evaluation.autosave import AutosaveWriter
+from ai_evaluation.db import ConnectionPool
+from ai_evaluation.storage import load_initiative, save_initiative
+
+
+def make_pool(tmp_path):
+    pool = ConnectionPool(str(tmp_path / 'ki.db'))
+    with pool.connection() as conn:
+        migrations.migrate(conn)
+    return pool
+
+
+def test_writer_survives_unexpected_errors(tmp_path, monkeypatch):
+    pool = make_pool(tmp_path)
+    with pool.connection() as conn:
+        initiative_id = save_initiative(conn, {'Projektname': 'Entwurf'})
+    write = autosave.write_initiatives
+    calls = []
+
+    def failing_once(conn, records):
+        calls.append(len(records))
+        if len(calls) == 1:
+            raise TypeError('Wert ist nicht serialisierbar')
+        write(conn, records)
+
+    monkeypatch.setattr(autosave, 'write_initiatives', failing_once)
+    writer = AutosaveWriter(pool, debounce_seconds=60)
+    try:
+        writer.submit(initiative_id, {'Projektname': 'Verworfen'})
+        assert writer.flush(timeout=5)
+        assert writer.failures == 1
+        # Der Schreib-Thread läuft weiter und schreibt spätere Stände
+        writer.submit(initiative_id, {'Projektname': 'Gespeichert'})
+        assert writer.flush(timeout=5)
+        with pool.connection() as conn:
+            assert load_initiative(conn, initiative_id)['Projektname'] == 'Gespeichert'
+    finally:
+        writer.close(timeout=5)
+        pool.close()
+
+
+def test_flush_timeout(tmp_path, monkeypatch):
+    pool = make_pool(tmp_path)
+    release = threading.Event()
+    monkeypatch.setattr(autosave, 'write_initiatives', lambda conn, records: release.wait(5))
+    writer = AutosaveWriter(pool, debounce_seconds=60)
+    try:
+        writer.submit(1, {'Projektname': 'Langsam'})
+        assert writer.flush(timeout=0.05) is False
+        release.set()
+        assert writer.flush(timeout=5)
+    finally:
+        writer.close(timeout=5)
+        pool.close()
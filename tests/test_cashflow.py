@@ -0,0 +1,149 @@
+"""Tests für das vektorisierte Finanzmodell (Schritt 5) gegen die frühere Jahresschleife."""
+
+import random
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from ai_evaluation import cashflow
+from ai_evaluation.cashflow import compute_cashflow, discount_factors, internal_rates_of_return, net_present_values
+from ai_evaluation.portfolio import evaluate_portfolio
+
+
+def scalar_cashflow(project_duration, ramp_up_time, growth_periods, basisumsatz, cost_savings,
+                    development_cost, risk_budget, operating_cost):
+    # Referenz: die ursprüngliche Jahresschleife des Finanzmodells
+    years = np.arange(0, project_duration + 1)
+    revenue = np.zeros(project_duration + 1)
+    for i in range(1, project_duration + 1):
+        if years[i] <= ramp_up_time:
+            revenue[i] = 0
+        elif revenue[i - 1] == 0:
+            revenue[i] = basisumsatz
+        else:
+            growth_rate = 0.0
+            for period in growth_periods:
+                if period['start_year'] <= years[i] <= period['end_year']:
+                    growth_rate = period['growth_rate']
+                    break
+            revenue[i] = revenue[i - 1] * (1 + growth_rate / 100)
+    costs = np.zeros(project_duration + 1)
+    costs[0] = development_cost + risk_budget
+    savings = np.zeros(project_duration + 1)
+    for i in range(1, project_duration + 1):
+        costs[i] = 0 if years[i] <= ramp_up_time else operating_cost
+        savings[i] = 0 if years[i] <= ramp_up_time else cost_savings
+    profit = revenue + savings - costs
+    cumulative_profit = np.cumsum(profit)
+    total_costs = costs.sum()
+    roi = cumulative_profit[-1] / total_costs * 100 if total_costs > 0 else None
+    payback = None
+    for i in range(1, len(cumulative_profit)):
+        if cumulative_profit[i] >= 0 and cumulative_profit[i - 1] < 0:
+            payback = years[i - 1] + (0 - cumulative_profit[i - 1]) / (cumulative_profit[i] - cumulative_profit[i - 1])
+            break
+    return revenue, costs, savings, profit, roi, payback
+
+
+def random_inputs(rng):
+    n = rng.randint(1, 30)
+    ramp_up = round(rng.uniform(0, n), 1) if rng.random() < 0.7 else 0.0
+    periods = []
+    for _ in range(rng.randint(0, 5)):
+        start = round(rng.uniform(0, n), 1)
+        end = round(rng.uniform(start, n), 1)
+        periods.append({'start_year': start, 'end_year': end, 'growth_rate': round(rng.uniform(-50, 50), 2)})
+    return (n, ramp_up, periods, rng.choice([0.0, rng.uniform(0, 1e6)]), rng.choice([0.0, rng.uniform(0, 1e5)]),
+            rng.uniform(0, 1e6), rng.uniform(0, 1e5), rng.choice([0.0, rng.uniform(0, 1e5)]))
+
+
+def assert_optional_close(expected, actual):
+    assert (expected is None) == (actual is None)
+    if expected is not None:
+        assert actual == pytest.approx(expected)
+
+
+def test_parity_with_scalar_loop():
+    rng = random.Random(1)
+    for _ in range(500):
+        args = random_inputs(rng)
+        revenue, costs, savings, profit, roi, payback = scalar_cashflow(*args)
+        result = compute_cashflow(*args)
+        assert np.allclose(result.revenue, revenue), args
+        assert np.allclose(result.costs, costs), args
+        assert np.allclose(result.cost_savings, savings), args
+        assert np.allclose(result.profit, profit), args
+        assert_optional_close(roi, result.roi)
+        assert_optional_close(payback, result.payback_period)
+
+
+@pytest.mark.parametrize('profit, npv_at_10, irr', [
+    ([-100.0, 110.0], 0.0, 10.0),
+    ([-1000.0, 500.0, 400.0, 300.0], 10.518407, 10.651681),
+    ([-100.0, 0.0, 121.0], 0.0, 10.0),
+])
+def test_npv_and_irr_reference_values(profit, npv_at_10, irr):
+    profit = np.array([profit])
+    years = np.arange(profit.shape[1])
+    assert net_present_values(years, profit, np.array([10.0]))[0] == pytest.approx(npv_at_10, abs=1e-6)
+    assert internal_rates_of_return(years, profit)[0] == pytest.approx(irr, abs=1e-6)
+
+
+def test_irr_without_sign_change_is_nan():
+    profit = np.array([[100.0, 50.0], [-100.0, -50.0]])
+    assert np.isnan(internal_rates_of_return(np.arange(2), profit)).all()
+
+
+def test_irr_without_sign_change_skips_iterations(monkeypatch):
+    # Ohne lösbare Zeile werden nur die Kapitalwerte an den Intervallgrenzen berechnet,
+    # keine Newton-Schritte auf leeren Arrays (Standardzustand von Schritt 5)
+    calls = []
+
+    def counting_discount_factors(years, wacc):
+        calls.append(len(wacc))
+        return discount_factors(years, wacc)
+
+    monkeypatch.setattr(cashflow, 'discount_factors', counting_discount_factors)
+    assert compute_cashflow(5).irr is None
+    assert calls == [1, 1, 1]  # Kapitalwert sowie beide Intervallgrenzen des Zinsfußes
+
+
+def test_compute_cashflow_discounted_metrics():
+    # Investition 100 in Jahr 0, Umsatz 110 in Jahr 1: Zinsfuß 10 %, Kapitalwert bei 10 % WACC 0
+    result = compute_cashflow(1, basisumsatz=110.0, development_cost=100.0, wacc=10.0)
+    assert result.irr == pytest.approx(10.0)
+    assert result.npv == pytest.approx(0.0, abs=1e-9)
+    result = compute_cashflow(1, basisumsatz=121.0, development_cost=100.0, wacc=10.0)
+    assert result.npv == pytest.approx(10.0)
+    assert result.irr == pytest.approx(21.0)
+    assert result.discounted_payback == pytest.approx(100.0 / 110.0)
+    result = compute_cashflow(1, basisumsatz=50.0, development_cost=100.0, wacc=10.0)
+    assert result.npv == pytest.approx(-100.0 + 50.0 / 1.1)
+    assert result.irr == pytest.approx(-50.0)
+    assert result.discounted_payback is None
+
+
+def test_portfolio_matches_single_evaluation():
+    rng = random.Random(2)
+    rows, expected = [], []
+    for _ in range(40):
+        n, ramp_up, periods, *values = random_inputs(rng)
+        m = rng.choice([1, 4, 12])
+        rows.append(dict(
+            zip(('basisumsatz', 'kosteneinsparungen', 'entwicklungskosten', 'risikobudget',
+                 'laufende_betriebskosten'), values),
+            projektlaufzeit=n, anlaufzeit=ramp_up, wacc=8.0, perioden_pro_jahr=m,
+            wachstumsperioden=[(p['start_year'], p['end_year'], p['growth_rate']) for p in periods],
+        ))
+        expected.append(compute_cashflow(n, ramp_up, periods, *values, wacc=8.0, periods_per_year=m))
+    matrix = evaluate_portfolio(pd.DataFrame(rows)).cashflow
+    for row, result in enumerate(expected):
+        n = len(result.years)
+        assert np.allclose(matrix.profit[row, :n], result.profit)
+        assert not matrix.profit[row, n:].any()
+        assert matrix.npv[row] == pytest.approx(result.npv)
+        assert_optional_close(result.roi, None if np.isnan(matrix.roi[row]) else matrix.roi[row])
+        assert_optional_close(result.irr, None if np.isnan(matrix.irr[row]) else matrix.irr[row])
+        assert_optional_close(result.payback_period,
+                              None if np.isnan(matrix.payback_period[row]) else matrix.payback_period[row])
@@ -0,0 +1,38 @@
+"""Tests für den Abhängigkeitsgraphen der abgeleiteten Werte."""
+
+from ai_evaluation.derived import DerivedValues
+
+DATA = {
+    'Entwicklungskosten': 50_000.0,
+    'Risikobudget': 5_000.0,
+    'Laufende Betriebskosten': 10_000.0,
+    'Projektlaufzeit (Jahre)': 5,
+    'Basisumsatz (€)': 40_000.0,
+}
+
+
+def test_only_changed_values_are_recomputed():
+    derived = DerivedValues()
+    data = derived.update(dict(DATA))
+    assert data['Anfangsinvestition'] == 55_000.0
+    assert data['ROI (%)'] is not None
+    computations = derived.computations
+    derived.update(data)
+    assert derived.computations == computations
+    data['Risikobudget'] = 0.0
+    derived.update(data)
+    assert data['Anfangsinvestition'] == 50_000.0
+    assert derived.computations > computations
+
+
+def test_cleared_input_removes_derived_values():
+    derived = DerivedValues()
+    data = derived.update(dict(DATA))
+    data['Basisumsatz (€)'] = None
+    derived.update(data)
+    for key in ('ROI (%)', 'Amortisationsdauer (Jahre)', 'Kapitalwert (€)', 'Businessplan'):
+        assert key not in data
+    assert data['Anfangsinvestition'] == 55_000.0
+    del data['Entwicklungskosten']
+    derived.update(data)
+    assert 'Anfangsinvestition' not in data
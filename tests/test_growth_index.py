@@ -0,0 +1,99 @@
+"""Tests für den sortierten Index der Wachstumszeiträume (cashflow.growth_index)."""
+
+import numpy as np
+import pytest
+
+from ai_evaluation.cashflow import growth_index, growth_rate_matrix, growth_rates, period_times
+from ai_evaluation.engine import validate_growth_periods
+from ai_evaluation.simulation import SimulationInputs, normal, period_index, simulate
+
+
+def period(start, end, rate=1.0):
+    return {'start_year': start, 'end_year': end, 'growth_rate': rate}
+
+
+def first_match(years, growth_periods):
+    # Referenz: lineare Suche nach dem ersten passenden Zeitraum
+    index = np.full(len(years), -1)
+    for i in range(len(growth_periods) - 1, -1, -1):
+        p = growth_periods[i]
+        index[(p['start_year'] <= years) & (years <= p['end_year'])] = i
+    return index
+
+
+def random_periods(rng, n_years):
+    periods = []
+    for _ in range(rng.integers(0, 7)):
+        start = float(rng.choice([rng.integers(-2, n_years + 3), round(rng.uniform(-1, n_years + 1), 2)]))
+        end = float(rng.choice([start, start + rng.integers(0, 6), round(start + rng.uniform(0, 5), 2)]))
+        periods.append(period(start, end, round(rng.uniform(-50, 50), 2)))
+    return periods
+
+
+@pytest.mark.parametrize('periods_per_year', [1, 4, 12])
+def test_lookup_matches_first_match(periods_per_year):
+    rng = np.random.default_rng(0)
+    for _ in range(300):
+        n_years = int(rng.integers(1, 30))
+        periods = random_periods(rng, n_years)
+        years = period_times(n_years, periods_per_year)
+        assert np.array_equal(growth_index(periods).lookup(years), first_match(years, periods))
+
+
+def test_overlapping_periods_first_wins():
+    periods = [period(3, 6, 10.0), period(1, 4, 20.0), period(5, 8, 30.0)]
+    index = growth_index(periods)
+    assert index.lookup(np.arange(10)).tolist() == [-1, 1, 1, 0, 0, 0, 0, 2, 2, -1]
+    assert growth_rates(np.arange(10), periods).tolist() == [0, 20, 20, 10, 10, 10, 10, 30, 30, 0]
+    assert index.overlaps == ((1, 0), (0, 2))
+
+
+def test_touching_and_reversed_periods():
+    # Gemeinsames Grenzjahr ist eine Überschneidung; die Eingabereihenfolge spielt keine Rolle
+    assert growth_index([period(1, 3), period(3, 5)]).overlaps == ((0, 1),)
+    assert growth_index([period(6, 9), period(1, 5)]).overlaps == ()
+    assert validate_growth_periods([period(6, 9), period(1, 5)]) == []
+    assert validate_growth_periods([period(1, 3), period(3, 5)]) == [
+        'Zeitraum 2: Startjahr muss nach dem Endjahr des vorherigen Zeitraums liegen.'
+    ]
+
+
+def test_empty_index():
+    assert growth_index([]).lookup([0.0, 1.0]).tolist() == [-1, -1]
+    assert growth_rates(np.arange(3), []).tolist() == [0.0, 0.0, 0.0]
+
+
+def test_distribution_rates():
+    # Die Simulation übergibt Verteilungen als Wachstumsrate; der Index braucht nur die Jahre
+    periods = [period(1, 2, normal(5.0, 1.0)), period(3, 5, normal(-2.0, 1.0))]
+    assert period_index(np.arange(7), periods).tolist() == [-1, 0, 0, 1, 1, 1, -1]
+
+
+@pytest.mark.parametrize('periods_per_year', [1, 4, 12])
+def test_simulate_with_distribution_growth(periods_per_year):
+    inputs = SimulationInputs(
+        project_duration=6, ramp_up_time=1.0,
+        growth_periods=(period(1, 3, normal(10.0, 5.0)), period(4, 6, normal(2.0, 1.0))),
+        basisumsatz=normal(100_000.0, 10_000.0, 0.0), operating_cost=20_000.0, development_cost=150_000.0,
+        periods_per_year=periods_per_year,
+    )
+    result = simulate(inputs, 500, seed=1)
+    assert result.n_scenarios == 500
+    assert np.isfinite(result.roi).all()
+
+
+def test_rate_matrix_matches_index():
+    rng = np.random.default_rng(1)
+    n_rows, n_periods, n_years = 200, 6, 20
+    starts, ends, rates = (np.full((n_rows, n_periods), np.nan) for _ in range(3))
+    rows = []
+    for r in range(n_rows):
+        periods = random_periods(rng, n_years)
+        rows.append(periods)
+        for p, item in enumerate(periods):
+            starts[r, p], ends[r, p], rates[r, p] = item['start_year'], item['end_year'], item['growth_rate']
+    for periods_per_year in (1, 4, 12):
+        matrix = growth_rate_matrix(starts, ends, rates, n_years + 1, periods_per_year)
+        years = period_times(n_years, periods_per_year)
+        for r, periods in enumerate(rows):
+            assert np.array_equal(matrix[r], growth_rates(years, periods))
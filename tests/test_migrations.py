@@ -0,0 +1,95 @@
+"""Tests für die Schema-Migrationen von ki_initiativen.db."""
+
+import json
+import random
+import sqlite3
+
+import numpy as np
+import pytest
+
+from ai_evaluation import migrations
+from ai_evaluation.cashflow import compute_cashflow
+from ai_evaluation.portfolio import evaluate_portfolio, load_inputs
+
+
+def migrated(conn, version):
+    migrations.migrate(conn, [m for m in migrations.MIGRATIONS if m[0] <= version])
+    return conn
+
+
+def test_normalised_schema_from_json_columns():
+    conn = migrated(sqlite3.connect(':memory:'), 1)
+    conn.execute(
+        'INSERT INTO initiativen (projektname, kosten, umsatz_roi, risiken, nutzwertanalyse) VALUES (?, ?, ?, ?, ?)',
+        ('Alt', json.dumps({'anfangsinvestition': 1200.0, 'laufende_betriebskosten': 100.0}),
+         json.dumps({'umsatz': [0.0, 500.0, 800.0], 'kosten': [1200.0, 100.0, 100.0],
+                     'gewinn': [-1200.0, 400.0, 700.0], 'roi': -7.1, 'payback_period': None}),
+         json.dumps([{'Beschreibung': 'Datenqualität', 'Wahrscheinlichkeit': 40, 'Auswirkung': 6}]),
+         json.dumps({'gewichtungen': {'Skalierbarkeit': 30}, 'gewichtete_bewertungen': {'Skalierbarkeit': 1.5}})),
+    )
+    migrations.migrate(conn)
+    assert conn.execute(
+        'SELECT anfangsinvestition, laufende_betriebskosten, gesamtkosten, gesamtgewinn, roi FROM initiativen'
+    ).fetchone() == (1200.0, 100.0, 1400.0, -100.0, -7.1)
+    assert conn.execute('SELECT jahr, umsatz, kosten FROM cashflow_jahre ORDER BY jahr').fetchall() == [
+        (0, 0.0, 1200.0), (1, 500.0, 100.0), (2, 800.0, 100.0),
+    ]
+    assert conn.execute('SELECT beschreibung, wahrscheinlichkeit FROM risikobewertungen').fetchall() == [
+        ('Datenqualität', 40.0),
+    ]
+    assert conn.execute('SELECT gewichtung FROM gewichtungen').fetchall() == [(30.0,)]
+
+
+def test_discounted_metrics_backfill():
+    # Migration 5 rechnet mit 8 % WACC; jährliche Werte stimmen mit dem aktuellen Finanzmodell überein
+    conn = migrated(sqlite3.connect(':memory:'), 4)
+    conn.execute(
+        '''INSERT INTO initiativen (id, projektlaufzeit, anlaufzeit, basisumsatz, kosteneinsparungen,
+           entwicklungskosten, risikobudget, laufende_betriebskosten) VALUES (1, 6, 1, 40000, 5000, 90000, 10000, 8000)'''
+    )
+    conn.execute('INSERT INTO wachstumsperioden VALUES (1, 0, 2, 4, 10), (1, 1, 3, 6, 5)')
+    conn.execute('INSERT INTO initiativen (id, projektname) VALUES (2, \'ohne Finanzmodell\')')
+    migrations.migrate(conn)
+    expected = compute_cashflow(
+        6, 1.0, [{'start_year': 2, 'end_year': 4, 'growth_rate': 10}, {'start_year': 3, 'end_year': 6, 'growth_rate': 5}],
+        basisumsatz=40000, cost_savings=5000, development_cost=90000, risk_budget=10000, operating_cost=8000, wacc=8.0,
+    )
+    npv, irr, discounted_payback = conn.execute(
+        'SELECT kapitalwert, interner_zinsfuss, diskontierte_amortisationsdauer FROM initiativen WHERE id = 1'
+    ).fetchone()
+    assert npv == pytest.approx(expected.npv)
+    assert irr == pytest.approx(expected.irr, abs=1e-6)
+    assert discounted_payback == pytest.approx(expected.discounted_payback)
+    assert conn.execute('SELECT kapitalwert FROM initiativen WHERE id = 2').fetchone() == (None,)
+
+
+def test_discounted_metrics_backfill_matches_cashflow_matrix():
+    # Die eingefrorene Berechnung von Migration 5 entspricht der Portfolio-Bewertung mit dem aktuellen
+    # Finanzmodell (cashflow_matrix), u.a. mit überlappenden Zeiträumen und ohne Zinsfuß
+    rng = random.Random(5)
+    conn = migrated(sqlite3.connect(':memory:'), 4)
+    for initiative_id in range(1, 201):
+        duration = rng.randint(1, 25)
+        conn.execute(
+            '''INSERT INTO initiativen (id, projektlaufzeit, anlaufzeit, basisumsatz, kosteneinsparungen,
+               entwicklungskosten, risikobudget, laufende_betriebskosten) VALUES (?, ?, ?, ?, ?, ?, ?, ?)''',
+            (initiative_id, duration, rng.choice([0.0, round(rng.uniform(0, duration), 1)]),
+             rng.choice([0.0, rng.uniform(0, 2e5)]), rng.choice([None, rng.uniform(0, 5e4)]),
+             rng.uniform(0, 5e5), rng.choice([None, rng.uniform(0, 5e4)]), rng.uniform(0, 6e4)),
+        )
+        for nr in range(rng.randint(0, 4)):
+            start = rng.randint(0, duration)
+            conn.execute('INSERT INTO wachstumsperioden VALUES (?, ?, ?, ?, ?)',
+                         (initiative_id, nr, start, rng.randint(start, duration), round(rng.uniform(-30, 60), 1)))
+    migrations.migrate(conn)
+    stored = conn.execute(
+        'SELECT kapitalwert, interner_zinsfuss, diskontierte_amortisationsdauer FROM initiativen ORDER BY id'
+    ).fetchall()
+    cashflow = evaluate_portfolio(load_inputs(conn)).cashflow
+    assert any(irr is None for _, irr, _ in stored) and any(irr is not None for _, irr, _ in stored)
+    for row, (npv, irr, discounted_payback) in enumerate(stored):
+        assert npv == pytest.approx(cashflow.npv[row])
+        assert irr == (None if np.isnan(cashflow.irr[row]) else pytest.approx(cashflow.irr[row], abs=1e-6))
+        assert discounted_payback == (
+            None if np.isnan(cashflow.discounted_payback[row]) else pytest.approx(cashflow.discounted_payback[row])
+        )
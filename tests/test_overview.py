@@ -0,0 +1,88 @@
+"""Tests für Filter, Sortierung und Seiten der Portfolio-Übersicht (SQL gegen eine temporäre Datenbank)."""
+
+import pytest
+
+from ai_evaluation import migrations
+from ai_evaluation.db import connect
+from ai_evaluation.overview import DECISION_OPEN, OverviewFilter, fetch_page, summary
+
+# (Projektname, Verantwortlicher, ROI, Amortisationsdauer, Gesamtbewertung, Entscheidung)
+ROWS = [
+    ('Chatbot', 'Anna', 40.0, 2.0, 3.5, 'Projekt durchführen'),
+    ('Prognose 100%', 'Ben', 10.0, 4.5, 2.0, 'Projekt verschieben'),
+    ('Bild_Erkennung', 'Clara', -5.0, None, 4.0, None),
+    ('Bilderkennung', 'Dora', 25.0, 3.0, None, 'Projekt ablehnen'),
+    ('Dokumente', 'Anna_B', None, None, 1.5, None),
+    ('Übersetzung', 'Emil', 60.0, 1.5, 4.5, 'Projekt durchführen'),
+]
+
+
+@pytest.fixture
+def conn(tmp_path):
+    conn = connect(str(tmp_path / 'uebersicht.db'))
+    migrations.migrate(conn)
+    with conn:
+        conn.executemany(
+            '''INSERT INTO initiativen (projektname, projektverantwortlicher, roi, amortisationsdauer,
+               gesamtbewertung, entscheidung_status) VALUES (?, ?, ?, ?, ?, ?)''',
+            ROWS,
+        )
+    yield conn
+    conn.close()
+
+
+def names(rows):
+    return [row['Projektname'] for row in rows]
+
+
+@pytest.mark.parametrize('overview_filter, expected', [
+    (OverviewFilter(), [name for name, *_ in ROWS]),
+    (OverviewFilter(search='bild'), ['Bild_Erkennung', 'Bilderkennung']),
+    (OverviewFilter(search='anna'), ['Chatbot', 'Dokumente']),
+    (OverviewFilter(decisions=('Projekt durchführen',)), ['Chatbot', 'Übersetzung']),
+    (OverviewFilter(decisions=(DECISION_OPEN,)), ['Bild_Erkennung', 'Dokumente']),
+    (OverviewFilter(decisions=(DECISION_OPEN, 'Projekt ablehnen')), ['Bild_Erkennung', 'Bilderkennung', 'Dokumente']),
+    (OverviewFilter(min_roi=25.0), ['Chatbot', 'Bilderkennung', 'Übersetzung']),
+    (OverviewFilter(max_payback=3.0), ['Chatbot', 'Bilderkennung', 'Übersetzung']),
+    (OverviewFilter(min_score=3.5), ['Chatbot', 'Bild_Erkennung', 'Übersetzung']),
+    (OverviewFilter(search='n', decisions=('Projekt durchführen',), min_roi=50.0), ['Übersetzung']),
+    (OverviewFilter(min_roi=10.0, max_payback=4.0, min_score=3.0), ['Chatbot', 'Übersetzung']),
+])
+def test_filter_combinations(conn, overview_filter, expected):
+    assert names(fetch_page(conn, overview_filter, sort='ID', descending=False)) == expected
+    assert summary(conn, overview_filter)['anzahl'] == len(expected)
+
+
+@pytest.mark.parametrize('search, expected', [
+    ('%', ['Prognose 100%']),
+    ('_', ['Bild_Erkennung', 'Dokumente']),
+    ('ld_', ['Bild_Erkennung']),  # ungeschützt träfe '_' auch 'Bilderkennung'
+    ('\\', []),
+])
+def test_search_escapes_like_wildcards(conn, search, expected):
+    assert names(fetch_page(conn, OverviewFilter(search=search), sort='ID', descending=False)) == expected
+
+
+def test_sort_direction_keeps_missing_values_last(conn):
+    ascending = names(fetch_page(conn, sort='ROI (%)', descending=False))
+    descending = names(fetch_page(conn, sort='ROI (%)', descending=True))
+    assert ascending == ['Bild_Erkennung', 'Prognose 100%', 'Bilderkennung', 'Chatbot', 'Übersetzung', 'Dokumente']
+    assert descending == ['Übersetzung', 'Chatbot', 'Bilderkennung', 'Prognose 100%', 'Bild_Erkennung', 'Dokumente']
+    assert names(fetch_page(conn, sort='Projektname', descending=False))[:3] == [
+        'Bild_Erkennung', 'Bilderkennung', 'Chatbot',
+    ]
+
+
+def test_pages_and_last_page(conn):
+    pages = [names(fetch_page(conn, sort='ID', descending=False, page=page, page_size=4)) for page in range(3)]
+    assert pages == [['Chatbot', 'Prognose 100%', 'Bild_Erkennung', 'Bilderkennung'], ['Dokumente', 'Übersetzung'], []]
+    last = fetch_page(conn, OverviewFilter(decisions=(DECISION_OPEN,)), sort='ID', descending=True, page=1, page_size=1)
+    assert names(last) == ['Bild_Erkennung']
+
+
+def test_summary(conn):
+    result = summary(conn, OverviewFilter(min_score=2.0))
+    assert result['anzahl'] == 4
+    assert result['roi_mittel'] == pytest.approx((40.0 + 10.0 - 5.0 + 60.0) / 4)
+    assert result['amortisationsdauer_mittel'] == pytest.approx((2.0 + 4.5 + 1.5) / 3)
+    assert result['entscheidungen'] == {'Projekt durchführen': 2, 'Projekt verschieben': 1, DECISION_OPEN: 1}
@@ -0,0 +1,30 @@
+"""Tests für die Monte-Carlo-Simulation auf mehreren Prozessen."""
+
+import numpy as np
+
+from ai_evaluation.parallel import simulate_many
+from ai_evaluation.simulation import SimulationInputs, normal, relative_normal, simulate
+
+INPUTS = [
+    SimulationInputs(
+        6, 0.5, ({'start_year': 1, 'end_year': 4, 'growth_rate': normal(8.0, 3.0)},),
+        basisumsatz=relative_normal(60_000.0, 20), operating_cost=relative_normal(10_000.0, 10),
+        development_cost=120_000.0,
+    ),
+    SimulationInputs(4, basisumsatz=relative_normal(30_000.0, 30), development_cost=90_000.0, periods_per_year=4),
+]
+
+
+def test_results_independent_of_workers():
+    # Je Shard ein eigener Zufallsstrom aus (Seed, Initiative, Block): gleiche Ergebnisse bei
+    # 1 und 2 Workern und für die erste Initiative wie simulation.simulate mit demselben Seed
+    single = simulate_many(INPUTS, 2_500, seed=42, workers=1, chunk_size=1_000)
+    double = simulate_many(INPUTS, 2_500, seed=42, workers=2, chunk_size=1_000)
+    np.testing.assert_array_equal(single.roi, double.roi)
+    np.testing.assert_array_equal(single.payback_period, double.payback_period)
+    assert single.roi.shape == (2, 2_500)
+
+    reference = simulate(INPUTS[0], 2_500, seed=42, chunk_size=1_000)
+    np.testing.assert_array_equal(single.roi[0], reference.roi)
+    np.testing.assert_array_equal(single.payback_period[0], reference.payback_period)
+    assert not np.array_equal(single.roi[0, :1_000], single.roi[0, 1_000:2_000])
@@ -0,0 +1,62 @@
+"""Tests für die unterjährige Auflösung des Finanzmodells (Quartale und Monate)."""
+
+import numpy as np
+import pytest
+
+from ai_evaluation.cashflow import compute_cashflow, yearly
+from ai_evaluation.goalseek import DEFAULT_TARGETS, TARGETS, VARIABLES, goal_seek
+
+DATA = {
+    'Projektlaufzeit (Jahre)': 5,
+    'Anlaufzeit (Jahre)': 0.5,
+    'Dynamische Wachstumsraten': [{'start_year': 1.0, 'end_year': 5.0, 'growth_rate': 5.0}],
+    'Basisumsatz (€)': 50_000.0,
+    'Jährliche Kosteneinsparungen (€)': 5_000.0,
+    'Entwicklungskosten': 10_000.0,
+    'Risikobudget': 1_000.0,
+    'Laufende Betriebskosten': 2_000.0,
+    'WACC (%)': 8.0,
+}
+
+
+@pytest.mark.parametrize('periods_per_year', [1, 4, 12])
+def test_yearly_sums_periods(periods_per_year):
+    values = np.arange(2 * (3 * periods_per_year + 1), dtype=float).reshape(2, -1)
+    result = yearly(values, periods_per_year)
+    assert result.shape == (2, 4)
+    assert np.array_equal(result[:, 0], values[:, 0])
+    assert np.allclose(result.sum(axis=1), values.sum(axis=1))
+
+
+@pytest.mark.parametrize('periods_per_year', [1, 4, 12])
+def test_yearly_empty(periods_per_year):
+    assert yearly(np.zeros((0, 5 * periods_per_year + 1)), periods_per_year).shape == (0, 6)
+
+
+@pytest.mark.parametrize('periods_per_year', [4, 12])
+def test_sub_annual_totals(periods_per_year):
+    # Ohne Anlaufzeit und Wachstum verteilen Quartale und Monate nur die Jahresbeträge;
+    # bei gleichmäßigem Gewinn stimmt auch die interpolierte Amortisationsdauer überein
+    kwargs = dict(basisumsatz=12_000.0, cost_savings=0.0, development_cost=5_000.0,
+                  risk_budget=0.0, operating_cost=1_200.0)
+    annual = compute_cashflow(4, 0.0, [], **kwargs)
+    result = compute_cashflow(4, 0.0, [], periods_per_year=periods_per_year, **kwargs)
+    assert np.allclose(result.revenue, annual.revenue)
+    assert np.allclose(result.costs, annual.costs)
+    assert result.roi == pytest.approx(annual.roi)
+    assert result.payback_period == pytest.approx(annual.payback_period)
+
+
+@pytest.mark.parametrize('periods_per_year', [1, 4, 12])
+@pytest.mark.parametrize('variable', list(VARIABLES))
+@pytest.mark.parametrize('metric', list(TARGETS))
+def test_goal_seek_resolutions(periods_per_year, variable, metric):
+    # Alle Kombinationen wie in Schritt 5, auch wenn Zeilenmengen im Verlauf leer werden
+    data = {**DATA, 'Perioden pro Jahr': periods_per_year}
+    result = goal_seek(data, variable, metric, DEFAULT_TARGETS[metric])
+    assert result.values.shape == (1,)
+    if np.isfinite(result.values[0]):
+        achieved = result.achieved[0]
+        higher_is_better = TARGETS[metric][2]
+        assert (achieved >= DEFAULT_TARGETS[metric] - 1e-6) if higher_is_better \
+            else (achieved <= DEFAULT_TARGETS[metric] + 1e-6)
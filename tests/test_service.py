@@ -0,0 +1,111 @@
+"""Tests für den HTTP/JSON-Dienst (ohne Netzwerk über service.call)."""
+
+import json
+
+import numpy as np
+import pytest
+
+from ai_evaluation import engine, storage
+from ai_evaluation.service import EvaluationService, call, encode_json
+
+DATA = {
+    'Projektname': 'Dienst',
+    'Projektlaufzeit (Jahre)': 5,
+    'Basisumsatz (€)': 100_000.0,
+    'Entwicklungskosten': 50_000.0,
+    'Laufende Betriebskosten': 10_000.0,
+    'Dynamische Wachstumsraten': [{'start_year': 1, 'end_year': 3, 'growth_rate': 5.0}],
+    'Risiken': [{'Beschreibung': 'Daten', 'Wahrscheinlichkeit': 50, 'Auswirkung': 4}],
+}
+
+
+@pytest.fixture
+def app(tmp_path):
+    service = EvaluationService(str(tmp_path / 'dienst.db'), workers=0)
+    yield service
+    service.shutdown()
+
+
+def test_evaluation(app):
+    status, body = call(app, 'POST', '/bewertung', DATA)
+    assert status == 200
+    assert body['roi'] is not None
+    status, body = call(app, 'POST', '/initiativen', DATA)
+    assert status == 201
+    assert call(app, 'GET', f"/initiativen/{body['id']}")[0] == 200
+
+
+@pytest.mark.parametrize('path, payload', [
+    ('/risiken', {'Risiken': ['x']}),
+    ('/risiken', {'Risiken': [{'Wahrscheinlichkeit': 'hoch'}]}),
+    ('/risiken', {'Risiken': 'x'}),
+    ('/finanzmodell', {**DATA, 'Basisumsatz (€)': 'viel'}),
+    ('/finanzmodell', {**DATA, 'Dynamische Wachstumsraten': [{'start_year': 1}]}),
+    ('/nutzwertanalyse', {'Gewichtungen': ['a']}),
+    ('/bewertung', {**DATA, 'Dynamische Wachstumsraten': [3]}),
+    ('/initiativen', {**DATA, 'Gewichtete Bewertungen': {'Skalierbarkeit': 'gut'}}),
+])
+def test_malformed_input(app, path, payload):
+    status, body = call(app, 'POST', path, payload)
+    assert status == 400
+    assert body['fehler']
+
+
+@pytest.mark.parametrize('path', ['/finanzmodell', '/bewertung', '/initiativen'])
+@pytest.mark.parametrize('field, value', [
+    ('Projektlaufzeit (Jahre)', -3),
+    ('Projektlaufzeit (Jahre)', 0),
+    ('Projektlaufzeit (Jahre)', 2.5),
+    ('Projektlaufzeit (Jahre)', 1e8),
+    ('Perioden pro Jahr', -1),
+    ('Perioden pro Jahr', 2),
+    ('WACC (%)', -100),
+    ('Anlaufzeit (Jahre)', -0.5),
+    ('Anlaufzeit (Jahre)', 6),
+])
+def test_out_of_range_input(app, path, field, value):
+    status, body = call(app, 'POST', path, {**DATA, field: value})
+    assert status == 400
+    assert field in body['fehler']
+
+
+@pytest.mark.parametrize('path', ['/bewertung', '/initiativen', '/finanzmodell'])
+def test_overlapping_growth_periods(app, path):
+    periods = [{'start_year': 1, 'end_year': 3, 'growth_rate': 5.0}, {'start_year': 3, 'end_year': 5, 'growth_rate': 2.0}]
+    status, body = call(app, 'POST', path, {**DATA, 'Dynamische Wachstumsraten': periods})
+    assert status == 400
+    assert 'Zeitraum 2' in body['fehler']
+
+
+def test_unexpected_errors_return_json(app, monkeypatch):
+    def fail(*args, **kwargs):
+        raise RuntimeError('kaputt')
+
+    monkeypatch.setattr(engine, 'evaluate', fail)
+    assert call(app, 'POST', '/bewertung', DATA) == (500, {'fehler': 'Interner Fehler bei der Berechnung.'})
+    monkeypatch.setattr(storage, 'load_initiative', fail)
+    assert call(app, 'GET', '/initiativen/1') == (500, {'fehler': 'Interner Serverfehler.'})
+
+
+def test_non_finite_values_become_null():
+    payload = {'kapitalwert': float('inf'), 'werte': [float('nan'), -np.inf, 1.5], 'zeile': np.array([np.nan, 2.0])}
+    assert json.loads(encode_json(payload)) == {'kapitalwert': None, 'werte': [None, None, 1.5], 'zeile': [None, 2.0]}
+
+
+@pytest.mark.filterwarnings('ignore:overflow:RuntimeWarning')
+def test_extreme_wacc_returns_valid_json(app):
+    # Abzinsung mit WACC nahe -100 % läuft über; die Antwort bleibt gültiges JSON
+    status, body = call(app, 'POST', '/finanzmodell', {**DATA, 'Projektlaufzeit (Jahre)': 100, 'WACC (%)': -99.9999})
+    assert status == 200
+    assert body['kapitalwert'] is None
+
+
+def test_unknown_criteria_in_weights(app):
+    weights = {'Skalierbarkeit': 50.0, 'Foo': 30.0, 'Bar': 20.0}
+    status, body = call(app, 'POST', '/nutzwertanalyse', {'Skalierbarkeit': 8, 'Gewichtungen': weights})
+    assert status == 400
+    assert 'Foo, Bar' in body['fehler']
+    weights = {criterion: 20.0 for criterion in storage.SCORE_CRITERIA}
+    status, body = call(app, 'POST', '/nutzwertanalyse', {'Skalierbarkeit': 8, 'Gewichtungen': weights})
+    assert status == 200
+    assert body['gesamtbewertung'] == pytest.approx(1.6)
@@ -0,0 +1,19 @@
+"""Tests für die Monte-Carlo-Simulation (Schritt 5)."""
+
+import pytest
+
+from ai_evaluation import simulation
+from ai_evaluation.simulation import SimulationInputs, default_scenarios, normal, simulate
+
+
+@pytest.mark.parametrize('periods_per_year, expected', [(1, 100_000), (4, 25_000), (12, 8_333)])
+def test_default_scenarios_scale_with_resolution(periods_per_year, expected):
+    assert default_scenarios(periods_per_year) == expected
+
+
+@pytest.mark.parametrize('periods_per_year', [1, 4, 12])
+def test_simulate_uses_default_for_resolution(monkeypatch, periods_per_year):
+    monkeypatch.setattr(simulation, 'DEFAULT_SCENARIOS', 1_200)
+    inputs = SimulationInputs(5, basisumsatz=normal(50_000.0, 5_000.0), development_cost=80_000.0,
+                              periods_per_year=periods_per_year)
+    assert simulate(inputs, seed=1).n_scenarios == 1_200 // periods_per_year